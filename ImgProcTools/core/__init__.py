@@ -5,15 +5,53 @@ Módulo central para procesamiento de imágenes
 
 Contiene:
 - Carga de imágenes (image_loader)
+- Caché de imágenes decodificadas (image_cache)
+- Descarga concurrente de imágenes remotas (url_loader)
+- Carga asíncrona para asyncio (async_loader)
+- Acceso por regiones a imágenes grandes mapeadas en memoria (large_image)
+- Lectura de frames de video y secuencias de imágenes (frame_stream)
 - Transformaciones geométricas y de color (image_transform)
 - Mejora de imágenes (image_enhancement)
 - Aplicación de filtros y detección de bordes (image_filter)
 - Análisis de imágenes (image_analysis)
+- Bancos de filtros con trabajo compartido (filter_bank)
+- Imagen integral para medias y varianzas locales (summed_area)
+- Morfología y filtros de rango con kernels grandes (morphology)
+- Procesamiento de pilas N×H×W×C de imágenes (batch)
 """
 
 # Importaciones principales
 from .image_loader import (
-    load_image
+    load_image,
+    load_images,
+    load_image_from_buffer
+)
+
+from .image_cache import (
+    ImageCache
+)
+
+from .url_loader import (
+    ConnectionPool,
+    load_from_urls
+)
+
+from .async_loader import (
+    async_load_image,
+    async_load_images
+)
+
+from .frame_stream import (
+    FrameStream
+)
+
+from .large_image import (
+    LargeImage
+)
+
+from .warp_plan import (
+    WarpPlanCache,
+    warp_affine
 )
 
 from .image_transform import (
@@ -21,6 +59,7 @@ from .image_transform import (
     rotate, 
     resize, 
     crop, 
+    AffineTransform,
     convert_color, 
     add, 
     subtract, 
@@ -35,7 +74,9 @@ from .image_enhancement import (
     histogram_equalization, 
     clahe, 
     gamma_correction, 
-    auto_contrast
+    auto_contrast,
+    auto_contrast_table,
+    PointOpChain
 )
 
 from .image_filter import (
@@ -43,14 +84,60 @@ from .image_filter import (
     median_blur,
     gaussian_blur, 
     bilateral_filter, 
+    sobel_gradient, 
     sobel_edges, 
     canny_edges, 
     laplacian_edges, 
     sharpen, 
     apply_kernel, 
+    analyze_kernel, 
+    dft_filter, 
     emboss_filter, 
 )
 
+from .filter_bank import FilterBank
+
+from .summed_area import SummedAreaTable
+
+from .morphology import (
+    erode,
+    dilate,
+    opening,
+    closing,
+    top_hat,
+    black_hat,
+    morphological_gradient,
+    morphological_operation,
+    median_filter
+)
+
+from .batch import (
+    batched,
+    tall_batched,
+    batch_convert_color,
+    batch_add,
+    batch_subtract,
+    batch_multiply,
+    batch_apply_mask,
+    batch_adjust_brightness,
+    batch_adjust_contrast,
+    batch_adjust_brightness_contrast,
+    batch_gamma_correction,
+    batch_translate,
+    batch_rotate,
+    batch_resize,
+    batch_avgerage_blur,
+    batch_median_blur,
+    batch_gaussian_blur,
+    batch_bilateral_filter,
+    batch_sobel_edges,
+    batch_canny_edges,
+    batch_laplacian_edges,
+    batch_sharpen,
+    batch_apply_kernel,
+    batch_emboss_filter
+)
+
 from .image_analysis import (
     find_contours, 
     approximate_contour, 
@@ -68,6 +155,10 @@ from .image_analysis import (
 
 from .frecuency_filters import (
     apply_fft_filter, 
+    prepare_fft_mask, 
+    apply_frequency_filter, 
+    frequency_mask, 
+    dft_padding, 
     compute_fft, 
     create_butterworth_filter, 
     create_gaussian_filter, 
@@ -80,12 +171,36 @@ from .frecuency_filters import (
 __all__ = [
     # image_loader.py
     'load_image',
+    'load_images',
+    'load_image_from_buffer',
+
+    # image_cache.py
+    'ImageCache',
+
+    # url_loader.py
+    'ConnectionPool',
+    'load_from_urls',
+
+    # async_loader.py
+    'async_load_image',
+    'async_load_images',
+
+    # frame_stream.py
+    'FrameStream',
+
+    # large_image.py
+    'LargeImage',
+
+    # warp_plan.py
+    'WarpPlanCache',
+    'warp_affine',
 
     # image_transform.py
     'translate',
     'rotate',
     'resize',
     'crop',
+    'AffineTransform',
     'convert_color',
     'add',
     'subtract',
@@ -100,19 +215,67 @@ __all__ = [
     'clahe',
     'gamma_correction',
     'auto_contrast',
+    'auto_contrast_table',
+    'PointOpChain',
 
     # image_filter.py
     'avgerage_blur',
     'median_blur',
     'gaussian_blur',
     'bilateral_filter',
+    'sobel_gradient',
     'sobel_edges',
     'canny_edges',
     'laplacian_edges',
     'sharpen',
     'apply_kernel',
+    'analyze_kernel',
+    'dft_filter',
     'emboss_filter',
 
+    # filter_bank.py
+    'FilterBank',
+
+    # summed_area.py
+    'SummedAreaTable',
+
+    # morphology.py
+    'erode',
+    'dilate',
+    'opening',
+    'closing',
+    'top_hat',
+    'black_hat',
+    'morphological_gradient',
+    'morphological_operation',
+    'median_filter',
+
+    # batch.py
+    'batched',
+    'tall_batched',
+    'batch_convert_color',
+    'batch_add',
+    'batch_subtract',
+    'batch_multiply',
+    'batch_apply_mask',
+    'batch_adjust_brightness',
+    'batch_adjust_contrast',
+    'batch_adjust_brightness_contrast',
+    'batch_gamma_correction',
+    'batch_translate',
+    'batch_rotate',
+    'batch_resize',
+    'batch_avgerage_blur',
+    'batch_median_blur',
+    'batch_gaussian_blur',
+    'batch_bilateral_filter',
+    'batch_sobel_edges',
+    'batch_canny_edges',
+    'batch_laplacian_edges',
+    'batch_sharpen',
+    'batch_apply_kernel',
+    'batch_emboss_filter',
+
     # image_analysis.py
     'find_contours',
     'approximate_contour',
@@ -129,6 +292,10 @@ __all__ = [
 
     # frecuency_filters.py
     'apply_fft_filter', 
+    'prepare_fft_mask', 
+    'apply_frequency_filter', 
+    'frequency_mask', 
+    'dft_padding', 
     'compute_fft', 
     'create_butterworth_filter', 
     'create_gaussian_filter', 
@@ -0,0 +1,181 @@
+import asyncio
+import ssl
+import warnings
+import cv2
+import numpy as np
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, Optional, Tuple, Union
+from urllib.parse import urljoin, urlsplit
+
+from .image_loader import decode_buffer, is_url, resolve_path
+
+REDIRECT_STATUS = (301, 302, 303, 307, 308)
+_default_executor = None
+
+
+def get_default_executor() -> Executor:
+    """Executor compartido (acotado) para lecturas de archivo y decodificación."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="imgproc-decode")
+    return _default_executor
+
+
+async def async_load_image(source: str,
+                           base_dir: Optional[Union[str, Path]] = None,
+                           as_gray: bool = False,
+                           timeout: Optional[float] = None,
+                           executor: Optional[Executor] = None) -> np.ndarray:
+    """
+    Versión asíncrona de `load_image` que no bloquea el event loop.
+
+    Las URLs se descargan con streams de asyncio; la lectura de archivos y la
+    decodificación se envían a un executor acotado.
+
+    Args:
+        source: Ruta al archivo o URL.
+        base_dir: Directorio base para rutas relativas.
+        as_gray: Convierte la imagen a escala de grises.
+        timeout: Tiempo máximo (segundos) para la carga completa. Al superarse
+                 se lanza asyncio.TimeoutError.
+        executor: Executor para E/S de archivos y decodificación. Si es None se
+                  usa uno compartido de 4 hilos.
+
+    Returns:
+        La misma imagen que devolvería `load_image(source, base_dir, as_gray)`.
+    """
+    return await asyncio.wait_for(_load(source, base_dir, as_gray, executor), timeout)
+
+
+async def _load(source: str,
+                base_dir: Optional[Union[str, Path]],
+                as_gray: bool,
+                executor: Optional[Executor]) -> np.ndarray:
+    loop = asyncio.get_running_loop()
+    executor = executor or get_default_executor()
+    if is_url(source):
+        try:
+            data = await http_get(source)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            raise ValueError(f"Error loading image from URL: {e}")
+    else:
+        file_path = resolve_path(source, base_dir)
+        data = await loop.run_in_executor(executor, file_path.read_bytes)
+    try:
+        return await loop.run_in_executor(executor, _decode, data, as_gray)
+    except ValueError:
+        name = source if is_url(source) else resolve_path(source, base_dir)
+        raise ValueError(f"Invalid image file: {name}")
+
+
+def _decode(data: bytes, as_gray: bool) -> np.ndarray:
+    image = decode_buffer(data)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if as_gray else image
+
+
+async def http_get(url: str, max_redirects: int = 5) -> bytes:
+    """GET HTTP/1.1 mínimo sobre streams de asyncio (sigue redirecciones)."""
+    for _ in range(max_redirects + 1):
+        parts = urlsplit(url)
+        https = parts.scheme == "https"
+        port = parts.port or (443 if https else 80)
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port, ssl=ssl.create_default_context() if https else None)
+        try:
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            writer.write((f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+                          "Accept-Encoding: identity\r\nConnection: close\r\n\r\n").encode("latin-1"))
+            await writer.drain()
+            status, headers = await _read_head(reader)
+            if status in REDIRECT_STATUS and "location" in headers:
+                url = urljoin(url, headers["location"])
+                continue
+            body = await _read_body(reader, headers)
+        finally:
+            writer.close()
+        if status != 200:
+            raise ValueError(f"HTTP {status}")
+        return body
+    raise ValueError("Too many redirects")
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[int, dict]:
+    status_line = await reader.readline()
+    try:
+        status = int(status_line.split()[1])
+    except (IndexError, ValueError):
+        raise ValueError(f"Invalid HTTP status line: {status_line!r}")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return status, headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: dict) -> bytes:
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read()
+
+
+async def async_load_images(sources: Iterable[str],
+                            base_dir: Optional[Union[str, Path]] = None,
+                            as_gray: bool = False,
+                            concurrency: int = 8,
+                            timeout: Optional[float] = None,
+                            executor: Optional[Executor] = None,
+                            on_error: Optional[Callable[[str, Exception], None]] = None
+                            ) -> AsyncIterator[Tuple[str, np.ndarray]]:
+    """
+    Carga varias imágenes de forma concurrente (generador asíncrono).
+
+    Args:
+        sources: Rutas y/o URLs.
+        base_dir: Directorio base para rutas relativas.
+        as_gray: Convierte las imágenes a escala de grises.
+        concurrency: Máximo de cargas simultáneas.
+        timeout: Tiempo máximo (segundos) por imagen.
+        executor: Executor para E/S de archivos y decodificación.
+        on_error: Función llamada con (fuente, excepción) cuando una carga falla
+                  (incluido el timeout). Si es None se emite un warning.
+
+    Yields:
+        Tuplas (fuente, imagen) en orden de finalización. Cerrar o cancelar el
+        generador cancela las cargas pendientes.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load(source: str):
+        async with semaphore:
+            try:
+                return source, await async_load_image(source, base_dir, as_gray, timeout, executor), None
+            except Exception as e:
+                return source, None, e
+
+    tasks = [asyncio.ensure_future(load(source)) for source in sources]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            source, image, error = await next_done
+            if error is not None:
+                if on_error is None:
+                    warnings.warn(f"Error loading {source}: {error!r}")
+                else:
+                    on_error(source, error)
+                continue
+            yield source, image
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,134 @@
+import functools
+import inspect
+import math
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .image_transform import (
+    translate, rotate, resize, convert_color, add, subtract, multiply, apply_mask
+)
+from .image_filter import (
+    avgerage_blur, median_blur, gaussian_blur, bilateral_filter, sobel_edges,
+    canny_edges, laplacian_edges, sharpen, apply_kernel, emboss_filter
+)
+from .image_enhancement import (
+    adjust_brightness, adjust_contrast, adjust_brightness_contrast, gamma_correction
+)
+
+
+def batched(func: Optional[Callable] = None, *,
+            workers: Optional[int] = None,
+            chunk_size: Optional[int] = None) -> Callable:
+    """
+    Decorador que convierte una función imagen -> imagen en una que procesa
+    una pila N×H×W[×C] de imágenes.
+
+    El resultado se escribe en un único array 4D preasignado (o en `out=`),
+    y los frames se reparten por bloques en un pool de hilos (OpenCV libera
+    el GIL). Si `func` acepta `out=`, cada frame se escribe directamente en su
+    posición de la pila. Todos los frames deben producir salidas de la misma forma.
+
+    Args:
+        func: Función a envolver (permite usarlo como @batched o @batched(workers=4)).
+        workers: Número de hilos (por defecto os.cpu_count()).
+        chunk_size: Frames por tarea (por defecto ~4 tareas por hilo).
+
+    Ejemplo:
+        blurred = batched(gaussian_blur)(frames, (5, 5))
+    """
+    def decorator(func: Callable) -> Callable:
+        accepts_out = "out" in inspect.signature(func).parameters
+
+        @functools.wraps(func)
+        def wrapper(stack: np.ndarray, *args, out: Optional[np.ndarray] = None, **kwargs) -> np.ndarray:
+            n = len(stack)
+            if n == 0:
+                raise ValueError("Empty image stack")
+            first = func(stack[0], *args, **kwargs)
+            expected = (n,) + first.shape
+            if out is None:
+                out = np.empty(expected, dtype=first.dtype)
+            elif out.shape != expected or out.dtype != first.dtype:
+                raise ValueError(f"out must have shape {expected} and dtype {first.dtype}, "
+                                 f"got {out.shape} and {out.dtype}")
+            out[0] = first
+
+            n_workers = workers or os.cpu_count() or 1
+            size = chunk_size or max(1, math.ceil((n - 1) / (4 * n_workers)))
+
+            def run(start: int) -> None:
+                for i in range(start, min(start + size, n)):
+                    if accepts_out:
+                        func(stack[i], *args, out=out[i], **kwargs)
+                    else:
+                        out[i] = func(stack[i], *args, **kwargs)
+
+            if n > 1:
+                with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                    list(executor.map(run, range(1, n, size)))
+            return out
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def tall_batched(func: Callable) -> Callable:
+    """
+    Decorador para operaciones punto a punto (conversión de color, aritmética,
+    LUTs): la pila N×H×W[×C] se trata como una sola imagen alta (N·H)×W[×C],
+    de modo que OpenCV la procesa en una única llamada sin copias.
+
+    Los argumentos posicionales que sean pilas con los mismos N y H (ej: la
+    segunda imagen de `add` o la máscara de `apply_mask`) se remodelan igual,
+    al igual que una pila `out=`, que debe ser contigua (se escribe sobre ella).
+    """
+    @functools.wraps(func)
+    def wrapper(stack: np.ndarray, *args, **kwargs) -> np.ndarray:
+        out = kwargs.get("out")
+        if out is not None and not out.flags.c_contiguous:
+            raise ValueError("out must be C-contiguous")
+        if kwargs.get("inplace") and not stack.flags.c_contiguous:
+            raise ValueError("inplace=True requires a C-contiguous stack")
+        stack = np.ascontiguousarray(stack)
+        n, h = stack.shape[:2]
+
+        def tall(a):
+            if isinstance(a, np.ndarray) and a.ndim >= 3 and a.shape[:2] == (n, h):
+                return np.ascontiguousarray(a).reshape((n * h,) + a.shape[2:])
+            return a
+
+        if out is not None:
+            kwargs["out"] = tall(out)
+        result = func(tall(stack), *[tall(a) for a in args], **kwargs)
+        return out if out is not None else result.reshape((n, h) + result.shape[1:])
+    return wrapper
+
+
+### Variantes para pilas de imágenes ###
+# Operaciones punto a punto: una sola llamada sobre la imagen alta
+batch_convert_color = tall_batched(convert_color)
+batch_add = tall_batched(add)
+batch_subtract = tall_batched(subtract)
+batch_multiply = tall_batched(multiply)
+batch_apply_mask = tall_batched(apply_mask)
+batch_adjust_brightness = tall_batched(adjust_brightness)
+batch_adjust_contrast = tall_batched(adjust_contrast)
+batch_adjust_brightness_contrast = tall_batched(adjust_brightness_contrast)
+batch_gamma_correction = tall_batched(gamma_correction)
+
+# Operaciones con vecindario o geométricas: frame a frame en paralelo
+batch_translate = batched(translate)
+batch_rotate = batched(rotate)
+batch_resize = batched(resize)
+batch_avgerage_blur = batched(avgerage_blur)
+batch_median_blur = batched(median_blur)
+batch_gaussian_blur = batched(gaussian_blur)
+batch_bilateral_filter = batched(bilateral_filter)
+batch_sobel_edges = batched(sobel_edges)
+batch_canny_edges = batched(canny_edges)
+batch_laplacian_edges = batched(laplacian_edges)
+batch_sharpen = batched(sharpen)
+batch_apply_kernel = batched(apply_kernel)
+batch_emboss_filter = batched(emboss_filter)
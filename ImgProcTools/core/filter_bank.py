@@ -0,0 +1,136 @@
+import os
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from utils.utils import output_buffer
+
+from .image_filter import DFT_KERNEL_SIZE, analyze_kernel, _kernel_spectrum
+
+
+class FilterBank:
+    """
+    Aplica muchos kernels a la misma imagen compartiendo el trabajo común.
+
+    La imagen se convierte a float32 una sola vez y cada respuesta se escribe
+    directamente en su posición del array de salida. Los kernels grandes no
+    separables comparten un único relleno de la imagen y una única DFT directa
+    (solo se calcula el producto y la DFT inversa por kernel). Los kernels de
+    rango 1 usan sepFilter2D. Con varios kernels el trabajo se reparte en un
+    pool de hilos, empezando por los grupos de kernels más grandes.
+
+    Cada respuesta equivale a cv2.filter2D(image.astype(np.float32), -1, kernel)
+    (BORDER_REFLECT_101).
+
+    Args:
+        kernels: Lista de kernels 2D (ej: cv2.getDerivKernels, cv2.getGaussianKernel,
+                 kernels de relieve...).
+        workers: Número de hilos (por defecto os.cpu_count()).
+        dft_size: Lado a partir del cual los kernels no separables usan la DFT.
+
+    Ejemplo:
+        bank = FilterBank([sobel_x, sobel_y] + gaussians)
+        responses = bank.apply(gray)  # (K, alto, ancho) float32
+    """
+
+    def __init__(self,
+                 kernels: Sequence[np.ndarray],
+                 workers: Optional[int] = None,
+                 dft_size: int = DFT_KERNEL_SIZE):
+        if len(kernels) == 0:
+            raise ValueError("FilterBank needs at least one kernel")
+        self.kernels = [np.asarray(k, dtype=np.float64) for k in kernels]
+        self.workers = workers or os.cpu_count() or 1
+        self.plans = [analyze_kernel(k) for k in self.kernels]
+        self._separable = {i: (plan.kernel_x.astype(np.float32), plan.kernel_y.astype(np.float32))
+                           for i, plan in enumerate(self.plans) if plan.method == "separable"}
+
+        # Kernels grandes no separables: comparten relleno y DFT de la imagen
+        self.dft_group = [i for i, (k, plan) in enumerate(zip(self.kernels, self.plans))
+                          if plan.method != "separable" and max(k.shape) >= dft_size]
+        pads = [self._pads(self.kernels[i].shape) for i in self.dft_group]
+        self.padding = tuple(max(p[side] for p in pads) for side in range(4)) if pads else None
+
+        # El resto, agrupado por tamaño (de mayor a menor para repartir mejor la carga)
+        self.size_groups = {}
+        for i, k in sorted(enumerate(self.kernels), key=lambda item: -item[1].size):
+            if i not in self.dft_group:
+                self.size_groups.setdefault(k.shape, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.kernels)
+
+    @staticmethod
+    def _pads(shape: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """(arriba, abajo, izquierda, derecha) con el ancla en el centro del kernel."""
+        kh, kw = shape
+        return kh // 2, kh - 1 - kh // 2, kw // 2, kw - 1 - kw // 2
+
+    def apply(self, image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Calcula la respuesta de todos los kernels.
+
+        Args:
+            image: Imagen de entrada (gris o multicanal).
+            out: Array de salida opcional de forma (K,) + image.shape y tipo float32.
+
+        Returns:
+            Array (K, alto, ancho[, canales]) float32 con una respuesta por kernel.
+        """
+        out = output_buffer(image, out, shape=(len(self),) + image.shape, dtype=np.float32)
+        if out is None:
+            out = np.empty((len(self),) + image.shape, dtype=np.float32)
+        source = image.astype(np.float32, copy=False)
+
+        tasks = []
+        if self.dft_group:
+            spectra = self._image_spectra(source)
+            tasks += [(self._filter_dft, i, spectra) for i in self.dft_group]
+        for indices in self.size_groups.values():
+            tasks += [(self._filter_spatial, i, source) for i in indices]
+
+        def run(task) -> None:
+            func, index, data = task
+            func(index, data, out[index])
+
+        if self.workers > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(tasks))) as executor:
+                list(executor.map(run, tasks))
+        else:
+            for task in tasks:
+                run(task)
+        return out
+
+    def _filter_spatial(self, index: int, source: np.ndarray, dst: np.ndarray) -> None:
+        # OpenCV rellena por filas internamente: escribir en `dst` evita recortar y copiar
+        if index in self._separable:
+            kernel_x, kernel_y = self._separable[index]
+            cv2.sepFilter2D(source, -1, kernel_x, kernel_y, dst=dst)
+        else:
+            cv2.filter2D(source, -1, self.plans[index].kernel, dst=dst)
+
+    def _image_spectra(self, source: np.ndarray) -> Tuple[List[np.ndarray], Tuple[int, int], Tuple[int, ...]]:
+        """Rellena la imagen una vez hasta el tamaño DFT y calcula la DFT directa de cada canal."""
+        top, bottom, left, right = self.padding
+        h, w = source.shape[:2]
+        rows = cv2.getOptimalDFTSize(h + top + bottom)
+        cols = cv2.getOptimalDFTSize(w + left + right)
+        # Más allá del soporte de los kernels el contenido del relleno no afecta al resultado
+        padded = cv2.copyMakeBorder(source, top, rows - h - top, left, cols - w - left,
+                                    cv2.BORDER_REFLECT_101)
+        planes = cv2.split(padded) if padded.ndim == 3 else [padded]
+        return [cv2.dft(plane) for plane in planes], (rows, cols), source.shape
+
+    def _filter_dft(self, index: int, data, dst: np.ndarray) -> None:
+        spectra, (rows, cols), shape = data
+        kernel = self.kernels[index]
+        # Desplazamiento del ancla de este kernel respecto al relleno común
+        dy = self.padding[0] - kernel.shape[0] // 2
+        dx = self.padding[2] - kernel.shape[1] // 2
+        spectrum = _kernel_spectrum(kernel.tobytes(), kernel.shape, rows, cols, np.dtype(np.float32).str)
+        h, w = shape[:2]
+        for c, plane in enumerate(spectra):
+            product = cv2.mulSpectrums(plane, spectrum, 0, conjB=True)
+            result = cv2.idft(product, flags=cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)
+            (dst[..., c] if len(spectra) > 1 else dst)[...] = result[dy:dy + h, dx:dx + w]
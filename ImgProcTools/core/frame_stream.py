@@ -0,0 +1,242 @@
+import glob
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+_END = object()
+
+
+class _CaptureReader:
+    """Lector sobre cv2.VideoCapture (archivos de video o patrones printf como 'f_%04d.png')."""
+
+    def __init__(self, source: str):
+        self.capture = cv2.VideoCapture(source)
+        if not self.capture.isOpened():
+            raise ValueError(f"Could not open video source: {source}")
+
+    def __len__(self) -> int:
+        return int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    def skip(self) -> bool:
+        return self.capture.grab()  # avanza sin decodificar
+
+    def read(self, buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        ok, frame = self.capture.read(buffer)
+        return frame if ok else None
+
+    def seek(self, index: int) -> None:
+        self.capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+
+    def close(self) -> None:
+        self.capture.release()
+
+
+class _SequenceReader:
+    """Lector sobre una lista de archivos de imagen."""
+
+    def __init__(self, paths: List[str]):
+        if not paths:
+            raise ValueError("Empty image sequence")
+        self.paths = paths
+        self.index = 0
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def skip(self) -> bool:
+        self.index += 1
+        return self.index <= len(self.paths)
+
+    def read(self, buffer: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        if self.index >= len(self.paths):
+            return None
+        frame = cv2.imread(self.paths[self.index])
+        if frame is None:
+            raise ValueError(f"Invalid image file: {self.paths[self.index]}")
+        self.index += 1
+        if buffer is None or buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+            return frame  # como VideoCapture.read: array nuevo si no cabe en `buffer`
+        np.copyto(buffer, frame)
+        return buffer
+
+    def seek(self, index: int) -> None:
+        self.index = index
+
+    def close(self) -> None:
+        pass
+
+
+class FrameStream:
+    """
+    Iterador de frames de un video o de una secuencia numerada de imágenes.
+
+    Un hilo de fondo decodifica por adelantado en un anillo de buffers
+    preasignados que se reutilizan, de modo que el consumidor no espera a la
+    decodificación ni se crean arrays nuevos por frame.
+
+    IMPORTANTE: el frame entregado es un buffer del anillo y se reutiliza al
+    pedir el siguiente; usar `.copy()` para conservarlo.
+
+    Args:
+        source: Archivo de video, patrón printf ('frames/f_%04d.png'), patrón
+                glob ('frames/*.png') o lista de rutas.
+        buffers: Número de buffers del anillo (frames decodificados por adelantado + 1).
+        stride: Entrega un frame de cada `stride` (los demás se saltan sin decodificar
+                cuando el formato lo permite).
+        start: Índice del primer frame.
+        as_gray: Convierte los frames a escala de grises.
+
+    Ejemplo:
+        with FrameStream("video.mp4", stride=2) as stream:
+            for index, frame in stream:
+                edges = canny_edges(frame)
+    """
+
+    def __init__(self,
+                 source: Union[str, Path, Iterable[Union[str, Path]]],
+                 buffers: int = 4,
+                 stride: int = 1,
+                 start: int = 0,
+                 as_gray: bool = False):
+        if buffers < 2:
+            raise ValueError("buffers must be >= 2")
+        if stride < 1:
+            raise ValueError("stride must be >= 1")
+        self.stride = stride
+        self.as_gray = as_gray
+        self._reader = self._open(source)
+        self._buffers = buffers
+        self._ring = None
+        self._scratch = None
+        self._free = queue.Queue()
+        for slot in range(buffers):
+            self._free.put(slot)
+        self._filled = queue.Queue()
+        self._current = None
+        self._thread = None
+        self._stop = threading.Event()
+        self.decoded = 0
+        self._decode_time = 0.0
+        self.index = None  # índice del último frame entregado
+        self._start(start)
+
+    @staticmethod
+    def _open(source) -> Union[_CaptureReader, _SequenceReader]:
+        if not isinstance(source, (str, Path)):
+            return _SequenceReader([str(p) for p in source])
+        source = str(source)
+        if glob.has_magic(source):
+            return _SequenceReader(sorted(glob.glob(source)))
+        return _CaptureReader(source)
+
+    def __len__(self) -> int:
+        """Número total de frames de la fuente (sin contar el stride)."""
+        return len(self._reader)
+
+    @property
+    def decode_fps(self) -> float:
+        """Frames por segundo decodificados por el hilo de fondo (sin contar esperas)."""
+        return self.decoded / self._decode_time if self._decode_time else 0.0
+
+    def _start(self, index: int) -> None:
+        self._reader.seek(index)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._worker, args=(index,), daemon=True)
+        self._thread.start()
+
+    def _worker(self, index: int) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    slot = self._free.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                t0 = time.perf_counter()
+                frame = self._decode(slot)
+                self._decode_time += time.perf_counter() - t0
+                if frame is None:
+                    self._free.put(slot)
+                    self._filled.put(_END)
+                    return
+                self.decoded += 1
+                self._filled.put((slot, index))
+                for _ in range(self.stride - 1):
+                    if not self._reader.skip():
+                        break
+                index += self.stride
+        except Exception as e:
+            # El hilo termina: tras el error el stream se da por acabado (no se bloquea)
+            self._filled.put(e)
+            self._filled.put(_END)
+
+    def _decode(self, slot: int) -> Optional[np.ndarray]:
+        # El lector y cvtColor devuelven un array nuevo si el frame no cabe en el
+        # buffer (p. ej. cambia de tamaño): ese array pasa a ser el buffer del anillo
+        if self._ring is None:
+            frame = self._reader.read(None)
+            if frame is None:
+                return None
+            shape = frame.shape[:2] if self.as_gray else frame.shape
+            self._ring = [np.empty(shape, dtype=frame.dtype) for _ in range(self._buffers)]
+            if not self.as_gray:
+                np.copyto(self._ring[slot], frame)
+                return self._ring[slot]
+        else:
+            frame = self._reader.read(self._scratch if self.as_gray else self._ring[slot])
+            if frame is None:
+                return None
+            if not self.as_gray:
+                self._ring[slot] = frame
+                return frame
+        self._scratch = frame
+        self._ring[slot] = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._ring[slot])
+        return self._ring[slot]
+
+    def __iter__(self) -> "FrameStream":
+        return self
+
+    def __next__(self) -> Tuple[int, np.ndarray]:
+        self._release_current()
+        item = self._filled.get()
+        if item is _END:
+            self._filled.put(_END)
+            raise StopIteration
+        if isinstance(item, Exception):
+            raise item
+        self._current, self.index = item
+        return self.index, self._ring[self._current]
+
+    def _release_current(self) -> None:
+        if self._current is not None:
+            self._free.put(self._current)
+            self._current = None
+
+    def _halt(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._release_current()
+        while not self._filled.empty():
+            item = self._filled.get()
+            if isinstance(item, tuple):
+                self._free.put(item[0])
+
+    def seek(self, index: int) -> None:
+        """Descarta los frames prefetcheados y continúa desde `index`."""
+        self._halt()
+        self._start(index)
+
+    def close(self) -> None:
+        """Detiene el hilo de decodificación y libera la fuente."""
+        self._halt()
+        self._reader.close()
+
+    def __enter__(self) -> "FrameStream":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,7 +1,17 @@
 import numpy as np
 import cv2
+from collections import namedtuple
+from functools import lru_cache
 from typing import Tuple, Union, Optional
 from utils.draw_utils import draw_circle
+from utils.utils import output_buffer
+
+# Tipos de máscara radial y disposiciones de espectro disponibles en frequency_mask
+FILTER_KINDS = ("ideal", "butterworth", "gaussian")
+MASK_LAYOUTS = ("full", "half", "ccs")
+
+# Máscara lista para apply_fft_filter (ver prepare_fft_mask)
+PreparedMask = namedtuple("PreparedMask", ["shape", "pads", "mask", "packed"])
 
 def compute_fft(image: np.ndarray) -> np.ndarray:
     """
@@ -9,7 +19,7 @@ def compute_fft(image: np.ndarray) -> np.ndarray:
     """
     if len(image.shape) == 3:
         image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    fft = np.fft.fft2(image)
+    fft = np.fft.fft2(image)  # conserva la precisión de la entrada (apply_fft_filter no la usa)
     fft_shifted = np.fft.fftshift(fft)  # fft2 coloca las frecuencias bajas en las esquinas y las altas en el centro
     return fft_shifted 
 
@@ -22,37 +32,366 @@ def inverse_fft(fft: np.ndarray) -> np.ndarray:
     img_reconstructed = np.real(img_reconstructed)  # Tomar solo la parte real
     return img_reconstructed.astype(np.float32)
 
-def apply_fft_filter(image: np.ndarray, mask: np.ndarray) -> np.ndarray:
+def prepare_fft_mask(mask: np.ndarray,
+                     image_shape: Optional[Tuple[int, int]] = None,
+                     centered: bool = True,
+                     pad: bool = True) -> PreparedMask:
+    """
+    Prepara una máscara para aplicarla con apply_fft_filter a muchas imágenes.
+
+    Hace una sola vez lo que apply_fft_filter haría en cada llamada: ifftshift
+    de una máscara centrada, reinterpolación al tamaño rellenado y
+    empaquetado CCS, que en 4K duplica el tiempo de cada llamada (ver
+    benchmarks/bench_fft_filter.py). Es la forma de reutilizar las máscaras
+    de create_*_filter.
+
+    Args:
+        mask: Máscara de frecuencias real de tamaño (alto, ancho) o del tamaño rellenado
+        image_shape: (alto, ancho) de las imágenes a filtrar (por defecto mask.shape)
+        centered: True si la frecuencia cero de `mask` está en el centro
+        pad: Rellena hasta un tamaño óptimo para la DFT (ver apply_fft_filter)
+
+    Returns:
+        PreparedMask(shape, pads, mask sin desplazar, packed en formato CCS).
+    """
+    shape = tuple(mask.shape) if image_shape is None else (int(image_shape[0]), int(image_shape[1]))
+    # Copia: el resultado no debe cambiar si luego se modifica `mask`
+    prepared = _prepare_mask(mask if centered else mask.astype(np.float32), shape, centered, pad, True)
+    prepared.mask.flags.writeable = False
+    prepared.packed.flags.writeable = False
+    return prepared
+
+def _prepare_mask(mask: np.ndarray,
+                  shape: Tuple[int, int],
+                  centered: bool,
+                  pad: bool,
+                  real: bool) -> PreparedMask:
+    """Máscara sin desplazar del tamaño rellenado y, si `real`, empaquetada en CCS."""
+    pads, padded_shape = dft_padding(shape) if pad else ((0, 0, 0, 0), shape)
+    if mask.shape not in (shape, padded_shape):
+        raise ValueError(f"Mask shape {mask.shape} does not match image size {shape}")
+    mask = np.fft.ifftshift(mask) if centered else mask
+    if mask.shape != padded_shape:
+        mask = _resample_mask(mask, padded_shape)
+    return PreparedMask(shape, pads, mask, _pack_ccs(mask) if real else None)
+
+def apply_fft_filter(image: np.ndarray,
+                     mask: Union[np.ndarray, PreparedMask],
+                     centered: bool = True,
+                     real: bool = True,
+                     out: Optional[np.ndarray] = None,
+                     pad: bool = True,
+                     border: int = cv2.BORDER_REFLECT_101) -> np.ndarray: 
     """
     Aplica un filtro en el dominio de las frecuencias usando una máscara. 
+
+    Admite imágenes en gris (alto, ancho), en color (alto, ancho, canales) y lotes
+    (N, alto, ancho, canales): la misma máscara se aplica a cada canal y el
+    resultado float32 se escribe directamente en `out`, sin separar ni volver a
+    unir canales.
+
+    El espectro no se desplaza: una máscara centrada (la de create_*_filter) se
+    lleva una vez a la disposición de np.fft.fft2 con ifftshift. Con una máscara
+    sin desplazar (frequency_mask, cacheada) y centered=False, filtrar cuesta
+    solo la FFT directa, un producto y la FFT inversa.
+
+    Por defecto (real=True) se usa la transformada real a compleja en float32
+    (cv2.dft en formato CCS y cv2.idft con DFT_REAL_OUTPUT): como el espectro de
+    una imagen real es hermítico basta con la mitad, con la mitad de trabajo y
+    una cuarta parte de memoria que fft2 en complex128. La máscara se simetriza
+    (M(u) + M(-u)) / 2, lo que da exactamente la parte real del filtrado
+    complejo. real=False usa el camino complejo: una sola fft2 sobre los ejes
+    espaciales de todo el array, con la máscara difundida sobre canales e imágenes.
+
+    Con pad=True la imagen se rellena con `border` hasta el tamaño 2^a·3^b·5^c
+    más cercano (cv2.getOptimalDFTSize), se filtra y se recorta: la DFT de un
+    tamaño con factores primos grandes (p. ej. 1999 filas) es varias veces más
+    lenta, y un borde reflejado además evita las discontinuidades del borde
+    periódico. Una máscara del tamaño de la imagen se reinterpola linealmente en
+    frecuencia al tamaño rellenado (la misma respuesta en ciclos por imagen);
+    una máscara que ya tiene el tamaño rellenado (ver dft_padding y el argumento
+    image_shape de frequency_mask) se usa tal cual.
+
+    Preparar la máscara (desplazarla, reinterpolarla y empaquetarla) cuesta
+    tanto como filtrar: para aplicar la misma máscara a varias imágenes,
+    prepárela una vez con prepare_fft_mask y pase el PreparedMask.
+
+    Args:
+        image: Imagen de entrada (gris, color o lote de imágenes)
+        mask: Máscara de frecuencias real de tamaño (alto, ancho) o del tamaño
+              rellenado, o un PreparedMask (entonces `centered` y `pad` se ignoran)
+        centered: True si la frecuencia cero de `mask` está en el centro
+        real: Usa la transformada real float32 (False: fft2 compleja)
+        out: Array de salida opcional (misma forma que `image`, float32)
+        pad: Rellena hasta un tamaño óptimo para la DFT
+        border: Tipo de borde del relleno (cv2.BORDER_*)
+    """
+    shape = _spatial_shape(image)
+    if not isinstance(mask, PreparedMask):
+        mask = _prepare_mask(mask, shape, centered, pad, real)
+    elif mask.shape != shape:
+        raise ValueError(f"Mask was prepared for size {mask.shape}, got {shape}")
+    pads = mask.pads
+    out = _output(image, out)
+    if real:
+        return _apply_planes(image, mask.packed, out, pads, border)
+    mask = mask.mask
+    # Ejes espaciales: (0, 1), o (1, 2) en un lote; la máscara se difunde sobre el resto
+    axes = (1, 2) if image.ndim == 4 else (0, 1)
+    spectrum = np.fft.fft2(_pad(image, pads, border), axes=axes)
+    spectrum *= mask.reshape(mask.shape + (1,) * (image.ndim - 1 - axes[1]))
+    filtered = np.fft.ifft2(spectrum, axes=axes).real
+    top, _, left, _ = pads
+    crop = (slice(top, top + shape[0]), slice(left, left + shape[1]))
+    out[...] = filtered[(slice(None),) + crop if image.ndim == 4 else crop]
+    return out
+
+def apply_frequency_filter(image: np.ndarray,
+                           kind: str,
+                           cutoff: float,
+                           order: int = 2,
+                           high_pass: bool = False,
+                           out: Optional[np.ndarray] = None,
+                           pad: bool = True,
+                           border: int = cv2.BORDER_REFLECT_101) -> np.ndarray:
+    """
+    Filtra una imagen con una máscara radial cacheada (ver frequency_mask).
+
+    Con pad=True la máscara se calcula directamente para el tamaño rellenado,
+    con el corte expresado en frecuencias de la imagen original (ver apply_fft_filter).
+
+    Args:
+        image: Imagen de entrada (gris, color o lote de imágenes)
+        kind: 'ideal', 'butterworth' o 'gaussian'
+        cutoff: Radio de corte (ideal, butterworth) o sigma (gaussian)
+        order: Orden del filtro Butterworth
+        high_pass: True para pasa-altas
+        out: Array de salida opcional (misma forma que `image`, float32)
+        pad: Rellena hasta un tamaño óptimo para la DFT
+        border: Tipo de borde del relleno (cv2.BORDER_*)
+    """
+    shape = _spatial_shape(image)
+    pads, padded_shape = dft_padding(shape) if pad else ((0, 0, 0, 0), shape)
+    packed = frequency_mask(kind, padded_shape, cutoff, order, high_pass, layout="ccs", image_shape=shape)
+    return _apply_planes(image, packed, _output(image, out), pads, border)
+
+def dft_padding(shape: Tuple[int, int]) -> Tuple[Tuple[int, int, int, int], Tuple[int, int]]:
+    """
+    Relleno hasta el tamaño óptimo para la DFT (cv2.getOptimalDFTSize: 2^a·3^b·5^c).
+
+    El relleno se reparte entre los dos lados de cada eje.
+
+    Args:
+        shape: (filas, columnas) de la imagen
+
+    Returns:
+        ((arriba, abajo, izquierda, derecha), (filas, columnas) rellenadas)
+    """
+    rows, cols = shape
+    padded = (cv2.getOptimalDFTSize(rows), cv2.getOptimalDFTSize(cols))
+    top, left = (padded[0] - rows) // 2, (padded[1] - cols) // 2
+    return (top, padded[0] - rows - top, left, padded[1] - cols - left), padded
+
+def _spatial_shape(image: np.ndarray) -> Tuple[int, int]:
+    """(alto, ancho) de una imagen (alto, ancho[, canales]) o de un lote (N, alto, ancho, canales)."""
+    if image.ndim not in (2, 3, 4):
+        raise ValueError(f"Expected an image or a batch of images, got shape {image.shape}")
+    return image.shape[1:3] if image.ndim == 4 else image.shape[:2]
+
+def _pad(image: np.ndarray, pads: Tuple[int, int, int, int], border: int) -> np.ndarray:
+    """Rellena los ejes espaciales de una imagen o de cada imagen de un lote."""
+    if not any(pads):
+        return image
+    if image.ndim == 4:
+        return np.stack([_pad(frame, pads, border) for frame in image])
+    padded = cv2.copyMakeBorder(image, *pads, border)
+    return padded.reshape(padded.shape[:2] + image.shape[2:])  # conserva un eje de 1 canal
+
+def _resample_mask(mask: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
     """
-    if len(image) == 3:  # Aplica filtrado en cada canal
-        channels = cv2.split(image)
-        filtered_channels = []
-        for ch in channels: 
-            fft = compute_fft(ch)
-            filtered = fft * mask
-            im_back = inverse_fft(filtered)
-            filtered_channels.append(im_back)
-            return cv2.merge(filtered_channels)  # test para ordenar los channels correctamente
-    else: 
-        fft = compute_fft(image)
-        filtered = fft * mask
-        im_back = inverse_fft(filtered)
-        return im_back  # tested: working
+    Máscara sin desplazar -> la misma respuesta en frecuencia para una DFT de tamaño `shape`.
+
+    La frecuencia k de una DFT de M puntos equivale a k·N/M en una de N puntos;
+    se interpola linealmente entre las dos frecuencias vecinas (el espectro sin
+    desplazar es periódico, así que los índices se toman módulo N).
+    """
+    mask = mask.astype(np.float32)
+    for axis, size in enumerate(shape):
+        n = mask.shape[axis]
+        if n == size:
+            continue
+        source = np.fft.fftfreq(size) * n
+        lower = np.floor(source)
+        weight = (source - lower).astype(np.float32)
+        lower = lower.astype(np.intp) % n
+        weight = weight[:, None] if axis == 0 else weight[None, :]
+        low, high = np.take(mask, lower, axis), np.take(mask, (lower + 1) % n, axis)
+        mask = low + (high - low) * weight
+    return mask
+
+def _output(image: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+    out = output_buffer(image, out, dtype=np.float32)
+    return out if out is not None else np.empty(image.shape, dtype=np.float32)
+
+def _apply_planes(image: np.ndarray,
+                  packed: np.ndarray,
+                  out: np.ndarray,
+                  pads: Tuple[int, int, int, int] = (0, 0, 0, 0),
+                  border: int = cv2.BORDER_REFLECT_101) -> np.ndarray:
+    """
+    Filtra cada plano (canal de cada imagen) con la máscara CCS `packed` y lo escribe en `out`.
+
+    cv2.dft trabaja con un plano por llamada; los buffers del plano, del espectro
+    y del resultado se reservan una vez y se reutilizan para todos los planos.
+    Cada imagen se rellena con `pads` (del tamaño de `packed`) y el resultado se recorta.
+    """
+    if image.ndim == 2 and not any(pads):
+        _filter_plane_real(image.astype(np.float32, copy=False), packed, out=out)
+        return out
+    images, targets = (image[..., None], out[..., None]) if image.ndim == 2 else (image, out)
+    frames = zip(images, targets) if image.ndim == 4 else [(images, targets)]
+    top, _, left, _ = pads
+    h, w = targets.shape[-3:-1]
+    plane = np.empty(packed.shape, dtype=np.float32)
+    spectrum = np.empty_like(plane)
+    result = np.empty_like(plane)
+    for frame, target in frames:
+        frame = _pad(frame, pads, border)
+        for c in range(frame.shape[2]):
+            plane[...] = frame[..., c]
+            _filter_plane_real(plane, packed, out=result, spectrum=spectrum)
+            target[..., c] = result[top:top + h, left:left + w]
+    return out
+
+def _filter_plane_real(plane: np.ndarray,
+                       packed: np.ndarray,
+                       out: Optional[np.ndarray] = None,
+                       spectrum: Optional[np.ndarray] = None) -> np.ndarray:
+    """DFT real float32 (CCS), producto con la máscara empaquetada y DFT inversa real."""
+    spectrum = cv2.dft(plane, dst=spectrum)
+    cv2.multiply(spectrum, packed, dst=spectrum)
+    return cv2.idft(spectrum, dst=out, flags=cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)
+
+@lru_cache(maxsize=32)
+def _ccs_indices(shape: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Frecuencia (fila, columna) de cada posición del formato CCS de cv2.dft, y su opuesta.
+
+    En CCS las columnas 1..N-1 alternan parte real e imaginaria de la columna de
+    frecuencia (c + 1) // 2; la columna 0 (y la N/2 si N es par) empaqueta en
+    vertical la fila de frecuencia (r + 1) // 2.
+    """
+    rows, cols = shape
+    c = np.arange(cols)
+    r = np.arange(rows)[:, None]
+    kx = np.broadcast_to((c + 1) // 2, (rows, cols))
+    packed_column = (c == 0) | ((cols % 2 == 0) & (c == cols - 1))
+    ky = np.where(packed_column[None, :], (r + 1) // 2, r)
+    indices = (ky, kx, (-ky) % rows, (-kx) % cols)
+    for index in indices:
+        index.flags.writeable = False
+    return indices
+
+def _pack_ccs(mask: np.ndarray) -> np.ndarray:
+    """Máscara sin desplazar -> valor en cada posición CCS, simetrizada (M(u) + M(-u)) / 2."""
+    ky, kx, ky_neg, kx_neg = _ccs_indices(mask.shape)
+    packed = mask[ky, kx].astype(np.float32)
+    packed += mask[ky_neg, kx_neg]
+    packed *= 0.5
+    return packed
+
+def frequency_mask(kind: str,
+                   shape: Tuple[int, int],
+                   cutoff: float,
+                   order: int = 2,
+                   high_pass: bool = False,
+                   layout: str = "full",
+                   image_shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """
+    Máscara radial sin desplazar (frecuencia cero en la esquina).
+
+    Las máscaras se cachean por (tipo, forma, corte, orden, pasa-altas, disposición, image_shape)
+    y se devuelven como float32 de solo lectura, construidas con arrays 1D
+    difundidos (sin meshgrid). Disposiciones:
+        - 'full': la de np.fft.fft2, (filas, columnas); np.fft.fftshift da la centrada.
+        - 'half': el semiplano de np.fft.rfft2, (filas, columnas // 2 + 1).
+        - 'ccs': el formato empaquetado de cv2.dft de una imagen real, (filas, columnas).
+
+    Args:
+        kind: 'ideal', 'butterworth' o 'gaussian'
+        shape: (filas, columnas) de la imagen
+        cutoff: Radio de corte (ideal, butterworth) o sigma (gaussian)
+        order: Orden del filtro Butterworth (se ignora en los demás)
+        high_pass: True para pasa-altas
+        layout: 'full', 'half' o 'ccs'
+        image_shape: Tamaño de la imagen antes de rellenarla hasta `shape`; el
+                     corte se mide en frecuencias de esa imagen (por defecto `shape`)
+    """
+    if kind not in FILTER_KINDS:
+        raise ValueError(f"Unknown filter kind '{kind}'. Options: {FILTER_KINDS}")
+    if layout not in MASK_LAYOUTS:
+        raise ValueError(f"Unknown mask layout '{layout}'. Options: {MASK_LAYOUTS}")
+    shape = (int(shape[0]), int(shape[1]))
+    image_shape = shape if image_shape is None else (int(image_shape[0]), int(image_shape[1]))
+    order = int(order) if kind == "butterworth" else 0
+    return _frequency_mask(kind, shape, float(cutoff), order, bool(high_pass), layout, image_shape)
+
+@lru_cache(maxsize=32)
+def _squared_distance(shape: Tuple[int, int],
+                      half: bool = False,
+                      image_shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """Distancia al cuadrado a la frecuencia cero, sin desplazar (float32, solo lectura)."""
+    rows, cols = shape
+    # Coordenadas centradas llevadas a la disposición de fft2 (equivale a ifftshift)
+    y = ((np.arange(rows) + rows // 2) % rows - rows // 2).astype(np.float32)
+    x = ((np.arange(cols) + cols // 2) % cols - cols // 2).astype(np.float32)
+    if image_shape is not None and image_shape != shape:
+        # Frecuencias de la DFT rellenada expresadas en ciclos por imagen original
+        y *= np.float32(image_shape[0] / rows)
+        x *= np.float32(image_shape[1] / cols)
+    if half:
+        x = np.abs(x[:cols // 2 + 1])  # columnas 0..N/2 de rfft2
+    d2 = y[:, None] ** 2 + x[None, :] ** 2
+    d2.flags.writeable = False
+    return d2
+
+@lru_cache(maxsize=64)
+def _frequency_mask(kind: str,
+                    shape: Tuple[int, int],
+                    cutoff: float,
+                    order: int,
+                    high_pass: bool,
+                    layout: str = "full",
+                    image_shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    if layout == "ccs":
+        # Las máscaras radiales ya son simétricas: basta con leer cada frecuencia
+        ky, kx, _, _ = _ccs_indices(shape)
+        mask = _frequency_mask(kind, shape, cutoff, order, high_pass, "full", image_shape)[ky, kx]
+        mask.flags.writeable = False
+        return mask
+    d2 = _squared_distance(shape, layout == "half", image_shape)
+    if kind == "ideal":
+        mask = (d2 <= np.float32(cutoff) ** 2).astype(np.float32)
+    elif kind == "butterworth":
+        mask = 1 / (1 + (d2 / np.float32(cutoff) ** 2) ** order)  # 1 / (1 + (d/D0)^(2n))
+    else:
+        mask = np.exp(-d2 / np.float32(2 * cutoff ** 2))
+    if high_pass:
+        mask = 1 - mask
+    mask.flags.writeable = False
+    return mask
 
 def create_ideal_filter(shape: Tuple[int, int], 
                         radius: int,
                         high_pass: bool = False) -> np.ndarray:
     """
-    Crea un filtro ideal (pasa-bajas o pasa-altas).
+    Crea un filtro ideal (pasa-bajas o pasa-altas), centrado.
+
+    Incluye las frecuencias a distancia <= radius del centro. Devuelve una copia
+    float32 de la máscara cacheada de frequency_mask. Para filtrar varias
+    imágenes con ella, prepárela una vez con prepare_fft_mask.
     """
-    rows, cols = shape
-    center = (rows // 2, cols // 2)
-    mask = np.zeros(shape=(rows, cols), dtype=np.uint8)
-    cv2.circle(img=mask, center=center, radius=radius, color=1, thickness=-1)
-    # mask = draw_circle(mask, center, radius, color=1, thickness=-1)  # test 
-    return 1 - mask if high_pass else mask
+    return np.fft.fftshift(frequency_mask("ideal", shape, radius, high_pass=high_pass))
 
 def ideal_low_pass_filter(shape: Tuple[int, int], radius: int) -> np.ndarray:
     """Crea un filtro ideal pasa-bajas."""
@@ -67,26 +406,20 @@ def create_butterworth_filter(shape: Tuple[int, int],
                               order: int = 2, 
                               high_pass: bool = False) -> np.ndarray:
     """
-    Crea un filtro Butterworth (para suavizaso en bordes). 
+    Crea un filtro Butterworth (para suavizaso en bordes), centrado.
+
+    Devuelve una copia float32 de la máscara cacheada de frequency_mask. Para
+    filtrar varias imágenes con ella, prepárela una vez con prepare_fft_mask.
     """
-    rows, cols = shape
-    crow, ccol = rows // 2, cols // 2  # centros del mask
-    x = np.arange(cols) - ccol
-    y = np.arange(rows) -crow
-    xx, yy = np.meshgrid(x, y)  # Grid con centro en el centro de la imagen
-    d = np.sqrt(xx**2 + y**2)  # distancia radial desde cada punto al centro (frecuencia cero)
-    mask = 1 / (1 + (d/radius)**(2*order))  # filtro final usando 1 / sqrt(1 - w^(2n))
-    return 1 - mask if high_pass else mask
+    return np.fft.fftshift(frequency_mask("butterworth", shape, radius, order, high_pass))
 
 def create_gaussian_filter(shape: Tuple[int, int],
                            sigma: float, 
                            high_pass: bool = False) -> np.ndarray:
-    """Crea un filtro gaussiano. """
-    rows, cols = shape
-    crow, ccol = rows // 2, cols // 2  # centros del mask
-    x = np.arange(cols) - ccol
-    y = np.arange(rows) -crow
-    xx, yy = np.meshgrid(x, y)  # Grid con centro en el centro de la imagen
-    d = np.sqrt(xx**2 + y**2)  # distancia radial desde cada punto al centro (frecuencia cero)
-    mask = np.exp(-(d**2)/(2*(sigma**2)))
-    return 1 - mask if high_pass else mask
\ No newline at end of file
+    """
+    Crea un filtro gaussiano, centrado.
+
+    Devuelve una copia float32 de la máscara cacheada de frequency_mask. Para
+    filtrar varias imágenes con ella, prepárela una vez con prepare_fft_mask.
+    """
+    return np.fft.fftshift(frequency_mask("gaussian", shape, sigma, high_pass=high_pass))
@@ -1,6 +1,9 @@
 import cv2
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from .image_filter import sobel_gradient
+from .summed_area import SummedAreaTable
 
 ### 1. Detección de Contornos y Formas ###
 def find_contours(image: np.ndarray,
@@ -141,7 +144,8 @@ def adaptive_threshold(image: np.ndarray,
                        method: str = "gaussian", 
                        threshold_type: str = "binary",
                        block_size: int = 11, 
-                       C: int = 2) -> np.ndarray:
+                       C: int = 2,
+                       sat: Optional[SummedAreaTable] = None) -> np.ndarray:
     """
     Aplica umbralización adaptativa para imágenes con iluminación no uniforme.
 
@@ -152,6 +156,9 @@ def adaptive_threshold(image: np.ndarray,
     - threshold_type (str): Tipo de umbral ('binary' o 'binary_inv').
     - block_size (int): Tamaño del área vecina usada para calcular el umbral. Debe ser impar y > 1.
     - C (int): Valor constante que se resta del umbral calculado.
+    - sat (SummedAreaTable): Tabla integral ya construida sobre `image` (solo con method='mean').
+      Permite umbralizar con varios block_size sin recalcular la media local. Con
+      border=cv2.BORDER_REPLICATE el resultado coincide con cv2.adaptiveThreshold.
 
     Returns:
     - np.ndarray: Imagen binarizada por umbral adaptativo.
@@ -175,6 +182,22 @@ def adaptive_threshold(image: np.ndarray,
     if block_size % 2 == 0 or block_size <= 1:
         raise ValueError("El block_size debe ser un número impar mayor que 1.")
 
+    if sat is not None:
+        if method != "mean":
+            raise ValueError("sat solo puede usarse con method='mean'.")
+        if sat.shape != image.shape:
+            raise ValueError(f"sat was built for shape {sat.shape}, got {image.shape}")
+        # Misma regla que OpenCV: media redondeada al tipo de la imagen y C entero
+        # (hacia arriba en 'binary', hacia abajo en 'binary_inv')
+        delta = int(np.ceil(C)) if threshold_type == "binary" else int(np.floor(C))
+        threshold = sat.box_mean(block_size, dtype=np.int16)
+        threshold -= delta
+        above = cv2.compare(image.astype(np.int16), threshold, cv2.CMP_GT)
+        if threshold_type == "binary_inv":
+            cv2.bitwise_not(above, dst=above)
+        high = int(np.clip(round(max_value), 0, 255))
+        return above if high == 255 else cv2.bitwise_and(above, high, dst=above)
+
     return cv2.adaptiveThreshold(
         src=image,
         maxValue=max_value,
@@ -275,7 +298,7 @@ def detect_edges(image: np.ndarray,
 
     Args:
         image: Imagen de entrada (escala de grises)
-        method: "canny" o "sobel"
+        method: "canny" o "sobel" ("sobbel" se acepta por compatibilidad)
         low_thresh: Umbral inferior para Canny
         high_thresh: Umbral superior para Canny
     
@@ -288,13 +311,16 @@ def detect_edges(image: np.ndarray,
 
     if method == 'canny':  # https://en.wikipedia.org/wiki/Canny_edge_detector
         return cv2.Canny(image, threshold1=low_tresh, threshold2=upper_thresh)
-    elif method == 'sobbel':  # https://en.wikipedia.org/wiki/Sobel_operator
-        sobelX = cv2.Sobel(image, cv2.CV_64F, 1, 0, ksize=3)
-        sobelY = cv2.Sobel(image, cv2.CV_64F, 0, 1, ksize=3)
-        
-        magnitude = np.sqrt(sobelX**2 + sobelY**2)# Calcular el gradiente total (magnitud)
-        magnitude = np.uint8(np.clip(magnitude / magnitude.max() * 255, 0, 255)) # Normalizar la magnitud y convertir a uint8
-        return magnitude
+    elif method in ('sobel', 'sobbel'):  # https://en.wikipedia.org/wiki/Sobel_operator
+        magnitude = sobel_gradient(image, ksize=3)  # Calcular el gradiente total (magnitud), float32
+        # Normalizar la magnitud y convertir a uint8 (truncando, sobre el mismo buffer)
+        peak = magnitude.max()
+        if peak > 0:
+            np.divide(magnitude, peak, out=magnitude)
+            np.multiply(magnitude, 255, out=magnitude)
+        edges = np.empty(image.shape, dtype=np.uint8)
+        np.copyto(edges, magnitude, casting="unsafe")
+        return edges
     else:
         raise ValueError(f"Invalid method: {method} Choose 'canny' or 'sobel'.")
     
@@ -0,0 +1,94 @@
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class ImageCache:
+    """
+    Caché LRU de imágenes decodificadas con presupuesto de memoria en bytes.
+
+    Las imágenes almacenadas se marcan como solo lectura para que quien las
+    reciba no pueda modificar la entrada compartida (usar `.copy()` si se
+    necesita editar el resultado). Es segura para usar desde varios hilos.
+
+    Args:
+        max_bytes: Memoria máxima ocupada por las imágenes almacenadas.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 ** 2):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than 0")
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """Devuelve la imagen asociada a `key` (o None) y actualiza los contadores."""
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def peek(self, key: Hashable) -> Optional[np.ndarray]:
+        """Como `get`, pero sin modificar contadores."""
+        with self._lock:
+            image = self._entries.get(key)
+            if image is not None:
+                self._entries.move_to_end(key)
+            return image
+
+    def put(self, key: Hashable, image: np.ndarray) -> np.ndarray:
+        """
+        Almacena una imagen, expulsando las menos usadas si se supera el presupuesto.
+
+        Returns:
+            La imagen almacenada (solo lectura). Si no cabe en el presupuesto
+            no se almacena y se devuelve sin modificar.
+        """
+        if image.nbytes > self.max_bytes:
+            return image
+        image.flags.writeable = False
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.nbytes
+            self._entries[key] = image
+            self.current_bytes += image.nbytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+        return image
+
+    def clear(self) -> None:
+        """Elimina todas las entradas (los contadores se conservan)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """Devuelve un diccionario con el estado de la caché."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
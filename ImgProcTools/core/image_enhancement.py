@@ -1,8 +1,14 @@
 import cv2
 import numpy as np
+from functools import lru_cache
 from typing import Tuple, List, Optional, Union
 
-def adjust_brightness(image: np.ndarray, beta: float) -> np.ndarray:
+from utils.utils import output_buffer
+
+# Las funciones aceptan `out=` (array de salida preasignado) y, las punto a
+# punto, `inplace=True` para escribir el resultado sobre la propia entrada.
+def adjust_brightness(image: np.ndarray, beta: float,
+                      out: Optional[np.ndarray] = None, inplace: bool = False) -> np.ndarray:
     """
     Ajusta el brillo de una imagen (suma un valor constante a todos los píxeles).
     
@@ -14,9 +20,11 @@ def adjust_brightness(image: np.ndarray, beta: float) -> np.ndarray:
     Returns:
         Imagen con el brillo ajustado (mismo formato que la entrada).
     """
-    return cv2.convertScaleAbs(image, alpha=1.0, beta=beta)  # https://docs.opencv.org/4.x/d2/de8/group__core__array.html#ga3460e9c9f37b563ab9dd550c4d8c4e7d
+    dst = output_buffer(image, out, inplace, dtype=np.uint8)
+    return cv2.convertScaleAbs(image, dst, alpha=1.0, beta=beta)  # https://docs.opencv.org/4.x/d2/de8/group__core__array.html#ga3460e9c9f37b563ab9dd550c4d8c4e7d
 
-def adjust_contrast(image: np.ndarray, alpha: float) -> np.ndarray:
+def adjust_contrast(image: np.ndarray, alpha: float,
+                    out: Optional[np.ndarray] = None, inplace: bool = False) -> np.ndarray:
     """
     Ajusta el contraste de una imagen (multiplica los valores de píxel por un factor).
     
@@ -28,9 +36,11 @@ def adjust_contrast(image: np.ndarray, alpha: float) -> np.ndarray:
     Returns:
         Imagen con el contraste ajustado.
     """
-    return cv2.convertScaleAbs(image, alpha=alpha, beta=0)
+    dst = output_buffer(image, out, inplace, dtype=np.uint8)
+    return cv2.convertScaleAbs(image, dst, alpha=alpha, beta=0)
 
-def adjust_brightness_contrast(image: np.ndarray, alpha: float, beta: float) -> np.ndarray:
+def adjust_brightness_contrast(image: np.ndarray, alpha: float, beta: float,
+                               out: Optional[np.ndarray] = None, inplace: bool = False) -> np.ndarray:
     """
     Ajusta simultáneamente brillo y contraste.
     
@@ -41,21 +51,28 @@ def adjust_brightness_contrast(image: np.ndarray, alpha: float, beta: float) ->
     Returns:
         Imagen ajustada.
     """
-    return cv2.convertScaleAbs(image, alpha=alpha, beta=beta)
+    dst = output_buffer(image, out, inplace, dtype=np.uint8)
+    return cv2.convertScaleAbs(image, dst, alpha=alpha, beta=beta)
 
-def histogram_equalization(image: np.ndarray) -> np.ndarray:
+def histogram_equalization(image: np.ndarray,
+                           out: Optional[np.ndarray] = None,
+                           inplace: bool = False) -> np.ndarray:
     """
     Ecualización del histograma para mejorar el contraste en imagenes en escala de grises. 
+    `out` recibe el resultado; `inplace=True` solo es válido para imágenes en gris.
     """
-    if len(image) == 3: 
+    if image.ndim == 3:
+        if inplace:
+            raise ValueError("inplace=True requires a grayscale image")
         image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     
-    return cv2.equalizeHist(image) 
+    return cv2.equalizeHist(image, dst=output_buffer(image, out, inplace)) 
 
 # https://docs.opencv.org/4.x/d5/daf/tutorial_py_histogram_equalization.html
 def clahe(image: np.ndarray, 
           clip_limit: float = 2.0, 
-          grid_size: Tuple[int, int] = (8, 8)) -> np.ndarray:
+          grid_size: Tuple[int, int] = (8, 8),
+          out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     CLAHE: Contrast Limited Adaptative Histogram Equalizable
     Ecualización adaptativa del histograma usando CLAHE. 
@@ -65,72 +82,386 @@ def clahe(image: np.ndarray,
         image: Imagen en escala de grises o BGR.
         clip_limit: Límite de contraste para evitar amplificación de ruido (valores típicos: 1.0-3.0).
         grid_size: Tamaño de la cuadrícula para procesamiento local (ej: (8,8)).
+        out: Array de salida opcional (misma forma y tipo que `image`).
     
     Returns:
         Imagen procesada con CLAHE.
     """
-    if len(image) == 3: 
+    out = output_buffer(image, out)
+    if image.ndim == 3: 
         # Convertir a LAB format y aplicar CLAHE en el canal L (luminicencia)
         lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
         l, a, b = cv2.split(lab)
         clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=grid_size)
         l = clahe.apply(l)
         lab = cv2.merge((l, a, b))
-        return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
+        return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR, dst=out)
     else: 
         clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=grid_size)
-        return clahe.apply(image)
+        return clahe.apply(image, dst=out)
 
 # https://docs.opencv.org/3.4/d3/dc1/tutorial_basic_linear_transform.html
-def gamma_correction(image: np.ndarray, gamma: float = 1.0) -> np.ndarray:
+def gamma_correction(image: np.ndarray, gamma: float = 1.0,
+                     out: Optional[np.ndarray] = None, inplace: bool = False) -> np.ndarray:
     """
     Corrección gamma para ajustar no linealmente la luminosidad. 
     Args: 
         image: Imagen de entrada. 
         gamma: Valor gamma (y < 0 oscurece y > 0 aclara). 
                Rango típico: [0.5, 2.5]
+        out: Array de salida opcional.
+        inplace: Escribe el resultado sobre `image`.
     
     Returns: 
         Imagen con corrección gamma aplicada. 
     """
     if gamma <= 0:
         raise ValueError("Gamma must be greater than 0") 
+    return cv2.LUT(image, _gamma_table(float(gamma)), dst=output_buffer(image, out, inplace))  # LUT: https://docs.opencv.org/4.x/d2/de8/group__core__array.html#gab55b8d062b7f5587720ede032d34156f
+
+@lru_cache(maxsize=64)
+def _gamma_table(gamma: float) -> np.ndarray:
+    """LUT de corrección gamma (cacheada, de solo lectura)."""
     inv_gamma = 1.0 / gamma
     # formula para aplicar corrección gamma: output = 255 * (input / 255)**gamma
     # al usar LUT la formula cambia: LUT[i] = (i / 255)**(1/gamma) * 255
-    table = np.array([((i / 255.0) ** inv_gamma) * 255 for i in np.arange(0, 256)]).astype("uint8")
-    return cv2.LUT(image, table)  # LUT: https://docs.opencv.org/4.x/d2/de8/group__core__array.html#gab55b8d062b7f5587720ede032d34156f
+    table = ((np.arange(256) / 255.0) ** inv_gamma * 255).astype(np.uint8)
+    table.flags.writeable = False
+    return table
 
 
-def auto_contrast(image: np.ndarray, cutoff: float = 0.5) -> np.ndarray:
+def auto_contrast(image: np.ndarray, cutoff: float = 0.5,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Ajuste automático de contraste basado en histograma.
     
     Args:
         image: Imagen de entrada.
         cutoff: Porcentaje de píxeles a recortar en los extremos del histograma (0-1).
+        out: Array de salida opcional (misma forma y tipo que `image`).
     
     Returns:
         Imagen con contraste optimizado.
     """
+    if image.dtype == np.uint8:
+        # Histograma de cada canal directamente sobre la imagen (sin split) y una sola LUT
+        n_channels = image.shape[2] if image.ndim == 3 else 1
+        tables = [auto_contrast_table(cv2.calcHist([image], [c], None, [256], [0, 256]), cutoff)
+                  for c in range(n_channels)]
+        table = tables[0] if n_channels == 1 else np.stack(tables, axis=1)[:, None, :]
+        return cv2.LUT(image, table, dst=output_buffer(image, out))
     if len(image.shape) == 3:
         # Procesar cada canal por separado para imágenes a color
         channels = cv2.split(image)
         equalized = [auto_contrast_channel(ch, cutoff) for ch in channels]
-        return cv2.merge(equalized)
+        return cv2.merge(equalized, dst=output_buffer(image, out))
     else:
-        return auto_contrast_channel(image, cutoff)
+        result = auto_contrast_channel(image, cutoff)
+        out = output_buffer(image, out)
+        if out is None:
+            return result
+        np.copyto(out, result)
+        return out
 
 def auto_contrast_channel(channel: np.ndarray, cutoff: float) -> np.ndarray:
     """Función auxiliar para auto_contrast (procesa un solo canal)."""
     # Calcular límites de recorte basados en el histograma
     hist = cv2.calcHist([channel], [0], None, [256], [0, 256])
-    cdf = hist.cumsum()
-    total = cdf[-1]
-    low = np.searchsorted(cdf, cutoff * total)
-    high = np.searchsorted(cdf, (1 - cutoff) * total)
+    if channel.dtype == np.uint8:
+        return cv2.LUT(channel, auto_contrast_table(hist, cutoff))
+    low, high = _contrast_limits(hist, cutoff)
     
     # Aplicar estiramiento lineal del histograma
     channel = np.clip(channel, low, high)
     channel = ((channel - low) / (high - low) * 255).astype(np.uint8)
-    return channel
\ No newline at end of file
+    return channel
+
+def auto_contrast_table(hist: np.ndarray, cutoff: float) -> np.ndarray:
+    """
+    LUT de 256 entradas equivalente a `auto_contrast_channel` para un canal
+    con histograma `hist` (256 bins).
+    """
+    return _contrast_table(*_contrast_limits(hist, cutoff))
+
+
+def _contrast_limits(hist: np.ndarray, cutoff: float) -> Tuple[int, int]:
+    """Límites de recorte (low, high) del histograma para `cutoff`."""
+    cdf = np.asarray(hist, dtype=np.float32).ravel().cumsum()
+    total = cdf[-1]
+    low = np.searchsorted(cdf, cutoff * total)
+    high = np.searchsorted(cdf, (1 - cutoff) * total)
+    return int(low), int(high)
+
+
+@lru_cache(maxsize=256)
+def _contrast_table(low: int, high: int) -> np.ndarray:
+    """LUT de estiramiento lineal [low, high] -> [0, 255] (cacheada, de solo lectura)."""
+    ramp = np.clip(np.arange(256), low, high)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table = ((ramp - low) / (high - low) * 255).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+
+class PointOpChain:
+    """
+    Encadena operaciones punto a punto sobre imágenes uint8 (brillo, contraste,
+    gamma, auto-contraste, LUTs) y las aplica en una sola pasada con `cv2.LUT`.
+
+    Cada operación se aplica a una rampa 0..255 en lugar de a la imagen, por lo
+    que el resultado coincide bit a bit con aplicarlas una tras otra. Las
+    imágenes a color usan una única tabla 256x1xC (una columna por canal).
+    `auto_contrast` depende del histograma: se calcula una vez sobre la entrada
+    y se propaga a través de la tabla acumulada.
+
+    Ejemplo:
+        chain = PointOpChain().adjust_brightness(20).gamma_correction(0.8).auto_contrast(0.01)
+        for frame in frames:
+            chain.apply(frame, inplace=True)
+    """
+
+    def __init__(self):
+        self._ops = []
+        self._static_tables = {}  # canales -> tabla, si ninguna operación depende de la imagen
+
+    def _then(self, op: str, *params) -> "PointOpChain":
+        self._ops.append((op, params))
+        self._static_tables.clear()
+        return self
+
+    def adjust_brightness(self, beta: float) -> "PointOpChain":
+        return self._then("brightness_contrast", 1.0, beta)
+
+    def adjust_contrast(self, alpha: float) -> "PointOpChain":
+        return self._then("brightness_contrast", alpha, 0)
+
+    def adjust_brightness_contrast(self, alpha: float, beta: float) -> "PointOpChain":
+        return self._then("brightness_contrast", alpha, beta)
+
+    def gamma_correction(self, gamma: float) -> "PointOpChain":
+        if gamma <= 0:
+            raise ValueError("Gamma must be greater than 0")
+        return self._then("gamma", gamma)
+
+    def auto_contrast(self, cutoff: float = 0.5) -> "PointOpChain":
+        return self._then("auto_contrast", cutoff)
+
+    def lut(self, table: np.ndarray) -> "PointOpChain":
+        """Añade una LUT arbitraria de 256 valores uint8."""
+        table = np.asarray(table)
+        if table.size != 256 or table.dtype != np.uint8:
+            raise ValueError("table must contain 256 uint8 values")
+        return self._then("lut", table.ravel())
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def table(self, image: np.ndarray) -> np.ndarray:
+        """
+        Calcula la LUT fusionada para `image`.
+
+        Returns:
+            Tabla (256,) para imágenes de un canal o (256, 1, C) para C canales.
+        """
+        if image.dtype != np.uint8:
+            raise ValueError("PointOpChain only supports uint8 images")
+        channels = image.shape[2] if image.ndim == 3 else 1
+        if channels in self._static_tables:
+            return self._static_tables[channels]
+
+        # Columna c = valores que toma el canal c tras las operaciones ya aplicadas
+        lut = np.repeat(np.arange(256, dtype=np.uint8)[:, None], channels, axis=1)
+        hists = None
+        for op, params in self._ops:
+            if op == "brightness_contrast":
+                lut = adjust_brightness_contrast(lut, *params, inplace=True)
+            elif op == "gamma":
+                lut = gamma_correction(lut, *params, inplace=True)
+            elif op == "lut":
+                lut = params[0][lut]
+            elif op == "auto_contrast":
+                if hists is None:
+                    hists = [cv2.calcHist([image], [c], None, [256], [0, 256]).ravel()
+                             for c in range(channels)]
+                for c in range(channels):
+                    # Histograma de la imagen intermedia = histograma de entrada remapeado
+                    hist = np.bincount(lut[:, c], weights=hists[c], minlength=256)
+                    lut[:, c] = auto_contrast_table(hist, *params)[lut[:, c]]
+
+        table = lut.ravel() if channels == 1 else np.ascontiguousarray(lut[:, None, :])
+        if hists is None:
+            self._static_tables[channels] = table
+        return table
+
+    def apply(self, image: np.ndarray,
+              out: Optional[np.ndarray] = None,
+              inplace: bool = False) -> np.ndarray:
+        """
+        Aplica la cadena con una sola llamada a `cv2.LUT`.
+
+        Args:
+            image: Imagen uint8 (gris o a color).
+            out: Array de salida opcional.
+            inplace: Escribe el resultado sobre `image`.
+        """
+        return cv2.LUT(image, self.table(image), dst=output_buffer(image, out, inplace))
+
+
+class StreamingCLAHE:
+    """
+    CLAHE con estado para secuencias de video.
+
+    Reutiliza el objeto CLAHE de OpenCV y los buffers LAB / canal L entre
+    frames (sin asignaciones por frame si se pasa `out`). Con `smoothing > 0`
+    los histogramas recortados de cada tile se promedian exponencialmente en el
+    tiempo, lo que reduce el parpadeo entre frames consecutivos.
+
+    Args:
+        clip_limit: Límite de contraste (como en `clahe`).
+        grid_size: Tamaño de la cuadrícula de tiles (columnas, filas).
+        smoothing: Peso del pasado en la media exponencial de los histogramas
+                   (0 = sin suavizado, usa cv2.CLAHE; típico 0.8-0.95).
+
+    Ejemplo:
+        equalizer = StreamingCLAHE(clip_limit=2.0, smoothing=0.9)
+        for index, frame in FrameStream("video.mp4"):
+            equalizer.apply(frame, out=frame)
+    """
+
+    def __init__(self,
+                 clip_limit: float = 2.0,
+                 grid_size: Tuple[int, int] = (8, 8),
+                 smoothing: float = 0.0):
+        if not 0 <= smoothing < 1:
+            raise ValueError("smoothing must be in [0, 1)")
+        self.clip_limit = clip_limit
+        self.grid_size = tuple(grid_size)
+        self.smoothing = smoothing
+        self._clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=self.grid_size)
+        self._lab = None
+        self._luminance = None
+        self._plan = None
+        self._hist = None
+
+    def reset(self) -> None:
+        """Olvida los histogramas acumulados (ej: tras un corte de escena)."""
+        self._hist = None
+
+    def apply(self, frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Ecualiza un frame (gris o BGR, uint8).
+
+        Args:
+            frame: Frame de entrada.
+            out: Array de salida opcional (puede ser el propio `frame`).
+
+        Returns:
+            Frame ecualizado.
+        """
+        if frame.dtype != np.uint8:
+            raise ValueError("StreamingCLAHE only supports uint8 frames")
+        out = output_buffer(frame, out)
+        if frame.ndim == 2:
+            return self._equalize(frame, out)
+
+        if self._lab is None or self._lab.shape != frame.shape:
+            self._lab = np.empty(frame.shape, dtype=np.uint8)
+            self._luminance = np.empty(frame.shape[:2], dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2LAB, dst=self._lab)
+        cv2.extractChannel(self._lab, 0, dst=self._luminance)
+        self._equalize(self._luminance, self._luminance)
+        cv2.insertChannel(self._luminance, self._lab, 0)
+        return cv2.cvtColor(self._lab, cv2.COLOR_LAB2BGR, dst=out)
+
+    def _equalize(self, channel: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+        if self.smoothing == 0:
+            return self._clahe.apply(channel, dst=out)
+
+        plan = self._get_plan(channel.shape)
+        hist = self._clipped_histograms(channel, plan)
+        if self._hist is None or self._hist.shape != hist.shape:
+            self._hist = hist
+        else:
+            self._hist *= self.smoothing
+            self._hist += (1 - self.smoothing) * hist
+        # LUT por tile: histograma acumulado escalado a [0, 255]
+        cdf = np.cumsum(self._hist, axis=1).astype(np.float32)
+        luts = np.rint(cdf * plan["lut_scale"]).clip(0, 255)
+
+        # Interpolación bilineal entre las LUTs de los 4 tiles vecinos. Entre los
+        # centros de tiles los 4 vecinos no cambian: cada región se pasa por sus 4
+        # LUTs con cv2.LUT y la mezcla se hace en cv2 sobre los buffers del plan
+        gx = self.grid_size[0]
+        top_left, top_right, bottom_left, bottom_right, top = plan["corners"]
+        for y0, y1, ty1, ty2 in plan["row_segments"]:
+            for x0, x1, tx1, tx2 in plan["col_segments"]:
+                region = channel[y0:y1, x0:x1]
+                for dst, tile in ((top_left, ty1 * gx + tx1), (top_right, ty1 * gx + tx2),
+                                  (bottom_left, ty2 * gx + tx1), (bottom_right, ty2 * gx + tx2)):
+                    cv2.LUT(region, luts[tile], dst=dst[y0:y1, x0:x1])
+        xa, xa1, ya, ya1 = plan["weights"]
+        # Sin solapar entradas y salida (cv2.blendLinear no trabaja in-place)
+        cv2.blendLinear(top_left, top_right, xa1, xa, dst=top)
+        bottom = cv2.blendLinear(bottom_left, bottom_right, xa1, xa, dst=top_left)
+        result = cv2.blendLinear(top, bottom, ya1, ya, dst=top_right)
+        return cv2.convertScaleAbs(result, dst=out)  # valores en [0, 255]: redondeo y saturación
+
+    def _get_plan(self, shape: Tuple[int, int]) -> dict:
+        """Geometría de tiles, regiones de interpolación y buffers (una vez por tamaño)."""
+        if self._plan is not None and self._plan["shape"] == shape:
+            return self._plan
+        h, w = shape
+        gx, gy = self.grid_size
+        # Como cv2.CLAHE: si no es divisible se extiende con BORDER_REFLECT_101
+        # (en ambos ejes, aunque uno de ellos sí lo sea)
+        pad_x, pad_y = (0, 0) if w % gx == 0 and h % gy == 0 else (gx - w % gx, gy - h % gy)
+        tw, th = (w + pad_x) // gx, (h + pad_y) // gy
+
+        def axis_weights(n: int, tile: int, tiles: int):
+            f = np.arange(n, dtype=np.float32) * np.float32(1.0 / tile) - np.float32(0.5)
+            t1 = np.floor(f).astype(np.int32)
+            a = f - t1
+            return np.maximum(t1, 0), np.minimum(t1 + 1, tiles - 1), a, np.float32(1.0) - a
+
+        def segments(t1: np.ndarray, t2: np.ndarray, tiles: int) -> List[Tuple[int, int, int, int]]:
+            # Tramos consecutivos con el mismo par de tiles vecinos: (inicio, fin, t1, t2)
+            starts = np.flatnonzero(np.diff(t1 * tiles + t2)) + 1
+            bounds = [0, *starts.tolist(), len(t1)]
+            return [(a, b, int(t1[a]), int(t2[a])) for a, b in zip(bounds[:-1], bounds[1:])]
+
+        tx1, tx2, xa, xa1 = axis_weights(w, tw, gx)
+        ty1, ty2, ya, ya1 = axis_weights(h, th, gy)
+        self._plan = {
+            "shape": shape, "pad": (pad_x, pad_y), "tile_size": (tw, th),
+            "clip": max(int(self.clip_limit * tw * th / 256), 1),
+            "lut_scale": np.float32(255.0 / (tw * th)),
+            "row_segments": segments(ty1, ty2, gy), "col_segments": segments(tx1, tx2, gx),
+            # Pesos por píxel de cv2.blendLinear: (xa, 1 - xa, ya, 1 - ya)
+            "weights": tuple(np.ascontiguousarray(np.broadcast_to(weight, shape), dtype=np.float32)
+                             for weight in (xa[None, :], xa1[None, :], ya[:, None], ya1[:, None])),
+            "corners": np.empty((5,) + shape, dtype=np.float32),
+            "padded": np.empty((h + pad_y, w + pad_x), dtype=np.uint8) if pad_x or pad_y else None,
+        }
+        return self._plan
+
+    def _clipped_histograms(self, channel: np.ndarray, plan: dict) -> np.ndarray:
+        """Histogramas de cada tile recortados y redistribuidos como cv2.CLAHE."""
+        pad_x, pad_y = plan["pad"]
+        if pad_x or pad_y:
+            channel = cv2.copyMakeBorder(channel, 0, pad_y, 0, pad_x, cv2.BORDER_REFLECT_101,
+                                         dst=plan["padded"])
+        (gx, gy), (tw, th) = self.grid_size, plan["tile_size"]
+        hist = np.stack([cv2.calcHist([channel[ty * th:(ty + 1) * th, tx * tw:(tx + 1) * tw]],
+                                      [0], None, [256], [0, 256]).ravel()
+                         for ty in range(gy) for tx in range(gx)]).astype(np.int64)
+        if self.clip_limit > 0:
+            clip = plan["clip"]
+            excess = np.maximum(hist - clip, 0).sum(axis=1)
+            np.minimum(hist, clip, out=hist)
+            batch, residual = np.divmod(excess, 256)
+            hist += batch[:, None]
+            # El resto se reparte de `step` en `step` bins desde el 0
+            step = np.maximum(256 // np.maximum(residual, 1), 1)[:, None]
+            bins = np.arange(256)[None, :]
+            hist += (bins % step == 0) & (bins // step < residual[:, None])
+        return hist.astype(np.float64)
@@ -1,34 +1,114 @@
 import cv2
 import numpy as np
+from collections import namedtuple
+from functools import lru_cache
 from typing import Tuple, List, Union, Optional
 
+from utils.utils import output_buffer
+
+from .summed_area import SummedAreaTable
+from .morphology import median_filter
+from .large_image import LargeImage
+
+
+def _map_large_image(func, image: LargeImage, halo: int, out: Optional[np.ndarray],
+                     inplace: bool = False, *args, **kwargs) -> np.ndarray:
+    """
+    Aplica `func` a un LargeImage por bloques (`LargeImage.map_tiles`) con un
+    margen igual al radio del kernel: mismo resultado que sobre la imagen
+    completa sin cargarla en memoria.
+    """
+    if inplace:
+        raise ValueError("inplace=True is not supported for LargeImage (read-only memory map); use out=")
+    return image.map_tiles(func, *args, halo=halo, out=out, **kwargs)
+
+
+class _ValueRange:
+    """Destino de `map_tiles` que no guarda los bloques: solo su mínimo y máximo."""
+
+    def __init__(self):
+        self.low, self.high = np.inf, -np.inf
+
+    def __setitem__(self, key, block: np.ndarray) -> None:
+        self.low = min(self.low, float(block.min()))
+        self.high = max(self.high, float(block.max()))
+
+
+def _normalize_large_image(func, image: LargeImage, halo: int, out: Optional[np.ndarray]) -> np.ndarray:
+    """
+    cv2.normalize(func(imagen), out, 0, 255, NORM_MINMAX, CV_8U) sobre un LargeImage
+    en dos pasadas por bloques: la primera solo obtiene el rango global y la
+    segunda escala cada bloque directamente en `out` (sin intermedio de tamaño completo).
+    """
+    value_range = _ValueRange()
+    image.map_tiles(func, halo=halo, out=value_range)
+    low, high = value_range.low, value_range.high
+    scale = 255 / (high - low) if high > low else 0.0
+    # (v - low)·scale >= 0: el valor absoluto de convertScaleAbs no cambia nada
+    return image.map_tiles(lambda tile: cv2.convertScaleAbs(func(tile), alpha=scale, beta=-low * scale),
+                           halo=halo, out=out)
+
 
 ### 1. Filtros de Suavizado (Denoising) ###
+# Todos los filtros aceptan `out=` (array de salida preasignado); los que
+# OpenCV permite calcular sobre la propia entrada aceptan además `inplace=True`.
+# Los filtros locales aceptan también un LargeImage: se procesa por bloques
+# con `map_tiles` y `out` puede ser un np.memmap.
 def avgerage_blur(image: np.ndarray,
-                  kernel_size: Tuple[int, int] = (5, 5)) -> np.ndarray: 
+                  kernel_size: Tuple[int, int] = (5, 5),
+                  out: Optional[np.ndarray] = None,
+                  inplace: bool = False,
+                  sat: Optional[SummedAreaTable] = None) -> np.ndarray: 
     """
     Aplica filtro de promedio.
 
     Args:
         image: Imagen de entrada
         kernel_size: Tamaño del kernel (ancho, alto) - deben ser impares
+        out: Array de salida opcional (misma forma y tipo que `image`)
+        inplace: Escribe el resultado sobre `image`
+        sat: SummedAreaTable ya construida sobre `image`; útil al promediar
+             la misma imagen con muchos tamaños de kernel
     """
-    return cv2.blur(image, kernel_size)
+    if isinstance(image, LargeImage):
+        if sat is not None:
+            raise ValueError("sat is not supported for LargeImage inputs")
+        return _map_large_image(avgerage_blur, image, max(kernel_size) // 2, out, inplace, kernel_size)
+    dst = output_buffer(image, out, inplace)
+    if sat is not None:
+        if sat.shape != image.shape:
+            raise ValueError(f"sat was built for shape {sat.shape}, got {image.shape}")
+        return sat.box_mean(kernel_size, dtype=image.dtype, out=dst)
+    return cv2.blur(image, kernel_size, dst=dst)
 
 def median_blur(image: np.ndarray, 
-               kernel_size: int = 5) -> np.ndarray:
+               kernel_size: int = 5,
+               out: Optional[np.ndarray] = None,
+               inplace: bool = False) -> np.ndarray:
     """
     Aplica filtro de mediana, efectivo para ruido 'salt-and-pepper'.
 
+    cv2.medianBlur solo admite kernels > 5 en uint8; para imágenes uint16 con
+    kernels grandes se usa `median_filter` (coste independiente del kernel).
+
     Args:
         image: Imagen de entrada
         kernel_size: Tamaño del kernel (entero impar, típico 3, 5 o 7)
+        out: Array de salida opcional (misma forma y tipo que `image`)
+        inplace: Escribe el resultado sobre `image`
     """
-    return cv2.medianBlur(image, kernel_size)
+    if isinstance(image, LargeImage):
+        return _map_large_image(median_blur, image, kernel_size // 2, out, inplace, kernel_size)
+    dst = output_buffer(image, out, inplace)
+    if image.dtype != np.uint8 and kernel_size > 5:
+        return median_filter(image, kernel_size, out=dst)
+    return cv2.medianBlur(image, kernel_size, dst=dst)
 
 def gaussian_blur(image: np.ndarray, 
                   kernel_size: Tuple[int, int] = (5, 5), 
-                  sigma: float = 0) -> np.ndarray: 
+                  sigma: float = 0,
+                  out: Optional[np.ndarray] = None,
+                  inplace: bool = False) -> np.ndarray: 
     """
     Aplica filtro Gaussiano para suavizado y reducción de ruido.
     
@@ -36,92 +116,447 @@ def gaussian_blur(image: np.ndarray,
         image: Imagen de entrada
         kernel_size: Tamaño del kernel (ancho, alto) - deben ser impares
         sigma: Desviación estándar en X (0 para cálculo automático)
+        out: Array de salida opcional (misma forma y tipo que `image`)
+        inplace: Escribe el resultado sobre `image`
     """
-    return cv2.GaussianBlur(image, kernel_size, sigma)
+    if isinstance(image, LargeImage):
+        # Con kernel_size (0, 0) OpenCV deriva el tamaño de sigma (radio <= 4·sigma)
+        halo = max(kernel_size) // 2 if min(kernel_size) > 0 else int(np.ceil(4 * sigma))
+        return _map_large_image(gaussian_blur, image, halo, out, inplace, kernel_size, sigma)
+    return cv2.GaussianBlur(image, kernel_size, sigma, dst=output_buffer(image, out, inplace))
 
 def bilateral_filter(image: np.ndarray,
                      d: int = 9, 
                      sigma_color: float = 75, 
-                     sigma_space: float = 75) -> np.ndarray: 
+                     sigma_space: float = 75,
+                     out: Optional[np.ndarray] = None,
+                     method: str = "exact") -> np.ndarray: 
     """
     Filtro bilateral que preserva bordes mientras reduce ruido.
-    
+
+    Con method="fast" se usa una rejilla bilateral (ver `_bilateral_grid`), cuyo
+    coste casi no depende de `d`: en una imagen de 6 MP y d=41 pasa de ~20 s a
+    ~0.5 s. Frente al filtro exacto, sobre las 22 imágenes de examples/images
+    el PSNR va de 25 a 55 dB (medio ~42 dB) con d=25, sigma_color=30,
+    sigma_space=10, y de 23 a 52 dB (medio ~40 dB) con d=41, 75, 75; el mínimo
+    es rbflowers (colores saturados distintos con la misma suma de canales).
+
+    Si la rejilla tuviera más celdas que la imagen píxeles (radio o sigma_color
+    pequeños: p. ej. d=9, 75, 75 en todas esas imágenes) "fast" usa el filtro
+    exacto, que en ese caso es igual o más rápido.
+
     Args:
         image: Imagen de entrada
         d: Diámetro del vecindario (tamaño del filtro)
         sigma_color: Filtro en el espacio de color
         sigma_space: Filtro en el espacio geométrico
+        out: Array de salida opcional, distinto de `image` (OpenCV no admite in-place)
+        method: 'exact' (cv2.bilateralFilter) o 'fast' (rejilla bilateral aproximada)
     """
-    return cv2.bilateralFilter(image, d, sigma_color, sigma_space)
+    if isinstance(image, LargeImage):
+        # Radio de OpenCV; la rejilla (method="fast") suaviza unas 2 celdas de hasta
+        # medio radio más la interpolación: el doble basta
+        halo = d // 2 if d > 0 else int(round(1.5 * sigma_space))
+        if method == "fast":
+            halo *= 2
+        return _map_large_image(bilateral_filter, image, halo, out, False,
+                                d, sigma_color, sigma_space, method=method)
+    if method == "fast":
+        return _bilateral_grid(image, d, sigma_color, sigma_space, out=output_buffer(image, out))
+    if method != "exact":
+        raise ValueError(f"Unknown bilateral method '{method}'. Options: 'exact', 'fast'")
+    return cv2.bilateralFilter(image, d, sigma_color, sigma_space, dst=output_buffer(image, out))
+
+# Padding de la rejilla bilateral (en celdas) y núcleo de suavizado por eje (sigma ~1 celda)
+BILATERAL_GRID_PAD = 2
+_GRID_KERNEL = np.float32([1, 4, 6, 4, 1]) / 16
+# cv2.remap exige que origen y destino tengan menos de SHRT_MAX filas y columnas
+_REMAP_MAX_SIZE = 32766
+
+
+def _bilateral_grid(image: np.ndarray,
+                    d: int,
+                    sigma_color: float,
+                    sigma_space: float,
+                    out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Filtro bilateral aproximado con una rejilla bilateral (Paris y Durand / Chen et al.).
+
+    Cada píxel se acumula (valor, 1) en una rejilla 3D (y, x, intensidad) submuestreada
+    a sigma_espacial x sigma_color, la rejilla se suaviza con un núcleo gaussiano
+    separable y el resultado se lee por interpolación trilineal. Como la rejilla se
+    hace más pequeña al crecer el radio, el coste es casi constante en `d`.
+
+    Con radios o sigma_color pequeños la rejilla tendría más celdas que la imagen
+    píxeles (y ya no ahorra nada): en ese caso se usa el filtro exacto. Los niveles
+    de intensidad se colocan en un mosaico 2D de niveles para que cv2.remap no
+    supere su límite de SHRT_MAX filas.
+
+    La guía de rango es la suma de canales (OpenCV usa la suma de diferencias
+    absolutas por canal). El radio espacial efectivo es el de OpenCV: d // 2, o
+    1.5·sigma_space si d <= 0; la sigma espacial de la rejilla es la menor entre
+    sigma_space y la mitad de ese radio, ya que OpenCV trunca el núcleo al radio.
+    """
+    h, w = image.shape[:2]
+    channels = image.shape[2] if image.ndim == 3 else 1
+    sigma_color = sigma_color if sigma_color > 0 else 1.0
+    sigma_space = sigma_space if sigma_space > 0 else 1.0
+    radius = d // 2 if d > 0 else round(sigma_space * 1.5)
+    step = max(min(sigma_space, radius / 2), 1.0)
+    pad = BILATERAL_GRID_PAD
+
+    source = image.astype(np.float32, copy=False)
+    guide = cv2.transform(source, np.ones((1, channels), np.float32)) if channels > 1 else source.reshape(h, w)
+    z = guide - float(guide.min())
+    z *= 1.0 / sigma_color
+    grid_h = int((h - 1) / step) + 1 + 2 * pad
+    grid_w = int((w - 1) / step) + 1 + 2 * pad
+    grid_z = int(z.max()) + 1 + 2 * pad
+    # Mosaico de niveles: `per_column` niveles apilados en vertical por columna de niveles
+    per_column = min(grid_z, _REMAP_MAX_SIZE // grid_h)
+    columns = -(-grid_z // per_column) if per_column else 0
+    if grid_z * grid_h * grid_w > h * w or per_column == 0 or columns * grid_w > _REMAP_MAX_SIZE:
+        return cv2.bilateralFilter(image, d, sigma_color, sigma_space, dst=out)
+
+    # Splat: índice lineal de la celda más cercana de cada píxel
+    index = np.rint(z).astype(np.intp)
+    index += pad
+    index *= grid_h * grid_w
+    index += ((np.rint(np.arange(h) / step).astype(np.intp) + pad) * grid_w)[:, None]
+    index += (np.rint(np.arange(w) / step).astype(np.intp) + pad)[None, :]
+    index = index.ravel()
+    size = grid_z * grid_h * grid_w
+    planes = source.reshape(-1, channels)
+    # Niveles de intensidad (completados con niveles vacíos hasta llenar el mosaico)
+    grid = np.zeros((columns * per_column, grid_h, grid_w, channels + 1), np.float32)
+    stacked = grid.reshape(-1, grid_w, channels + 1)
+    for c in range(channels):
+        stacked[:grid_z * grid_h, :, c] = np.bincount(index, weights=planes[:, c],
+                                                      minlength=size).reshape(-1, grid_w)
+    stacked[:grid_z * grid_h, :, channels] = np.bincount(index, minlength=size).reshape(-1, grid_w)
+
+    # Suavizado en z sobre los niveles contiguos y en (y, x) sobre el mosaico: el
+    # padding de ceros alrededor de cada nivel evita mezclar niveles vecinos
+    levels = grid.reshape(grid.shape[0], -1)
+    cv2.sepFilter2D(levels, -1, np.float32([1]), _GRID_KERNEL, dst=levels, borderType=cv2.BORDER_CONSTANT)
+    if columns > 1:
+        grid = grid.reshape(columns, per_column, grid_h, grid_w, channels + 1).transpose(1, 2, 0, 3, 4)
+    mosaic = np.ascontiguousarray(grid).reshape(per_column * grid_h, columns * grid_w, channels + 1)
+    cv2.sepFilter2D(mosaic, -1, _GRID_KERNEL, _GRID_KERNEL, dst=mosaic, borderType=cv2.BORDER_CONSTANT)
+
+    # Slice: interpolación bilineal en los dos niveles que rodean a cada píxel
+    z += pad
+    level = np.floor(z)
+    z -= level
+    x = np.arange(w, dtype=np.float32) / step + pad
+    y = (np.arange(h, dtype=np.float32) / step + pad)[:, None]
+    samples = []
+    for offset in (0, 1):
+        column, row = np.divmod(level + offset, per_column)
+        map_x = column * grid_w if columns > 1 else np.zeros_like(level)
+        map_x += x
+        map_y = row * grid_h
+        map_y += y
+        samples.append(cv2.remap(mosaic, map_x, map_y, cv2.INTER_LINEAR))
+    lower, upper = samples
+    np.subtract(upper, lower, out=upper)
+    upper *= z.reshape(h, w, 1)
+    lower += upper
+    result = np.divide(lower[..., :channels], lower[..., channels:]).reshape(image.shape)
+
+    if out is None:
+        out = np.empty_like(image)
+    if image.dtype == np.uint8:
+        return cv2.convertScaleAbs(result, dst=out)
+    np.copyto(out, result, casting="unsafe")
+    return out
 
 ### 2. Filtros de Detección de Bordes ###
+# Filas por banda en sobel_gradient: los temporales (dx, dy) solo existen
+# para una banda, no para la imagen completa
+GRADIENT_BAND_ROWS = 256
+
+
+def sobel_gradient(image: np.ndarray,
+                   ksize: int = 3,
+                   l1: bool = False,
+                   orientation: bool = False,
+                   degrees: bool = True,
+                   out: Optional[np.ndarray] = None) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Magnitud del gradiente Sobel en float32 (y opcionalmente su orientación).
+
+    Para imágenes uint8 en gris con ksize=3, dx y dy se calculan en una sola
+    llamada (cv2.spatialGradient, int16). La imagen se procesa por bandas de
+    filas, así que la memoria extra no crece con el tamaño de la imagen.
+
+    Args:
+        image: Imagen de entrada.
+        ksize: Tamaño del operador Sobel (1, 3, 5 o 7).
+        l1: Usa |dx| + |dy| en lugar de sqrt(dx² + dy²).
+        orientation: Devuelve también el ángulo del gradiente (cv2.phase).
+        degrees: Ángulo en grados (True) o radianes.
+        out: Array float32 opcional para la magnitud (misma forma que `image`).
+
+    Returns:
+        Magnitud float32, o (magnitud, orientación) si `orientation`.
+    """
+    if isinstance(image, LargeImage):
+        magnitude = _map_large_image(sobel_gradient, image, max(ksize // 2, 1), out, False, ksize, l1)
+        if not orientation:
+            return magnitude
+        angle = image.map_tiles(lambda tile: sobel_gradient(tile, ksize, orientation=True, degrees=degrees)[1],
+                                halo=max(ksize // 2, 1))
+        return magnitude, angle
+    out = output_buffer(image, out, dtype=np.float32)
+    if out is None:
+        out = np.empty(image.shape, dtype=np.float32)
+    angle = np.empty(image.shape, dtype=np.float32) if orientation else None
+    fused = image.dtype == np.uint8 and image.ndim == 2 and ksize == 3
+    halo = ksize // 2
+    h = image.shape[0]
+
+    for y0 in range(0, h, GRADIENT_BAND_ROWS):
+        y1 = min(y0 + GRADIENT_BAND_ROWS, h)
+        a0, a1 = max(y0 - halo, 0), min(y1 + halo, h)
+        band = image[a0:a1]  # con halo: las filas interiores no ven el borde de la banda
+        if fused:
+            dx, dy = cv2.spatialGradient(band)
+            gx, gy = dx.astype(np.float32), dy.astype(np.float32)
+        else:
+            gx = cv2.Sobel(band, cv2.CV_32F, 1, 0, ksize=ksize)
+            gy = cv2.Sobel(band, cv2.CV_32F, 0, 1, ksize=ksize)
+        gx, gy = gx[y0 - a0:y1 - a0], gy[y0 - a0:y1 - a0]
+
+        if orientation:
+            cv2.phase(gx, gy, angle[y0:y1], angleInDegrees=degrees)
+        if l1:
+            np.abs(gx, out=gx)
+            np.abs(gy, out=gy)
+            cv2.add(gx, gy, dst=out[y0:y1])
+        else:
+            cv2.magnitude(gx, gy, out[y0:y1])
+    return (out, angle) if orientation else out
+
+
 def sobel_edges(image: np.ndarray,
                 dx: int = 1, 
                 dy: int = 1, 
                 ksize: int = 3, 
-                normalize: bool = True) -> np.ndarray:
+                normalize: bool = True,
+                out: Optional[np.ndarray] = None,
+                l1: bool = False) -> np.ndarray:
     """
     Detecta bordes usando operadores Sobel en direcciones X e Y.
+    `out` recibe el resultado (uint8 si `normalize`, float64 si no);
+    `l1` aproxima la magnitud con |dx| + |dy|. La versión normalizada se
+    calcula en float32 (ver `sobel_gradient`). Con un LargeImage la magnitud
+    se calcula por bloques; la normalización usa el rango de la imagen completa
+    (dos pasadas, sin intermedio de tamaño completo).
     """
-    sobelx = cv2.Sobel(image, cv2.CV_64F, dx, 0, ksize=ksize)
-    sobely = cv2.Sobel(image, cv2.CV_64F, 0, dy, ksize=ksize)
-    grad = np.sqrt(sobelx**2 + sobely**2)
-    
-    if normalize:
-        grad = cv2.normalize(grad, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
-    
-    return grad
+    halo = max(ksize // 2, 1)
+    if isinstance(image, LargeImage) and normalize:
+        return _normalize_large_image(lambda tile: _sobel_magnitude(tile, dx, dy, ksize, l1, cv2.CV_32F),
+                                      image, halo, out)
+    if isinstance(image, LargeImage):
+        return _map_large_image(sobel_edges, image, halo, out, False, dx, dy, ksize, normalize=False, l1=l1)
+    out = output_buffer(image, out, dtype=np.uint8 if normalize else np.float64)
+    if not normalize:
+        return _sobel_magnitude(image, dx, dy, ksize, l1, cv2.CV_64F, out)
+    grad = _sobel_magnitude(image, dx, dy, ksize, l1, cv2.CV_32F)
+    return cv2.normalize(grad, out, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+
+def _sobel_magnitude(image: np.ndarray, dx: int, dy: int, ksize: int, l1: bool, depth: int,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Magnitud Sobel en `depth` (CV_32F usa `sobel_gradient` por bandas si dx = dy = 1)."""
+    if depth == cv2.CV_32F and dx == 1 and dy == 1:
+        return sobel_gradient(image, ksize, l1=l1, out=out)
+    sobelx = cv2.Sobel(image, depth, dx, 0, ksize=ksize)
+    sobely = cv2.Sobel(image, depth, 0, dy, ksize=ksize)
+    if l1:
+        return cv2.add(np.abs(sobelx), np.abs(sobely), dst=out)
+    return cv2.magnitude(sobelx, sobely, out)
 
 def canny_edges(image: np.ndarray, 
                 low_threshold: float = 50, 
                 upper_threshold: float = 150, 
                 aperture_size: int = 3, 
-                l2_gradient: bool = False) -> np.ndarray: 
+                l2_gradient: bool = False,
+                out: Optional[np.ndarray] = None) -> np.ndarray: 
     """
-    Detecta bordes usando el algoritmo Canny.
+    Detecta bordes usando el algoritmo Canny (`out` recibe el mapa de bordes).
     """
-    return cv2.Canny(image, low_threshold, upper_threshold,
+    if isinstance(image, LargeImage):
+        # La histéresis sigue bordes a cualquier distancia: no se puede calcular por bloques
+        raise ValueError("canny_edges needs the whole image; read a region with LargeImage.read_region")
+    out = output_buffer(image, out, shape=image.shape[:2], dtype=np.uint8)
+    return cv2.Canny(image, low_threshold, upper_threshold, edges=out,
                       apertureSize=aperture_size, L2gradient=l2_gradient)
 
 def laplacian_edges(image: np.ndarray, 
                     ksize: int = 3, 
-                    normalize: bool = True) -> np.ndarray: 
+                    normalize: bool = True,
+                    out: Optional[np.ndarray] = None) -> np.ndarray: 
     """
     Detecya bordes usando el operador laplaciano
+    `out` recibe el resultado (uint8 si `normalize`, float64 si no).
     """
-    lap = cv2.Laplacian(image, ddepth=cv2.CV_64F, ksize=ksize)
+    halo = max(ksize // 2, 1)
+    if isinstance(image, LargeImage) and normalize:
+        return _normalize_large_image(lambda tile: cv2.Laplacian(tile, ddepth=cv2.CV_32F, ksize=ksize),
+                                      image, halo, out)
+    if isinstance(image, LargeImage):
+        return _map_large_image(laplacian_edges, image, halo, out, False, ksize, normalize=False)
+    out = output_buffer(image, out, dtype=np.uint8 if normalize else np.float64)
+    lap = cv2.Laplacian(image, ddepth=cv2.CV_32F if normalize else cv2.CV_64F, ksize=ksize,
+                        dst=None if normalize else out)
 
     if normalize: 
-        lap = cv2.normalize(lap, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        lap = cv2.normalize(lap, out, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
     
     return lap
 
 ### 3. Filtros de Enfoque (Sharpening) ###
 def sharpen(image: np.ndarray, 
             kernel_size: Tuple[int, int] = (3, 3), 
-            strength: float = 1.0) -> np.ndarray:
+            strength: float = 1.0,
+            out: Optional[np.ndarray] = None,
+            inplace: bool = False) -> np.ndarray:
     """
     Aplica filtro de enfoque usando kernel personalizado.
     """
+    if isinstance(image, LargeImage):
+        return _map_large_image(sharpen, image, 1, out, inplace, kernel_size, strength)
     kernel = np.array([[-1, -1, -1],
                        [-1, 9*strength, -1],
                        [-1, -1, -1]])
-    return cv2.filter2D(image, ddepth=-1, kernel=kernel)
+    return cv2.filter2D(image, ddepth=-1, kernel=kernel, dst=output_buffer(image, out, inplace))
 
 ### 4. Filtros Personalizados ###
+# Lado del kernel a partir del cual los kernels no separables se aplican por
+# DFT (ajustado con benchmarks/bench_apply_kernel.py)
+DFT_KERNEL_SIZE = 21
+# Tolerancia relativa (s1 / s0) para considerar un kernel de rango 1
+SEPARABLE_TOLERANCE = 1e-6
+
+KernelPlan = namedtuple("KernelPlan", ["method", "kernel", "kernel_x", "kernel_y"])
+
+
+def analyze_kernel(kernel: np.ndarray) -> KernelPlan:
+    """
+    Decide cómo aplicar un kernel (el análisis se cachea por contenido del kernel).
+
+    Returns:
+        KernelPlan con `method`:
+            "separable": kernel de rango 1 (incluidos los kernels 1D) ->
+                cv2.sepFilter2D(kernel_x, kernel_y)
+            "dft": kernel grande no separable -> convolución en el dominio de la frecuencia
+            "direct": cv2.filter2D
+    """
+    kernel = np.asarray(kernel, dtype=np.float64)
+    if kernel.ndim != 2:
+        raise ValueError("kernel must be a 2D array")
+    return _analyze_kernel(kernel.tobytes(), kernel.shape)
+
+
+@lru_cache(maxsize=128)
+def _analyze_kernel(data: bytes, shape: Tuple[int, int]) -> KernelPlan:
+    kernel = np.frombuffer(data, dtype=np.float64).reshape(shape)
+    kh, kw = shape
+    # Kernel 1D: separable con el factor [1] en el otro eje
+    if kh == 1:
+        return KernelPlan("separable", kernel, kernel[0], np.ones(1))
+    if kw == 1:
+        return KernelPlan("separable", kernel, np.ones(1), kernel[:, 0])
+    u, s, vt = np.linalg.svd(kernel)
+    if s[1] <= SEPARABLE_TOLERANCE * s[0]:
+        # kernel = kernel_y (columna) x kernel_x (fila)
+        scale = np.sqrt(s[0])
+        return KernelPlan("separable", kernel, vt[0] * scale, u[:, 0] * scale)
+    if max(kh, kw) >= DFT_KERNEL_SIZE:
+        return KernelPlan("dft", kernel, None, None)
+    return KernelPlan("direct", kernel, None, None)
+
+
+@lru_cache(maxsize=32)
+def _kernel_spectrum(data: bytes, shape: Tuple[int, int], rows: int, cols: int, dtype: str) -> np.ndarray:
+    """Espectro (formato CCS de cv2.dft) del kernel rellenado con ceros a (rows, cols)."""
+    padded = np.zeros((rows, cols), dtype=dtype)
+    padded[:shape[0], :shape[1]] = np.frombuffer(data, dtype=np.float64).reshape(shape)
+    spectrum = cv2.dft(padded)
+    spectrum.flags.writeable = False
+    return spectrum
+
+
+def dft_filter(image: np.ndarray,
+               kernel: np.ndarray,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Equivalente a cv2.filter2D(image, -1, kernel) (correlación, BORDER_REFLECT_101)
+    calculado con la DFT; más rápido para kernels grandes.
+
+    Args:
+        image: Imagen de entrada (1 o más canales).
+        kernel: Kernel 2D.
+        out: Array de salida opcional (misma forma y tipo que `image`; puede ser `image`).
+    """
+    kernel = np.asarray(kernel, dtype=np.float64)
+    if isinstance(image, LargeImage):
+        return _map_large_image(dft_filter, image, max(kernel.shape) // 2, out, False, kernel)
+    out = output_buffer(image, out)
+    if out is None:
+        out = np.empty_like(image)
+    kh, kw = kernel.shape
+    h, w = image.shape[:2]
+    rows, cols = cv2.getOptimalDFTSize(h + kh - 1), cv2.getOptimalDFTSize(w + kw - 1)
+    work_type = np.float64 if image.dtype == np.float64 else np.float32
+    spectrum = _kernel_spectrum(kernel.tobytes(), kernel.shape, rows, cols, np.dtype(work_type).str)
+
+    # Sin aliasing circular: el relleno cubre el soporte completo del kernel
+    padded = cv2.copyMakeBorder(image.astype(work_type, copy=False), kh // 2, rows - h - kh // 2,
+                                kw // 2, cols - w - kw // 2, cv2.BORDER_REFLECT_101)
+    planes = cv2.split(padded) if padded.ndim == 3 else [padded]
+    for c, plane in enumerate(planes):
+        product = cv2.mulSpectrums(cv2.dft(plane), spectrum, 0, conjB=True)
+        result = cv2.idft(product, flags=cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)[:h, :w]
+        if np.issubdtype(image.dtype, np.integer):
+            info = np.iinfo(image.dtype)
+            np.clip(np.rint(result, out=result), info.min, info.max, out=result)
+        np.copyto(out[..., c] if image.ndim == 3 else out, result, casting="unsafe")
+    return out
+
+
 def apply_kernel(image: np.ndarray,
                  kernel: np.ndarray, 
-                 normalize: bool = True) -> np.ndarray: 
+                 normalize: bool = True,
+                 out: Optional[np.ndarray] = None,
+                 inplace: bool = False) -> np.ndarray: 
     """
     Aplica un kernel personalizado a la imagen. 
+
+    Según el kernel (ver `analyze_kernel`) se usa cv2.sepFilter2D para kernels
+    separables, la DFT para kernels grandes (>= DFT_KERNEL_SIZE) o
+    cv2.filter2D. El resultado equivale a cv2.filter2D salvo diferencias de
+    redondeo (±1 en imágenes enteras).
     """
+    if isinstance(image, LargeImage):
+        kernel = np.asarray(kernel)
+        return _map_large_image(apply_kernel, image, max(kernel.shape) // 2, out, inplace, kernel, normalize)
     if normalize:
         kernel = kernel / np.sum(np.abs(kernel))
     
-    return cv2.filter2D(image, ddepth=-1, kernel=kernel)
+    plan = analyze_kernel(kernel)
+    dst = output_buffer(image, out, inplace)
+    if plan.method == "separable":
+        return cv2.sepFilter2D(image, -1, plan.kernel_x, plan.kernel_y, dst=dst)
+    if plan.method == "dft":
+        return dft_filter(image, plan.kernel, out=dst)
+    return cv2.filter2D(image, ddepth=-1, kernel=plan.kernel, dst=dst)
 
 def emboss_filter(image: np.ndarray,
-                  direction: str = "top-left"): 
+                  direction: str = "top-left",
+                  out: Optional[np.ndarray] = None,
+                  inplace: bool = False): 
     """
     Aplica efecto de relieve en dirección vertical (emboss).
     """
@@ -131,4 +566,4 @@ def emboss_filter(image: np.ndarray,
         "top-right": np.array([[0, -1, -2], [1, 1, -1], [2, 1, 0]])
     }
     kernel = kernels.get(direction, kernels["top-left"])
-    return apply_kernel(image, kernel)
\ No newline at end of file
+    return apply_kernel(image, kernel, out=out, inplace=inplace)
\ No newline at end of file
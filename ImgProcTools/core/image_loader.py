@@ -1,41 +1,400 @@
+import glob
+import io
+import struct
 import urllib.request
+import warnings
 import numpy as np
 import cv2
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import Union, Optional
+from typing import Union, Optional, Iterable, Iterator, Tuple, List, Callable
+
+from .image_cache import ImageCache
+
+IMAGE_EXTENSIONS = (".bmp", ".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp", ".pgm", ".ppm")
 
 def load_image(source: str,
                base_dir: Optional[Union[str, Path]] = None, 
-               as_gray: bool = False) -> np.ndarray:
-    """Carga una imagen desde archivo o URL."""
-    if is_url(source):
-        image = load_from_url(source)
-    else:
-        image = load_from_file(source, base_dir)
+               as_gray: bool = False,
+               cache: Optional[ImageCache] = None,
+               max_size: Optional[Tuple[int, int]] = None,
+               reduce: Optional[int] = None) -> np.ndarray:
+    """
+    Carga una imagen desde archivo o URL.
+
+    Args:
+        source: Ruta al archivo o URL.
+        base_dir: Directorio base para rutas relativas.
+        as_gray: Convierte la imagen a escala de grises.
+        cache: Caché opcional de imágenes decodificadas (solo archivos). Las
+               imágenes devueltas desde la caché son de solo lectura.
+        max_size: (ancho, alto) máximo. La imagen se decodifica a resolución
+                  reducida (IMREAD_REDUCED_*) con la mayor reducción que aún
+                  cubre el tamaño pedido y luego se redimensiona para caber en
+                  él manteniendo la relación de aspecto.
+        reduce: Factor de reducción fijo en la decodificación (1, 2, 4 u 8).
+    """
+    if max_size is not None and reduce is not None:
+        raise ValueError("Use either max_size or reduce, not both")
+    if reduce is not None and reduce not in REDUCED_COLOR_FLAGS:
+        raise ValueError(f"reduce must be one of {list(REDUCED_COLOR_FLAGS.keys())}")
+
+    if cache is not None and not is_url(source):
+        return load_from_cache(source, base_dir, as_gray, cache, max_size, reduce)
+    image = decode_source(source, base_dir, max_size, reduce)
     if as_gray: 
         return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     return image
 
+def decode_source(source: str,
+                  base_dir: Optional[Union[str, Path]] = None,
+                  max_size: Optional[Tuple[int, int]] = None,
+                  reduce: Optional[int] = None) -> np.ndarray:
+    """Decodifica una imagen (archivo o URL) en BGR, a resolución reducida si se pide."""
+    if is_url(source):
+        data = fetch_url(source)
+        flags = reduction_flags(data, max_size, reduce)
+        image = load_from_url(source, flags, data=data)
+    else:
+        flags = reduction_flags(resolve_path(source, base_dir), max_size, reduce)
+        image = load_from_file(source, base_dir, flags)
+    return fit_to_size(image, max_size) if max_size is not None else image
+
 def is_url(source: str) -> np.ndarray:
     return source.startswith(("http://", "https://"))
 
-def load_from_url(url: str) -> np.ndarray:
+def fetch_url(url: str) -> bytes:
     try:
         with urllib.request.urlopen(url) as response:
-            image_array = np.asarray(bytearray(response.read()), dtype=np.uint8)
-            return cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+            return response.read()
     except Exception as e:
         raise ValueError(f"Error loading image from URL: {e}")
 
-def load_from_file(filename: str, base_dir=Optional[Union[str, Path]]) -> np.ndarray:
-    base_dir = base_dir or Path.cwd()
-    file_path = Path(base_dir) / filename
-    
+def load_from_url(url: str, flags: int = cv2.IMREAD_COLOR,
+                  data: Optional[bytes] = None) -> np.ndarray:
+    data = fetch_url(url) if data is None else data
+    try:
+        return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+    except Exception as e:
+        raise ValueError(f"Error loading image from URL: {e}")
+
+def decode_buffer(data, flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+    """Decodifica una imagen comprimida desde un buffer sin copiarlo."""
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+    if image is None:
+        raise ValueError("Invalid image data")
+    return image
+
+def load_image_from_buffer(buffer,
+                           as_gray: bool = False,
+                           shape: Optional[Tuple[int, ...]] = None,
+                           dtype: Union[str, np.dtype] = np.uint8,
+                           offset: int = 0) -> np.ndarray:
+    """
+    Carga una imagen desde un objeto con protocolo buffer (bytes, bytearray,
+    memoryview, mmap, ...) sin copiar los datos de entrada.
+
+    Args:
+        buffer: Datos de la imagen.
+        as_gray: Convierte la imagen a escala de grises.
+        shape: Si se indica, el buffer se interpreta como píxeles sin comprimir
+               de forma (alto, ancho) o (alto, ancho, canales) y se devuelve una
+               vista sobre él, sin decodificar ni copiar. La vista es de solo
+               lectura si el buffer lo es (ej: bytes).
+        dtype: Tipo de los píxeles en modo sin comprimir (uint8 o uint16).
+        offset: Desplazamiento en bytes del primer píxel en modo sin comprimir.
+
+    Returns:
+        Imagen BGR (o escala de grises) igual a la de `load_image` para datos
+        comprimidos, o vista sobre el buffer en modo sin comprimir.
+    """
+    if shape is None:
+        image = decode_buffer(buffer)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if as_gray else image
+
+    dtype = np.dtype(dtype)
+    if dtype not in (np.uint8, np.uint16):
+        raise ValueError("dtype must be uint8 or uint16")
+    if len(shape) not in (2, 3):
+        raise ValueError("shape must be (height, width) or (height, width, channels)")
+    count = int(np.prod(shape))
+    available = (memoryview(buffer).nbytes - offset) // dtype.itemsize
+    if count > available:
+        raise ValueError(f"Buffer too small for shape {shape}: {available} < {count} elements")
+
+    image = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+    if as_gray and image.ndim == 3:
+        code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        return cv2.cvtColor(image, code)
+    return image
+
+def resolve_path(filename: Union[str, Path],
+                 base_dir: Optional[Union[str, Path]] = None) -> Path:
+    """Construye la ruta de un archivo y verifica que exista."""
+    file_path = Path(base_dir or Path.cwd()) / filename
     if not file_path.exists():
         raise FileNotFoundError(f"No image found at: {file_path}")
+    return file_path
+
+def load_from_file(filename: str, base_dir: Optional[Union[str, Path]] = None,
+                   flags: int = cv2.IMREAD_COLOR) -> np.ndarray:
+    file_path = resolve_path(filename, base_dir)
     
-    image = cv2.imread(str(file_path))
+    image = cv2.imread(str(file_path), flags)
     if image is None:
         raise ValueError(f"Invalid image file: {file_path}")
     
-    return image
\ No newline at end of file
+    return image
+
+def load_from_cache(filename: str,
+                    base_dir: Optional[Union[str, Path]],
+                    as_gray: bool,
+                    cache: ImageCache,
+                    max_size: Optional[Tuple[int, int]] = None,
+                    reduce: Optional[int] = None) -> np.ndarray:
+    """
+    Carga una imagen a través de la caché.
+
+    La clave es (ruta resuelta, mtime, tamaño, modo de reducción, as_gray), de
+    modo que un archivo modificado se vuelve a leer. La versión en grises se
+    deriva de la entrada a color cuando ésta ya está en caché, sin volver a
+    decodificar el archivo.
+    """
+    file_path = resolve_path(filename, base_dir)
+    stat = file_path.stat()
+    max_size = tuple(max_size) if max_size is not None else None
+    key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size, max_size, reduce)
+
+    image = cache.get(key + (as_gray,))
+    if image is not None:
+        return image
+
+    if as_gray:
+        color = cache.peek(key + (False,))
+        if color is not None:
+            return cache.put(key + (True,), cv2.cvtColor(color, cv2.COLOR_BGR2GRAY))
+
+    image = decode_source(filename, base_dir, max_size, reduce)
+    if as_gray:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return cache.put(key + (as_gray,), image)
+
+### Decodificación a resolución reducida ###
+REDUCED_COLOR_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8
+}
+
+def reduction_flags(source: Union[Path, bytes],
+                    max_size: Optional[Tuple[int, int]] = None,
+                    reduce: Optional[int] = None) -> int:
+    """Elige la bandera de cv2.imread/imdecode para `max_size` o `reduce`."""
+    if reduce is not None:
+        return REDUCED_COLOR_FLAGS[reduce]
+    if max_size is None:
+        return cv2.IMREAD_COLOR
+    size = read_image_size(source)
+    if size is None:  # formato desconocido: decodificación completa + resize
+        return cv2.IMREAD_COLOR
+    return REDUCED_COLOR_FLAGS[choose_reduction(size, max_size)]
+
+def choose_reduction(size: Tuple[int, int], max_size: Tuple[int, int]) -> int:
+    """
+    Devuelve la mayor reducción (8, 4, 2 o 1) cuya imagen decodificada sigue
+    siendo al menos tan grande como el tamaño final pedido.
+    """
+    target_w, target_h = fit_dimensions(size, max_size)
+    w, h = size
+    for factor in (8, 4, 2):
+        if w // factor >= target_w and h // factor >= target_h:
+            return factor
+    return 1
+
+def fit_dimensions(size: Tuple[int, int], max_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Dimensiones (ancho, alto) de `size` escaladas para caber en `max_size`."""
+    w, h = size
+    max_w, max_h = max_size
+    scale = min(max_w / w, max_h / h, 1.0)
+    return max(1, round(w * scale)), max(1, round(h * scale))
+
+def fit_to_size(image: np.ndarray, max_size: Tuple[int, int]) -> np.ndarray:
+    """Redimensiona (INTER_AREA) la imagen para caber en `max_size`."""
+    h, w = image.shape[:2]
+    dim = fit_dimensions((w, h), max_size)
+    if dim == (w, h):
+        return image
+    return cv2.resize(image, dim, interpolation=cv2.INTER_AREA)
+
+def read_image_size(source: Union[str, Path, bytes]) -> Optional[Tuple[int, int]]:
+    """
+    Lee (ancho, alto) de la cabecera de un JPEG, PNG, BMP o TIFF sin decodificar
+    los píxeles. Devuelve None si el formato no se reconoce.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        stream = io.BytesIO(source)
+    else:
+        stream = open(source, "rb")
+    with stream:
+        header = stream.read(26)
+        try:
+            if header[:2] == b"\xff\xd8":
+                return _jpeg_size(stream)
+            if header[:8] == b"\x89PNG\r\n\x1a\n":
+                return struct.unpack(">II", header[16:24])
+            if header[:2] == b"BM":
+                w, h = struct.unpack("<ii", header[18:26])
+                return w, abs(h)
+            if header[:4] in (b"II*\x00", b"MM\x00*"):
+                return _tiff_size(stream, "<" if header[:2] == b"II" else ">")
+        except (struct.error, ValueError):
+            return None
+    return None
+
+def _jpeg_size(stream) -> Optional[Tuple[int, int]]:
+    stream.seek(2)
+    while True:
+        byte = stream.read(1)
+        while byte and byte != b"\xff":
+            byte = stream.read(1)
+        while byte == b"\xff":
+            byte = stream.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # marcadores sin longitud
+            continue
+        length, = struct.unpack(">H", stream.read(2))
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):  # SOFn
+            h, w = struct.unpack(">xHH", stream.read(5))
+            return w, h
+        stream.seek(length - 2, io.SEEK_CUR)
+
+def _tiff_size(stream, order: str) -> Optional[Tuple[int, int]]:
+    stream.seek(4)
+    offset, = struct.unpack(order + "I", stream.read(4))
+    stream.seek(offset)
+    count, = struct.unpack(order + "H", stream.read(2))
+    size = {}
+    for _ in range(count):
+        tag, typ, _, value = struct.unpack(order + "HHI4s", stream.read(12))
+        if tag in (256, 257):  # ImageWidth, ImageLength
+            fmt = "H2x" if typ == 3 else "I"
+            size[tag], = struct.unpack(order + fmt, value)
+    if 256 in size and 257 in size:
+        return size[256], size[257]
+    return None
+
+def expand_sources(paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]],
+                   base_dir: Optional[Union[str, Path]] = None) -> List[str]:
+    """
+    Expande un directorio, un patrón glob o una lista de rutas a una lista de rutas.
+
+    Args:
+        paths_or_glob: Directorio, patrón glob (ej: "imgs/*.png") o iterable de rutas.
+        base_dir: Directorio base para rutas relativas.
+
+    Returns:
+        Lista de rutas (ordenada en el caso de directorios y patrones).
+    """
+    if not isinstance(paths_or_glob, (str, Path)):
+        return [str(p) for p in paths_or_glob]
+
+    source = Path(base_dir or Path.cwd()) / paths_or_glob
+    if source.is_dir():
+        return sorted(str(p) for p in source.iterdir()
+                      if p.suffix.lower() in IMAGE_EXTENSIONS)
+    if glob.has_magic(str(paths_or_glob)):
+        return sorted(glob.glob(str(source), recursive=True))
+    return [str(paths_or_glob)]
+
+def load_images(paths_or_glob: Union[str, Path, Iterable[Union[str, Path]]],
+                base_dir: Optional[Union[str, Path]] = None,
+                as_gray: bool = False,
+                workers: int = 4,
+                ordered: bool = True,
+                prefetch: Optional[int] = None,
+                cache: Optional[ImageCache] = None,
+                max_size: Optional[Tuple[int, int]] = None,
+                reduce: Optional[int] = None,
+                on_error: Optional[Callable[[str, Exception], None]] = None
+                ) -> Iterator[Tuple[str, np.ndarray]]:
+    """
+    Carga un lote de imágenes en paralelo usando un pool de hilos.
+
+    Cada archivo se carga con `load_image`, por lo que el resultado es idéntico
+    al de la API de una sola imagen (OpenCV libera el GIL durante la decodificación).
+
+    Args:
+        paths_or_glob: Directorio, patrón glob o iterable de rutas.
+        base_dir: Directorio base para rutas relativas.
+        as_gray: Convierte las imágenes a escala de grises.
+        workers: Número de hilos de decodificación.
+        ordered: True entrega los resultados en el orden de entrada,
+                 False en orden de finalización.
+        prefetch: Máximo de imágenes en vuelo (por defecto 2 * workers). Limita
+                  la memoria cuando el consumidor es más lento que la decodificación.
+        cache: Caché opcional de imágenes decodificadas (ver `load_image`).
+        max_size, reduce: Decodificación a resolución reducida (ver `load_image`).
+        on_error: Función llamada con (ruta, excepción) cuando un archivo falla.
+                  Si es None se emite un warning. El lote continúa en ambos casos.
+
+    Yields:
+        Tuplas (ruta, imagen).
+    """
+    return run_parallel(
+        lambda source: load_image(source, base_dir, as_gray, cache, max_size, reduce),
+        expand_sources(paths_or_glob, base_dir),
+        workers, ordered, prefetch, on_error)
+
+def run_parallel(func: Callable[[str], np.ndarray],
+                 sources: Iterable[str],
+                 workers: int = 4,
+                 ordered: bool = True,
+                 prefetch: Optional[int] = None,
+                 on_error: Optional[Callable[[str, Exception], None]] = None
+                 ) -> Iterator[Tuple[str, np.ndarray]]:
+    """
+    Aplica `func` a cada fuente en un pool de hilos con un número acotado de
+    tareas en vuelo (ver `load_images` para el significado de los argumentos).
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    prefetch = prefetch or 2 * workers
+    if prefetch < 1:
+        raise ValueError("prefetch must be >= 1")
+
+    pending = iter(sources)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = OrderedDict()  # future -> fuente, en orden de envío
+
+        def submit_next() -> None:
+            source = next(pending, None)
+            if source is not None:
+                in_flight[executor.submit(func, source)] = source
+
+        try:
+            for _ in range(prefetch):
+                submit_next()
+            while in_flight:
+                if ordered:
+                    future = next(iter(in_flight))
+                else:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    future = done.pop()
+                source = in_flight.pop(future)
+                submit_next()
+                try:
+                    image = future.result()
+                except Exception as e:
+                    if on_error is None:
+                        warnings.warn(f"Error loading {source}: {e}")
+                    else:
+                        on_error(source, e)
+                    continue
+                yield source, image
+        finally:
+            for future in in_flight:
+                future.cancel()
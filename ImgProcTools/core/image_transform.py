@@ -2,38 +2,164 @@ import cv2
 import numpy as np
 from typing import Union, Optional, Tuple, List
 
+from utils.utils import output_buffer
 
-def translate(image: np.ndarray, x: float, y: float) -> np.ndarray:
-    """Desplaza una imagen en las direcciones x e y."""
+from .large_image import LargeImage
+from .warp_plan import WarpPlanCache, warp_affine
+
+
+def translate(image: np.ndarray, x: float, y: float,
+              out: Optional[np.ndarray] = None,
+              plan_cache: Optional[WarpPlanCache] = None) -> np.ndarray:
+    """
+    Desplaza una imagen en las direcciones x e y.
+
+    Con `plan_cache` el warp reutiliza tablas de remap precalculadas (útil
+    para aplicar el mismo desplazamiento a muchos frames); `out` recibe el resultado.
+    """
     M = np.float32([[1, 0, x], [0, 1, y]])
-    return cv2.warpAffine(image, M, (image.shape[1], image.shape[0]))
+    return _warp(image, M, (image.shape[1], image.shape[0]), out, plan_cache)
 
 def rotate(image: np.ndarray,
            angle: float,
            center: Tuple[int, int] = (152, 152),
-           scale: float = 1.0) -> np.ndarray:
-    """Rota una imagen alrededor de un centro con un ángulo y escala especificados."""
+           scale: float = 1.0,
+           out: Optional[np.ndarray] = None,
+           plan_cache: Optional[WarpPlanCache] = None) -> np.ndarray:
+    """
+    Rota una imagen alrededor de un centro con un ángulo y escala especificados.
+
+    Con `plan_cache` el warp reutiliza tablas de remap precalculadas (útil
+    para rotar muchos frames con el mismo ángulo); `out` recibe el resultado.
+    """
     h, w = image.shape[:2]
     center = center or (w//2, h//2)
     M = cv2.getRotationMatrix2D(center, angle, scale)
-    return cv2.warpAffine(image, M, (w, h))
+    return _warp(image, M, (w, h), out, plan_cache)
+
+def _warp(image: np.ndarray, M: np.ndarray, dsize: Tuple[int, int],
+          out: Optional[np.ndarray], plan_cache: Optional[WarpPlanCache],
+          interpolation: int = cv2.INTER_LINEAR,
+          border_mode: int = cv2.BORDER_CONSTANT,
+          border_value: float = 0) -> np.ndarray:
+    if plan_cache is not None:
+        return warp_affine(image, M, dsize, interpolation, border_mode, border_value,
+                           out=out, cache=plan_cache)
+    out = output_buffer(image, out, shape=(dsize[1], dsize[0]) + image.shape[2:])
+    return cv2.warpAffine(image, M, dsize, dst=out, flags=interpolation,
+                          borderMode=border_mode, borderValue=border_value)
 
 def resize(image: np.ndarray, width: int = 256, height: int = 256,
-           inter: int = cv2.INTER_AREA):
-    """Redimensiona una imagen manteniendo la relación de aspecto."""
+           inter: int = cv2.INTER_AREA,
+           out: Optional[np.ndarray] = None):
+    """Redimensiona una imagen manteniendo la relación de aspecto (`out` recibe el resultado)."""
     h, w = image.shape[:2]
     
     if width is None and height is None:
-        return image.copy()
+        out = output_buffer(image, out)
+        if out is None:
+            return image.copy()
+        np.copyto(out, image)
+        return out
     
     dim = (width, int(h * (width/w))) if width else (int(w * (height/h)), height)
-    return cv2.resize(image, dim, interpolation=inter)
+    out = output_buffer(image, out, shape=(dim[1], dim[0]) + image.shape[2:])
+    return cv2.resize(image, dim, dst=out, interpolation=inter)
 
-def crop(image: np.ndarray, x_start: int, y_start: int,
+def crop(image: Union[np.ndarray, LargeImage], x_start: int, y_start: int,
          x_end: int, y_end: int) -> np.ndarray:
+    """Recorta una región. Con un LargeImage solo se lee la región del disco."""
+    if isinstance(image, LargeImage):
+        return image.read_region(x_start, y_start, x_end - x_start, y_end - y_start)
     return image[y_start:y_end, x_start:x_end]
 
-def convert_color(image: np.ndarray, color_space: str = "GRAY") -> np.ndarray:
+class AffineTransform:
+    """
+    Cadena perezosa de transformaciones geométricas (translate, rotate, resize,
+    crop) que se compone en una sola matriz afín y se aplica con un único
+    cv2.warpAffine: una sola interpolación y una sola imagen de salida.
+
+    Cada método devuelve una nueva transformación, por lo que se pueden encadenar.
+
+    Args:
+        size: (ancho, alto) de la imagen de entrada.
+
+    Ejemplo:
+        t = AffineTransform.for_image(image).translate(10, 5).rotate(30).resize(width=320).crop(20, 20, 300, 200)
+        result = t.apply(image)
+    """
+
+    def __init__(self, size: Tuple[int, int]):
+        self.input_size = tuple(size)
+        self.size = tuple(size)  # (ancho, alto) de la salida actual
+        self.matrix = np.eye(3)
+
+    @classmethod
+    def for_image(cls, image: np.ndarray) -> "AffineTransform":
+        """Crea una transformación identidad para el tamaño de `image`."""
+        return cls((image.shape[1], image.shape[0]))
+
+    def _then(self, M: np.ndarray, size: Optional[Tuple[int, int]] = None) -> "AffineTransform":
+        result = AffineTransform(self.input_size)
+        result.matrix = np.vstack([M, [0, 0, 1]]) @ self.matrix
+        result.size = tuple(size) if size is not None else self.size
+        return result
+
+    @property
+    def affine_matrix(self) -> np.ndarray:
+        """Matriz 2x3 para cv2.warpAffine."""
+        return self.matrix[:2]
+
+    def translate(self, x: float, y: float) -> "AffineTransform":
+        """Desplaza la imagen en las direcciones x e y."""
+        return self._then(np.float64([[1, 0, x], [0, 1, y]]))
+
+    def rotate(self, angle: float,
+               center: Optional[Tuple[float, float]] = None,
+               scale: float = 1.0) -> "AffineTransform":
+        """Rota alrededor de `center` (por defecto el centro de la imagen actual)."""
+        w, h = self.size
+        return self._then(cv2.getRotationMatrix2D(center or (w//2, h//2), angle, scale))
+
+    def resize(self, width: int = 256, height: int = 256) -> "AffineTransform":
+        """Redimensiona manteniendo la relación de aspecto (mismas reglas que `resize`)."""
+        w, h = self.size
+        dim = (width, int(h * (width/w))) if width else (int(w * (height/h)), height)
+        return self.scale(dim[0] / w, dim[1] / h, size=dim)
+
+    def scale(self, fx: float, fy: Optional[float] = None,
+              size: Optional[Tuple[int, int]] = None) -> "AffineTransform":
+        """Escala por un factor (por defecto fy = fx), con la convención de centros de píxel de cv2.resize."""
+        fy = fx if fy is None else fy
+        w, h = self.size
+        M = np.float64([[fx, 0, 0.5 * fx - 0.5], [0, fy, 0.5 * fy - 0.5]])
+        return self._then(M, size or (round(w * fx), round(h * fy)))
+
+    def crop(self, x_start: int, y_start: int, x_end: int, y_end: int) -> "AffineTransform":
+        """Recorta la salida: solo se calculan los píxeles de la región."""
+        return self._then(np.float64([[1, 0, -x_start], [0, 1, -y_start]]),
+                          (x_end - x_start, y_end - y_start))
+
+    def apply(self, image: np.ndarray,
+              interpolation: int = cv2.INTER_LINEAR,
+              border_mode: int = cv2.BORDER_CONSTANT,
+              border_value: float = 0,
+              out: Optional[np.ndarray] = None,
+              plan_cache: Optional[WarpPlanCache] = None) -> np.ndarray:
+        """
+        Aplica la transformación compuesta con un solo warp.
+
+        Con `plan_cache` se reutilizan tablas de remap precalculadas; `out`
+        recibe el resultado.
+        """
+        if (image.shape[1], image.shape[0]) != self.input_size:
+            raise ValueError(f"Expected an image of size {self.input_size}, got {image.shape[1::-1]}")
+        return _warp(image, self.affine_matrix, self.size, out, plan_cache,
+                     interpolation, border_mode, border_value)
+
+def convert_color(image: np.ndarray, color_space: str = "GRAY",
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Convierte una imagen BGR a otro espacio de color (`out` recibe el resultado)."""
     conversions = {
         "GRAY": cv2.COLOR_BGR2GRAY,
         "HSV": cv2.COLOR_BGR2HSV,
@@ -43,20 +169,30 @@ def convert_color(image: np.ndarray, color_space: str = "GRAY") -> np.ndarray:
     if color_space not in conversions:
         raise ValueError(f"Color space must be one of {list(conversions.keys())}")
     
-    return cv2.cvtColor(image, conversions[color_space])
+    shape = image.shape[:2] if color_space == "GRAY" else image.shape[:2] + (3,)
+    out = output_buffer(image, out, shape=shape)
+    return cv2.cvtColor(image, conversions[color_space], dst=out)
 
-def add(image1: np.ndarray, image2: np.ndarray) -> np.ndarray:
+# Operaciones aritméticas: `out` recibe el resultado; `inplace=True` lo escribe sobre image1
+def add(image1: np.ndarray, image2: np.ndarray,
+        out: Optional[np.ndarray] = None, inplace: bool = False) -> np.ndarray:
     """Suma dos imágenes pixel por pixel."""
-    return cv2.add(image1, image2)
+    return cv2.add(image1, image2, dst=output_buffer(image1, out, inplace))
 
-def subtract(image1: np.ndarray, image2: np.ndarray) -> np.ndarray:
+def subtract(image1: np.ndarray, image2: np.ndarray,
+             out: Optional[np.ndarray] = None, inplace: bool = False) -> np.ndarray:
     """Resta dos imágenes pixel por pixel."""
-    return cv2.subtract(image1, image2)
+    return cv2.subtract(image1, image2, dst=output_buffer(image1, out, inplace))
 
-def multiply(image1: np.ndarray, image2: np.ndarray) -> np.ndarray:
+def multiply(image1: np.ndarray, image2: np.ndarray,
+             out: Optional[np.ndarray] = None, inplace: bool = False) -> np.ndarray:
     """Multiplica dos imágenes pixel por pixel."""
-    return cv2.multiply(image1, image2)
+    return cv2.multiply(image1, image2, dst=output_buffer(image1, out, inplace))
 
-def apply_mask(image: np.ndarray, mask: np.ndarray) -> np.ndarray:
-    """Aplica una máscara binaria a una imagen."""
-    return cv2.bitwise_and(image, image, mask=mask)
\ No newline at end of file
+def apply_mask(image: np.ndarray, mask: np.ndarray,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Aplica una máscara binaria a una imagen (`out` recibe el resultado)."""
+    out = output_buffer(image, out)
+    if out is not None:
+        out[...] = 0  # con máscara OpenCV no escribe los píxeles fuera de ella
+    return cv2.bitwise_and(image, image, dst=out, mask=mask)
\ No newline at end of file
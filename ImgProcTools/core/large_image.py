@@ -0,0 +1,244 @@
+import math
+import struct
+import numpy as np
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+# Tipos de campo TIFF -> formato struct
+TIFF_TYPES = {1: "B", 2: "c", 3: "H", 4: "I", 6: "b", 7: "B", 8: "h", 9: "i", 16: "Q", 17: "q", 18: "Q"}
+# Etiquetas TIFF usadas
+WIDTH, HEIGHT, BITS, COMPRESSION, PHOTOMETRIC = 256, 257, 258, 259, 262
+STRIP_OFFSETS, SAMPLES, ROWS_PER_STRIP, STRIP_COUNTS, PLANAR = 273, 277, 278, 279, 284
+TILE_WIDTH, TILE_LENGTH, TILE_OFFSETS, TILE_COUNTS, SAMPLE_FORMAT = 322, 323, 324, 325, 339
+
+
+def read_tiff_tags(path: Union[str, Path]) -> Tuple[str, dict]:
+    """
+    Lee las etiquetas del primer IFD de un TIFF clásico o BigTIFF.
+
+    Returns:
+        (orden de bytes "<" o ">", diccionario etiqueta -> tupla de valores).
+    """
+    with open(path, "rb") as f:
+        order = {b"II": "<", b"MM": ">"}.get(f.read(2))
+        if order is None:
+            raise ValueError(f"Not a TIFF file: {path}")
+        magic, = struct.unpack(order + "H", f.read(2))
+        if magic == 42:
+            offset_fmt, count_fmt, entry_fmt, inline = "I", "H", "HHI4s", 4
+            f.seek(4)
+        elif magic == 43:  # BigTIFF
+            offset_fmt, count_fmt, entry_fmt, inline = "Q", "Q", "HHQ8s", 8
+            f.seek(8)
+        else:
+            raise ValueError(f"Not a TIFF file: {path}")
+
+        offset, = struct.unpack(order + offset_fmt, f.read(struct.calcsize(offset_fmt)))
+        f.seek(offset)
+        count, = struct.unpack(order + count_fmt, f.read(struct.calcsize(count_fmt)))
+        entries = [struct.unpack(order + entry_fmt, f.read(struct.calcsize(order + entry_fmt)))
+                   for _ in range(count)]
+
+        tags = {}
+        for tag, typ, n, value in entries:
+            if typ not in TIFF_TYPES:
+                continue
+            fmt = f"{order}{n}{TIFF_TYPES[typ]}"
+            size = struct.calcsize(fmt)
+            if size > inline:
+                f.seek(struct.unpack(order + offset_fmt, value)[0])
+                value = f.read(size)
+            tags[tag] = struct.unpack(fmt, value[:size])
+        return order, tags
+
+
+class LargeImage:
+    """
+    Imagen grande de acceso perezoso sobre un archivo mapeado en memoria.
+
+    Soporta TIFF sin compresión (en tiras o en tiles, clásico o BigTIFF, 8/16
+    bits, 1, 3 o 4 canales) y datos raw. Solo se leen del disco las páginas
+    que cubre cada región solicitada. Las regiones se devuelven en BGR, como
+    `load_image`. `crop` y los filtros locales de image_filter aceptan un
+    LargeImage directamente (por bloques, vía `map_tiles`).
+
+    Ejemplo:
+        scan = LargeImage("scan.tiff")
+        region = scan.read_region(10000, 20000, 512, 512)
+        blurred = gaussian_blur(scan, (5, 5), out=np.lib.format.open_memmap(...))
+        edges = scan.map_tiles(my_filter, halo=2)
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        order, tags = read_tiff_tags(self.path)
+        if tags.get(COMPRESSION, (1,))[0] != 1:
+            raise ValueError("Only uncompressed TIFF files can be memory-mapped")
+        if tags.get(PLANAR, (1,))[0] != 1:
+            raise ValueError("Only chunky (PlanarConfiguration=1) TIFF files are supported")
+
+        self.width, self.height = tags[WIDTH][0], tags[HEIGHT][0]
+        self.channels = tags.get(SAMPLES, (1,))[0]
+        bits = tags.get(BITS, (8,))[0]
+        kind = {1: "u", 2: "i", 3: "f"}[tags.get(SAMPLE_FORMAT, (1,))[0]]
+        self.dtype = np.dtype(f"{order}{kind}{bits // 8}")
+        self._rgb = tags.get(PHOTOMETRIC, (1,))[0] == 2 and self.channels >= 3
+        self._data = np.memmap(self.path, dtype=np.uint8, mode="r")
+
+        if TILE_OFFSETS in tags:
+            self.tile_size = (tags[TILE_WIDTH][0], tags[TILE_LENGTH][0])
+            offsets = tags[TILE_OFFSETS]
+        else:
+            self.tile_size = (self.width, tags.get(ROWS_PER_STRIP, (self.height,))[0])
+            offsets = tags[STRIP_OFFSETS]
+        self._blocks = [self._block(i, offset) for i, offset in enumerate(offsets)]
+
+        # Tiras contiguas: toda la imagen es una sola vista
+        tw, th = self.tile_size
+        block_bytes = tw * th * self.channels * self.dtype.itemsize
+        contiguous = tw == self.width and all(
+            offsets[i + 1] - offsets[i] == block_bytes for i in range(len(offsets) - 1))
+        self._full = self._view(offsets[0], (self.height, self.width)) if contiguous else None
+
+    @classmethod
+    def from_raw(cls,
+                 path: Union[str, Path],
+                 shape: Tuple[int, ...],
+                 dtype: Union[str, np.dtype] = np.uint8,
+                 offset: int = 0) -> "LargeImage":
+        """
+        Mapea un archivo raw de píxeles (alto, ancho[, canales]) en orden BGR.
+
+        Args:
+            path: Ruta al archivo.
+            shape: Forma de la imagen.
+            dtype: Tipo de los píxeles.
+            offset: Desplazamiento en bytes del primer píxel.
+        """
+        self = cls.__new__(cls)
+        self.path = Path(path)
+        self.height, self.width = shape[:2]
+        self.channels = shape[2] if len(shape) == 3 else 1
+        self.dtype = np.dtype(dtype)
+        self.tile_size = (self.width, self.height)
+        self._rgb = False
+        self._data = np.memmap(self.path, dtype=np.uint8, mode="r")
+        self._full = self._view(offset, (self.height, self.width))
+        self._blocks = [self._full]
+        return self
+
+    def _view(self, offset: int, size: Tuple[int, int]) -> np.ndarray:
+        nbytes = size[0] * size[1] * self.channels * self.dtype.itemsize
+        block = self._data[offset:offset + nbytes].view(self.dtype)
+        return block.reshape(size + ((self.channels,) if self.channels > 1 else ()))
+
+    def _block(self, index: int, offset: int) -> np.ndarray:
+        tw, th = self.tile_size
+        if tw == self.width:  # tira: la última puede tener menos filas
+            return self._view(offset, (min(th, self.height - index * th), tw))
+        return self._view(offset, (th, tw))
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return (self.height, self.width) + ((self.channels,) if self.channels > 1 else ())
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def __repr__(self) -> str:
+        return f"LargeImage({str(self.path)!r}, shape={self.shape}, dtype={self.dtype.name})"
+
+    def read_region(self, x: int, y: int, w: int, h: int) -> np.ndarray:
+        """
+        Lee una región de la imagen leyendo solo los bytes necesarios.
+
+        Args:
+            x, y: Esquina superior izquierda.
+            w, h: Ancho y alto (se recortan al borde de la imagen).
+
+        Returns:
+            Array nuevo (BGR para imágenes a color) con la región.
+        """
+        if x < 0 or y < 0 or w < 0 or h < 0:
+            raise ValueError("Region coordinates and size must be non-negative")
+        x_end, y_end = min(x + w, self.width), min(y + h, self.height)
+        x, y = min(x, x_end), min(y, y_end)
+        out = np.empty((y_end - y, x_end - x) + self.shape[2:], dtype=self.dtype.newbyteorder("="))
+
+        if self._full is not None:
+            self._copy(out, self._full[y:y_end, x:x_end])
+            return out
+
+        tw, th = self.tile_size
+        tiles_across = math.ceil(self.width / tw)
+        for ty in range(y // th, math.ceil(y_end / th)):
+            for tx in range(x // tw, math.ceil(x_end / tw)):
+                block = self._blocks[ty * tiles_across + tx]
+                bx0, by0 = tx * tw, ty * th
+                sx0, sy0 = max(x, bx0), max(y, by0)
+                sx1, sy1 = min(x_end, bx0 + tw), min(y_end, by0 + th)
+                self._copy(out[sy0 - y:sy1 - y, sx0 - x:sx1 - x],
+                           block[sy0 - by0:sy1 - by0, sx0 - bx0:sx1 - bx0])
+        return out
+
+    def _copy(self, dst: np.ndarray, src: np.ndarray) -> None:
+        if self._rgb:  # RGB(A) en disco -> BGR(A)
+            dst[..., :3] = src[..., 2::-1]
+            dst[..., 3:] = src[..., 3:]
+        else:
+            dst[...] = src
+
+    def iter_tiles(self, tile_size: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """
+        Recorre la imagen por bloques.
+
+        Args:
+            tile_size: (ancho, alto) de cada bloque. Por defecto el tile nativo
+                       del TIFF, o 1024x1024 para imágenes en tiras o raw.
+
+        Yields:
+            Tuplas (x, y, región).
+        """
+        for x, y, w, h in self._tile_grid(tile_size):
+            yield x, y, self.read_region(x, y, w, h)
+
+    def _tile_grid(self, tile_size: Optional[Tuple[int, int]]) -> List[Tuple[int, int, int, int]]:
+        if tile_size is None:
+            tile_size = self.tile_size if self.tile_size[0] < self.width else (1024, 1024)
+        tw, th = tile_size
+        return [(x, y, min(tw, self.width - x), min(th, self.height - y))
+                for y in range(0, self.height, th) for x in range(0, self.width, tw)]
+
+    def map_tiles(self,
+                  func: Callable[..., np.ndarray],
+                  *args,
+                  tile_size: Optional[Tuple[int, int]] = None,
+                  halo: int = 0,
+                  out: Optional[np.ndarray] = None,
+                  **kwargs) -> np.ndarray:
+        """
+        Aplica un filtro por bloques sin cargar la imagen completa.
+
+        Cada bloque se lee con un margen de `halo` píxeles para que filtros de
+        vecindario (blur, sobel, ...) den el mismo resultado que sobre la imagen
+        entera; `halo` debe ser al menos el radio del kernel.
+
+        Args:
+            func: Función imagen -> imagen de igual alto y ancho (ej: gaussian_blur).
+            *args, **kwargs: Argumentos adicionales para `func`.
+            tile_size: Tamaño de bloque (ver `iter_tiles`).
+            halo: Margen en píxeles alrededor de cada bloque.
+            out: Array de salida (ej: np.memmap). Si es None se crea en memoria.
+
+        Returns:
+            El array de salida.
+        """
+        for x, y, w, h in self._tile_grid(tile_size):
+            x0, y0 = max(x - halo, 0), max(y - halo, 0)
+            x1, y1 = min(x + w + halo, self.width), min(y + h + halo, self.height)
+            result = func(self.read_region(x0, y0, x1 - x0, y1 - y0), *args, **kwargs)
+            if out is None:
+                out = np.empty((self.height, self.width) + result.shape[2:], dtype=result.dtype)
+            out[y:y + h, x:x + w] = result[y - y0:y - y0 + h, x - x0:x - x0 + w]
+        return out
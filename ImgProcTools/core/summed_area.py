@@ -0,0 +1,171 @@
+import cv2
+import numpy as np
+from typing import Optional, Tuple, Union
+
+from utils.utils import output_buffer
+
+# Profundidades de OpenCV para los tipos de salida admitidos
+_CV_DEPTHS = {
+    np.dtype(np.uint8): cv2.CV_8U,
+    np.dtype(np.int8): cv2.CV_8S,
+    np.dtype(np.uint16): cv2.CV_16U,
+    np.dtype(np.int16): cv2.CV_16S,
+    np.dtype(np.int32): cv2.CV_32S,
+    np.dtype(np.float32): cv2.CV_32F,
+    np.dtype(np.float64): cv2.CV_64F,
+}
+
+
+class SummedAreaTable:
+    """
+    Imagen integral (tabla de sumas acumuladas) para consultas de ventana en O(1).
+
+    Se construye una vez por imagen con cv2.integral / cv2.integral2 y responde
+    sumas, medias y varianzas locales para cualquier tamaño de ventana, con el
+    mismo manejo de bordes que los filtros de OpenCV (la imagen se rellena con
+    `border` antes de integrar). Cada consulta son cuatro lecturas por píxel,
+    independientemente del tamaño de la ventana. La tabla de cuadrados solo se
+    calcula si se pide una varianza.
+
+    Para imágenes uint8 la tabla de sumas es int32: aunque los totales acumulados
+    desborden, la aritmética es módulo 2³² y la suma de cada ventana es exacta
+    mientras quepa en un int32 (ventanas de hasta ~8 millones de píxeles).
+
+    Las consultas reutilizan buffers internos: una misma tabla no debe
+    consultarse desde varios hilos a la vez.
+
+    Args:
+        image: Imagen de entrada (gris o multicanal).
+        padding: Relleno inicial en píxeles (radio máximo de ventana sin reconstruir).
+                 Si se pide una ventana mayor la tabla se reconstruye con más relleno.
+        border: Tipo de borde (cv2.BORDER_REFLECT_101 como cv2.blur;
+                cv2.BORDER_REPLICATE como cv2.adaptiveThreshold).
+
+    Ejemplo:
+        sat = SummedAreaTable(gray, padding=32)
+        means = [sat.box_mean((k, k)) for k in (3, 9, 31, 63)]
+        variance = sat.local_variance((15, 15))
+    """
+
+    def __init__(self,
+                 image: np.ndarray,
+                 padding: int = 16,
+                 border: int = cv2.BORDER_REFLECT_101):
+        self.image = image
+        self.shape = image.shape
+        self.dtype = image.dtype
+        self.border = border
+        self._depth = cv2.CV_32S if image.dtype == np.uint8 else cv2.CV_64F
+        self._scratch = {}
+        self._build(padding)
+
+    def _build(self, padding: int) -> None:
+        self.padding = padding
+        p = padding
+        self._padded = cv2.copyMakeBorder(self.image, p, p, p, p, self.border) if p else self.image
+        self._sum = cv2.integral(self._padded, sdepth=self._depth)
+        self._sqsum = None
+
+    def _ensure(self, ksize: Tuple[int, int], squared: bool = False) -> None:
+        kw, kh = ksize
+        if kw < 1 or kh < 1:
+            raise ValueError("Window size must be positive")
+        if self._depth == cv2.CV_32S and kw * kh * 255 >= 2**31:
+            # La suma de la ventana ya no cabe en int32
+            self._depth = cv2.CV_64F
+            self._build(self.padding)
+        if max(kw, kh) > self.padding:
+            self._build(max(kw, kh))
+        if squared and self._sqsum is None:
+            self._sum, self._sqsum = cv2.integral2(self._padded, sdepth=self._depth, sqdepth=cv2.CV_64F)
+
+    def _buffer(self, name: str, dtype) -> np.ndarray:
+        buffer = self._scratch.get(name)
+        if buffer is None or buffer.dtype != dtype:
+            buffer = self._scratch[name] = np.empty(self.shape, dtype=dtype)
+        return buffer
+
+    def _window_sum(self, table: np.ndarray, ksize: Tuple[int, int], out: np.ndarray) -> np.ndarray:
+        kw, kh = ksize
+        h, w = self.shape[:2]
+        # Esquina superior izquierda de cada ventana (ancla en el centro, como cv2.blur);
+        # las cuatro esquinas son vistas de la tabla, sin copias
+        y0, x0 = self.padding - kh // 2, self.padding - kw // 2
+        cv2.subtract(table[y0 + kh:y0 + kh + h, x0 + kw:x0 + kw + w],
+                     table[y0:y0 + h, x0 + kw:x0 + kw + w], dst=out)
+        cv2.subtract(out, table[y0 + kh:y0 + kh + h, x0:x0 + w], dst=out)
+        cv2.add(out, table[y0:y0 + h, x0:x0 + w], dst=out)
+        return out
+
+    def box_sum(self, ksize: Union[int, Tuple[int, int]]) -> np.ndarray:
+        """
+        Suma de cada ventana (ancho, alto) centrada en el píxel.
+
+        Returns:
+            Array de la forma de la imagen (int32 para imágenes uint8, float64 en otro caso).
+        """
+        ksize = (ksize, ksize) if isinstance(ksize, int) else tuple(ksize)
+        self._ensure(ksize)
+        return self._window_sum(self._sum, ksize, np.empty(self.shape, dtype=self._sum.dtype))
+
+    def box_mean(self,
+                 ksize: Union[int, Tuple[int, int]],
+                 dtype: Optional[np.dtype] = np.float32,
+                 out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Media de cada ventana (equivale a cv2.blur con el mismo borde).
+
+        Args:
+            ksize: Tamaño de ventana (ancho, alto) o un entero.
+            dtype: Tipo de salida (None: el de la imagen); los tipos enteros se
+                   redondean y saturan como OpenCV.
+            out: Array de salida opcional.
+        """
+        ksize = (ksize, ksize) if isinstance(ksize, int) else tuple(ksize)
+        out = self._output(out, dtype if dtype is not None else self.dtype)
+        self._ensure(ksize)
+        total = self._window_sum(self._sum, ksize, self._buffer("sum", self._sum.dtype))
+        scale = 1.0 / (ksize[0] * ksize[1])
+        # Escala, redondeo y saturación en una sola pasada
+        if out.dtype == np.uint8 and self._depth == cv2.CV_32S:
+            return cv2.convertScaleAbs(total, dst=out, alpha=scale)  # sumas no negativas
+        return cv2.addWeighted(total, scale, total, 0, 0, dst=out, dtype=_CV_DEPTHS[out.dtype])
+
+    def local_variance(self,
+                       ksize: Union[int, Tuple[int, int]],
+                       dtype: np.dtype = np.float32,
+                       out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Varianza local E[x²] - E[x]² de cada ventana.
+
+        Args:
+            ksize: Tamaño de ventana (ancho, alto) o un entero.
+            dtype: Tipo de salida (float32 o float64).
+            out: Array de salida opcional.
+        """
+        ksize = (ksize, ksize) if isinstance(ksize, int) else tuple(ksize)
+        out = self._output(out, dtype)
+        self._ensure(ksize, squared=True)
+        area = float(ksize[0] * ksize[1])
+        total = self._window_sum(self._sum, ksize, self._buffer("sum", self._sum.dtype))
+        squares = self._window_sum(self._sqsum, ksize, self._buffer("sqsum", np.float64))
+        # (Σx² · n - (Σx)²) / n², sin calcular las dos medias por separado
+        total_sq = cv2.multiply(total, total, dst=self._buffer("total_sq", np.float64), dtype=cv2.CV_64F)
+        cv2.addWeighted(squares, 1.0 / area, total_sq, -1.0 / area ** 2, 0,
+                        dst=out, dtype=_CV_DEPTHS[out.dtype])
+        return np.maximum(out, 0, out=out)  # errores de redondeo
+
+    def local_std(self,
+                  ksize: Union[int, Tuple[int, int]],
+                  dtype: np.dtype = np.float32,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Desviación estándar local de cada ventana (salida float32 o float64)."""
+        variance = self.local_variance(ksize, dtype=dtype, out=out)
+        return cv2.sqrt(variance, dst=variance)
+
+    def _output(self, out: Optional[np.ndarray], dtype) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        if dtype not in _CV_DEPTHS:
+            raise ValueError(f"Unsupported output dtype {dtype}")
+        out = output_buffer(self.image, out, dtype=dtype)
+        return out if out is not None else np.empty(self.shape, dtype=dtype)
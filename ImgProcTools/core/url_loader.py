@@ -0,0 +1,197 @@
+import http.client
+import threading
+import time
+import cv2
+import numpy as np
+from collections import defaultdict
+from typing import Iterable, Iterator, Tuple, Optional, Callable, Union
+from urllib.parse import urljoin, urlsplit
+
+from .image_loader import decode_buffer, run_parallel
+from .async_loader import REDIRECT_STATUS
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# Errores de una conexión keep-alive que el servidor cerró mientras estaba inactiva
+STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                ConnectionResetError, BrokenPipeError)
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones HTTP/HTTPS keep-alive, agrupadas por (esquema, host, puerto).
+
+    Args:
+        max_per_host: Conexiones inactivas que se conservan por host.
+        timeout: Timeout (segundos) de conexión y lectura.
+        max_redirects: Redirecciones (301/302/303/307/308) que sigue cada GET.
+    """
+
+    def __init__(self, max_per_host: int = 8, timeout: float = 10.0, max_redirects: int = 5):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def _acquire(self, key: Tuple[str, str, int]) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle[key]:
+                return self._idle[key].pop(), True
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(host, port, timeout=self.timeout), False
+
+    def _release(self, key: Tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle[key]) < self.max_per_host:
+                self._idle[key].append(connection)
+                return
+        connection.close()
+
+    def get(self, url: str) -> Tuple[int, Union[bytes, bytearray]]:
+        """
+        Realiza un GET reutilizando una conexión del pool y sigue las
+        redirecciones (hasta `max_redirects`, como `async_loader.http_get`).
+
+        Returns:
+            (código de estado, cuerpo de la respuesta) de la URL final.
+        """
+        for _ in range(self.max_redirects + 1):
+            status, location, body = self._get(url)
+            if status not in REDIRECT_STATUS or location is None:
+                return status, body
+            url = urljoin(url, location)
+        raise ValueError("Too many redirects")
+
+    def _get(self, url: str) -> Tuple[int, Optional[str], Union[bytes, bytearray]]:
+        """Un GET sin seguir redirecciones: (estado, cabecera Location, cuerpo)."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        while True:
+            connection, reused = self._acquire(key)
+            try:
+                connection.request("GET", path, headers={"Connection": "keep-alive"})
+                response = connection.getresponse()
+                body = read_body(response)
+            except STALE_ERRORS:
+                connection.close()
+                if reused:  # conexión caducada: reintentar con otra sin contar como fallo
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            return response.status, response.getheader("Location"), body
+
+    def close(self) -> None:
+        """Cierra todas las conexiones inactivas."""
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_body(response: http.client.HTTPResponse) -> Union[bytes, bytearray]:
+    """
+    Lee el cuerpo de la respuesta. Si se conoce Content-Length se lee directamente
+    en un único buffer preasignado, que luego se decodifica sin copias.
+    """
+    if not response.length:  # sin Content-Length, o vacío: read() además cierra la respuesta
+        return response.read()
+    buffer = bytearray(response.length)
+    view = memoryview(buffer)
+    read = 0
+    while read < len(buffer):
+        n = response.readinto(view[read:])
+        if n == 0:
+            raise http.client.IncompleteRead(bytes(view[:read]), len(buffer) - read)
+        read += n
+    return buffer
+
+
+def fetch_with_retries(url: str,
+                       pool: ConnectionPool,
+                       retries: int = 2,
+                       backoff: float = 0.5) -> Union[bytes, bytearray]:
+    """
+    Descarga una URL reintentando errores de red y estados 429/5xx con
+    espera exponencial (backoff * 2**intento).
+    """
+    for attempt in range(retries + 1):
+        try:
+            status, body = pool.get(url)
+        except (OSError, http.client.HTTPException) as e:
+            error = ValueError(f"Error loading image from URL {url}: {e}")
+        else:
+            if status == 200:
+                return body
+            error = ValueError(f"Error loading image from URL {url}: HTTP {status}")
+            if status not in RETRY_STATUS:
+                raise error
+        if attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+    raise error
+
+
+def load_from_urls(urls: Iterable[str],
+                   as_gray: bool = False,
+                   workers: int = 8,
+                   ordered: bool = True,
+                   prefetch: Optional[int] = None,
+                   timeout: float = 10.0,
+                   retries: int = 2,
+                   backoff: float = 0.5,
+                   pool: Optional[ConnectionPool] = None,
+                   on_error: Optional[Callable[[str, Exception], None]] = None
+                   ) -> Iterator[Tuple[str, np.ndarray]]:
+    """
+    Descarga y decodifica un lote de imágenes remotas en paralelo.
+
+    Las conexiones se reutilizan (keep-alive) por host y el cuerpo de cada
+    respuesta se pasa a cv2.imdecode sin copias intermedias.
+
+    Args:
+        urls: Iterable de URLs http/https.
+        as_gray: Convierte las imágenes a escala de grises.
+        workers: Máximo de descargas simultáneas.
+        ordered: True entrega los resultados en el orden de entrada.
+        prefetch: Máximo de imágenes en vuelo (por defecto 2 * workers).
+        timeout: Timeout (segundos) por conexión y lectura.
+        retries: Reintentos ante errores de red o estados 429/5xx.
+        backoff: Espera base (segundos) entre reintentos.
+        pool: Pool de conexiones a reutilizar entre lotes. Si es None se crea
+              uno para el lote y se cierra al terminar.
+        on_error: Función llamada con (url, excepción) cuando una imagen falla.
+
+    Yields:
+        Tuplas (url, imagen).
+    """
+    own_pool = pool is None
+    pool = pool or ConnectionPool(max_per_host=workers, timeout=timeout)
+
+    def load(url: str) -> np.ndarray:
+        image = decode_buffer(fetch_with_retries(url, pool, retries, backoff))
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if as_gray else image
+
+    try:
+        yield from run_parallel(load, urls, workers, ordered, prefetch, on_error)
+    finally:
+        if own_pool:
+            pool.close()
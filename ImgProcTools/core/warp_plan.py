@@ -0,0 +1,108 @@
+import threading
+import cv2
+import numpy as np
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class WarpPlanCache:
+    """
+    Caché LRU de "planes" de warp: tablas de cv2.remap en punto fijo
+    (cv2.convertMaps -> CV_16SC2) precalculadas para una matriz afín.
+
+    Cuando la misma transformación se aplica a muchos frames del mismo tamaño
+    (ej: rotar cada frame de un video), el plan se calcula una sola vez y cada
+    frame solo paga la interpolación.
+
+    Args:
+        maxsize: Número máximo de planes almacenados.
+    """
+
+    def __init__(self, maxsize: int = 16):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, M: np.ndarray,
+            dsize: Tuple[int, int],
+            interpolation: int = cv2.INTER_LINEAR) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Devuelve (map1, map2) para warpear a una salida de tamaño `dsize` (ancho, alto).
+        """
+        M = np.asarray(M, dtype=np.float64).reshape(2, 3)
+        key = (tuple(dsize), M.tobytes(), interpolation)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+        plan = build_remap_tables(M, dsize, interpolation)
+        with self._lock:
+            self._plans[key] = plan
+            if len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        return plan
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+
+DEFAULT_PLAN_CACHE = WarpPlanCache()
+
+
+def build_remap_tables(M: np.ndarray,
+                       dsize: Tuple[int, int],
+                       interpolation: int = cv2.INTER_LINEAR) -> Tuple[np.ndarray, np.ndarray]:
+    """Calcula las tablas de remap en punto fijo equivalentes a cv2.warpAffine(M)."""
+    inverse = cv2.invertAffineTransform(np.asarray(M, dtype=np.float64))
+    w, h = dsize
+    x = np.arange(w, dtype=np.float64)[None, :]
+    y = np.arange(h, dtype=np.float64)[:, None]
+    map_x = (inverse[0, 0] * x + inverse[0, 1] * y + inverse[0, 2]).astype(np.float32)
+    map_y = (inverse[1, 0] * x + inverse[1, 1] * y + inverse[1, 2]).astype(np.float32)
+    return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2,
+                           nninterpolation=interpolation == cv2.INTER_NEAREST)
+
+
+def warp_affine(image: np.ndarray,
+                M: np.ndarray,
+                dsize: Optional[Tuple[int, int]] = None,
+                interpolation: int = cv2.INTER_LINEAR,
+                border_mode: int = cv2.BORDER_CONSTANT,
+                border_value: float = 0,
+                out: Optional[np.ndarray] = None,
+                cache: Optional[WarpPlanCache] = None) -> np.ndarray:
+    """
+    Equivalente a cv2.warpAffine usando un plan de remap cacheado.
+
+    El resultado coincide con cv2.warpAffine con diferencias de ±1 por redondeo
+    de las coordenadas en punto fijo (algo mayores en el borde de la imagen).
+
+    Args:
+        image: Imagen de entrada.
+        M: Matriz afín 2x3.
+        dsize: (ancho, alto) de la salida (por defecto el de la entrada).
+        interpolation: Interpolación (INTER_NEAREST, INTER_LINEAR, INTER_CUBIC, ...).
+        border_mode, border_value: Manejo de píxeles fuera de la imagen.
+        out: Array de salida opcional (mismo dtype que `image`, tamaño `dsize`).
+        cache: Caché de planes (por defecto una compartida a nivel de módulo).
+    """
+    dsize = tuple(dsize) if dsize is not None else (image.shape[1], image.shape[0])
+    if out is not None:
+        expected = (dsize[1], dsize[0]) + image.shape[2:]
+        if out.shape != expected or out.dtype != image.dtype:
+            raise ValueError(f"out must have shape {expected} and dtype {image.dtype}, "
+                             f"got {out.shape} and {out.dtype}")
+    map1, map2 = (cache if cache is not None else DEFAULT_PLAN_CACHE).get(M, dsize, interpolation)
+    return cv2.remap(image, map1, map2, interpolation, dst=out,
+                     borderMode=border_mode, borderValue=border_value)
@@ -1,5 +1,6 @@
 import cv2
 import numpy as np
+from typing import Optional, Tuple
 
 def print_image_info(image: np.ndarray) -> None:
     """Imprime metadata básica de una imagen."""
@@ -11,4 +12,36 @@ def scale_image(image: np.ndarray,
                factor: float, 
                interpolation: int = cv2.INTER_LINEAR) -> np.ndarray:
     """Escala una imagen por un factor (no por dimensiones absolutas)."""
-    return cv2.resize(image, None, fx=factor, fy=factor, interpolation=interpolation)
\ No newline at end of file
+    return cv2.resize(image, None, fx=factor, fy=factor, interpolation=interpolation)
+
+def output_buffer(image: np.ndarray,
+                  out: Optional[np.ndarray] = None,
+                  inplace: bool = False,
+                  shape: Optional[Tuple[int, ...]] = None,
+                  dtype: Optional[np.dtype] = None) -> Optional[np.ndarray]:
+    """
+    Resuelve el array de salida (`dst` de OpenCV) para los parámetros `out=` / `inplace=`.
+
+    Args:
+        image: Imagen de entrada.
+        out: Array de salida preasignado (o None para que OpenCV cree uno nuevo).
+        inplace: Escribe el resultado sobre `image`.
+        shape, dtype: Forma y tipo esperados de la salida (por defecto los de `image`).
+
+    Returns:
+        El array donde escribir, o None si hay que crear uno nuevo.
+    """
+    if inplace:
+        if out is not None:
+            raise ValueError("out and inplace=True are mutually exclusive")
+        out = image
+    shape = tuple(shape) if shape is not None else image.shape
+    dtype = np.dtype(dtype) if dtype is not None else image.dtype
+    if out is not None:
+        # OpenCV reasigna en silencio un dst incompatible: validar antes
+        if out.shape != shape or out.dtype != dtype:
+            raise ValueError(f"out must have shape {shape} and dtype {dtype}, "
+                             f"got {out.shape} and {out.dtype}")
+        if not out.flags.writeable:
+            raise ValueError("out must be writeable")
+    return out
@@ -0,0 +1,50 @@
+"""
+Benchmark: cv2.filter2D frente a cv2.sepFilter2D y `dft_filter` según el
+tamaño del kernel, para localizar los puntos de cruce que usa `apply_kernel`
+(DFT_KERNEL_SIZE).
+
+Uso:
+    python benchmarks/bench_apply_kernel.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ImgProcTools"))
+
+from core.image_filter import DFT_KERNEL_SIZE, dft_filter  # noqa: E402
+
+
+def timeit(func, repeat: int = 5) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"DFT_KERNEL_SIZE actual: {DFT_KERNEL_SIZE}")
+    for name, shape in {"1080p gris": (1080, 1920), "1080p color": (1080, 1920, 3),
+                        "4K gris": (2160, 3840)}.items():
+        image = rng.integers(0, 256, size=shape, dtype=np.uint8)
+        out = np.empty_like(image)
+        print(f"\n{name}")
+        print(" kernel | filter2D | dft_filter | filter2D (rango 1) | sepFilter2D")
+        for size in (3, 5, 9, 15, 21, 25, 31, 41, 51, 63):
+            kernel = rng.random((size, size))
+            kernel /= kernel.sum()
+            g = cv2.getGaussianKernel(size, 0)
+            direct = timeit(lambda: cv2.filter2D(image, -1, kernel, dst=out))
+            dft = timeit(lambda: dft_filter(image, kernel, out=out))
+            rank1 = timeit(lambda: cv2.filter2D(image, -1, g @ g.T, dst=out))
+            separable = timeit(lambda: cv2.sepFilter2D(image, -1, g, g, dst=out))
+            print(f" {size:3d}x{size:<3d}| {direct:8.1f} | {dft:10.1f} | {rank1:18.1f} | {separable:11.1f}  ms")
+
+
+if __name__ == "__main__":
+    main()
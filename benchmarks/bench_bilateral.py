@@ -0,0 +1,55 @@
+"""
+Benchmark: filtro bilateral exacto (cv2.bilateralFilter) frente a la rejilla
+bilateral de `bilateral_filter(method="fast")`.
+
+Mide la precisión (PSNR frente al filtro exacto) sobre las imágenes de
+examples/images y el tiempo al crecer el diámetro `d` en una foto de 6 MP.
+
+Uso:
+    python benchmarks/bench_bilateral.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "ImgProcTools"))
+
+from core.image_filter import bilateral_filter  # noqa: E402
+
+PARAMS = [(9, 75, 75), (15, 50, 50), (25, 30, 10)]
+
+
+def timed(func, repeat: int = 2) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    images = {path.name: cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+              for path in sorted((ROOT / "examples" / "images").glob("*.tiff"))}
+    print("PSNR frente a cv2.bilateralFilter (dB)")
+    for d, sigma_color, sigma_space in PARAMS:
+        scores = {name: cv2.PSNR(bilateral_filter(image, d, sigma_color, sigma_space),
+                                 bilateral_filter(image, d, sigma_color, sigma_space, method="fast"))
+                  for name, image in images.items()}
+        worst = min(scores, key=scores.get)
+        print(f"  d={d:2d} sigma_color={sigma_color:3d} sigma_space={sigma_space:3d}: "
+              f"media {np.mean(list(scores.values())):5.1f}  mínimo {scores[worst]:5.1f} ({worst})")
+
+    photo = cv2.resize(images["lenna.tiff"], (3000, 2000), interpolation=cv2.INTER_CUBIC)
+    print("3000x2000 color, sigma_color=50, sigma_space=d")
+    for d in (9, 15, 25, 41, 61):
+        exact = timed(lambda: bilateral_filter(photo, d, 50, d), repeat=1)
+        fast = timed(lambda: bilateral_filter(photo, d, 50, d, method="fast"))
+        print(f"  d={d:2d}  exacto {exact:8.0f} ms   fast {fast:6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: `clahe` en bucle frente a StreamingCLAHE (latencia por frame y
+memoria asignada por frame).
+
+Referencia (1 CPU, frames BGR aleatorios, ms/frame y MiB asignados por frame):
+    1080p clahe()                         ~58 ms   17.8 MiB
+    1080p StreamingCLAHE                  ~53 ms    0.0 MiB
+    1080p StreamingCLAHE(smoothing=0.9)   ~72 ms    0.4 MiB
+El suavizado temporal no puede usar cv2.CLAHE: el mapeo por LUTs de tile y la
+interpolación bilineal se hacen con varias pasadas de cv2 (cv2.LUT por región,
+cv2.blendLinear) en lugar del bucle único de OpenCV, por eso es algo más lento
+que clahe() aunque no asigna memoria por frame.
+
+Uso:
+    python benchmarks/bench_clahe.py
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ImgProcTools"))
+
+from core.image_enhancement import clahe, StreamingCLAHE  # noqa: E402
+
+
+def measure(func, frames, repeat: int = 3):
+    func(frames[0])
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            func(frame)
+    latency = (time.perf_counter() - start) / (repeat * len(frames)) * 1000
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for frame in frames:
+        func(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return latency, (peak - base) / 2**20
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for name, (h, w) in {"720p": (720, 1280), "1080p": (1080, 1920)}.items():
+        frames = [rng.integers(0, 256, size=(h, w, 3), dtype=np.uint8) for _ in range(10)]
+        out = np.empty_like(frames[0])
+        streaming = StreamingCLAHE()
+        smoothed = StreamingCLAHE(smoothing=0.9)
+        for label, func in [("clahe()", lambda f: clahe(f)),
+                            ("StreamingCLAHE", lambda f: streaming.apply(f, out=out)),
+                            ("StreamingCLAHE(smoothing=0.9)", lambda f: smoothed.apply(f, out=out))]:
+            latency, peak = measure(func, frames)
+            print(f"{name} {label:30s} {latency:7.2f} ms/frame  pico asignado {peak:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: filtrado en frecuencia con fft2 en complex128 (espectro desplazado,
+implementación anterior) frente a la transformada real float32 de
+`apply_fft_filter` (con la máscara centrada o preparada una vez con
+`prepare_fft_mask`) y a `apply_frequency_filter` con máscaras cacheadas, en
+tiempo y pico de memoria asignada, sobre imágenes 4K y 8K en gris.
+
+Uso:
+    python benchmarks/bench_fft_filter.py
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ImgProcTools"))
+
+from core.frecuency_filters import (apply_fft_filter, apply_frequency_filter,  # noqa: E402
+                                    create_gaussian_filter, prepare_fft_mask)
+
+
+def complex128_filter(image: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    spectrum = np.fft.fftshift(np.fft.fft2(image))
+    spectrum = spectrum * mask
+    return np.real(np.fft.ifft2(np.fft.ifftshift(spectrum))).astype(np.float32)
+
+
+def measure(func, repeat: int = 2):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for h, w in [(2160, 3840), (4320, 7680)]:
+        image = rng.integers(0, 256, size=(h, w), dtype=np.uint8)
+        mask = create_gaussian_filter((h, w), 40)
+        prepared = prepare_fft_mask(mask)
+        print(f"{w}x{h} gris, filtro gaussiano pasa-bajas")
+        for label, func in [
+            ("fft2 complex128 + fftshift", lambda: complex128_filter(image, mask.astype(np.float64))),
+            ("apply_fft_filter(real=False)", lambda: apply_fft_filter(image, mask, real=False)),
+            ("apply_fft_filter", lambda: apply_fft_filter(image, mask)),
+            ("apply_fft_filter(prepared)", lambda: apply_fft_filter(image, prepared)),
+            ("apply_frequency_filter", lambda: apply_frequency_filter(image, "gaussian", 40)),
+        ]:
+            elapsed, peak = measure(func)
+            print(f"  {label:30s} {elapsed:8.1f} ms   pico {peak:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: filtrado en frecuencia sin relleno frente al relleno automático hasta
+el tamaño óptimo de la DFT (2^a·3^b·5^c, cv2.getOptimalDFTSize) de
+`apply_frequency_filter`, sobre un barrido de tamaños con factores primos
+grandes y de tamaños que ya son óptimos (donde no se rellena nada).
+
+Uso:
+    python benchmarks/bench_fft_padding.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ImgProcTools"))
+
+from core.frecuency_filters import apply_frequency_filter, dft_padding  # noqa: E402
+
+SIZES = [
+    (1999, 1501),   # primos
+    (2161, 3841),   # 4K + 1
+    (2003, 2999),
+    (1031, 1553),
+    (4099, 4099),   # primo
+    (2160, 3840),   # 4K, ya óptimo
+    (2048, 2048),   # ya óptimo
+]
+
+
+def measure(func, repeat: int = 3) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'tamaño':>12s} {'rellenado':>12s} {'sin relleno':>12s} {'con relleno':>12s} {'speedup':>8s}")
+    for h, w in SIZES:
+        image = rng.integers(0, 256, size=(h, w), dtype=np.uint8)
+        _, (rows, cols) = dft_padding((h, w))
+        plain = measure(lambda: apply_frequency_filter(image, "gaussian", 40, pad=False))
+        padded = measure(lambda: apply_frequency_filter(image, "gaussian", 40))
+        print(f"{w:>5d}x{h:<6d} {cols:>5d}x{rows:<6d} {plain:9.1f} ms {padded:9.1f} ms {plain / padded:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: banco de ~30 kernels (relieve, derivadas Sobel, gaussianas a varias
+sigmas y kernels grandes) aplicados kernel a kernel frente a FilterBank.
+
+Uso:
+    python benchmarks/bench_filter_bank.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ImgProcTools"))
+
+from core.filter_bank import FilterBank  # noqa: E402
+
+
+def build_kernels():
+    rng = np.random.default_rng(0)
+    kernels = [np.array([[-2, -1, 0], [-1, 1, 1], [0, 1, 2]]),
+               np.array([[-1, -1, 0], [-1, 1, 1], [0, 1, 1]]),
+               np.array([[0, -1, -2], [1, 1, -1], [2, 1, 0]])]
+    for dx, dy in [(1, 0), (0, 1), (2, 0), (0, 2), (1, 1)]:
+        for ksize in (3, 5):
+            kx, ky = cv2.getDerivKernels(dx, dy, ksize)
+            kernels.append(np.outer(ky, kx))
+    for sigma in (1, 2, 3, 4, 6, 8):
+        g = cv2.getGaussianKernel(int(6 * sigma) | 1, sigma)
+        kernels.append(g @ g.T)
+    kernels += [rng.random((size, size)) for size in (5, 7, 9, 25, 31, 41)]
+    return kernels
+
+
+def timeit(func, repeat: int = 3) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    kernels = build_kernels()
+    bank = FilterBank(kernels)
+    single = FilterBank(kernels, workers=1)
+    rng = np.random.default_rng(1)
+    for name, shape in {"1080p gris": (1080, 1920), "4K gris": (2160, 3840)}.items():
+        image = rng.integers(0, 256, size=shape, dtype=np.uint8)
+
+        def one_by_one():
+            f = image.astype(np.float32)
+            return [cv2.filter2D(f, -1, k) for k in kernels]
+
+        t_loop = timeit(one_by_one)
+        t_single = timeit(lambda: single.apply(image))
+        t_bank = timeit(lambda: bank.apply(image))
+        print(f"{name} ({len(kernels)} kernels): filter2D uno a uno {t_loop:7.1f} ms | "
+              f"FilterBank 1 hilo {t_single:7.1f} ms | FilterBank {bank.workers} hilos {t_bank:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: gradiente Sobel normalizado en float64 (implementación anterior)
+frente al camino float32/int16 por bandas de `sobel_edges`, en tiempo y pico
+de memoria asignada, sobre imágenes de 8 a 24 megapíxeles.
+
+Uso:
+    python benchmarks/bench_gradient.py
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ImgProcTools"))
+
+from core.image_filter import sobel_edges, sobel_gradient  # noqa: E402
+
+
+def float64_sobel_edges(image: np.ndarray) -> np.ndarray:
+    sobelx = cv2.Sobel(image, cv2.CV_64F, 1, 0, ksize=3)
+    sobely = cv2.Sobel(image, cv2.CV_64F, 0, 1, ksize=3)
+    grad = np.sqrt(sobelx**2 + sobely**2)
+    return cv2.normalize(grad, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+
+
+def measure(func, repeat: int = 3):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for h, w in [(2160, 3840), (4000, 6000)]:
+        image = cv2.GaussianBlur(rng.integers(0, 256, size=(h, w), dtype=np.uint8), (5, 5), 0)
+        out = np.empty_like(image)
+        print(f"{w}x{h} ({h * w / 1e6:.0f} MP)")
+        for label, func in [("float64 + np.sqrt", lambda: float64_sobel_edges(image)),
+                            ("sobel_edges", lambda: sobel_edges(image)),
+                            ("sobel_edges(out=)", lambda: sobel_edges(image, out=out)),
+                            ("sobel_edges(l1=True)", lambda: sobel_edges(image, l1=True, out=out)),
+                            ("sobel_gradient + orientación", lambda: sobel_gradient(image, orientation=True))]:
+            elapsed, peak = measure(func)
+            print(f"  {label:30s} {elapsed:8.1f} ms   pico {peak:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: erosión/apertura con cv2.erode/cv2.morphologyEx frente a
+van Herk/Gil-Werman al crecer el elemento estructurante, y mediana de 16 bits
+con ventanas grandes (`median_filter`) frente a la mediana uint8 de OpenCV
+sobre los datos reducidos a 8 bits (la única opción de OpenCV para k > 5).
+
+Uso:
+    python benchmarks/bench_morphology.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ImgProcTools"))
+
+from core.morphology import _van_herk, median_filter  # noqa: E402
+
+
+def timed(func, repeat: int = 2) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur(rng.random((2160, 3840), dtype=np.float32), (31, 31), 0)
+    base = cv2.normalize(base, None, 0, 1, cv2.NORM_MINMAX)
+    for dtype, scale in [(np.uint8, 255), (np.uint16, 4095)]:
+        image = (base * scale).astype(dtype)
+        print(f"3840x2160 {np.dtype(dtype).name}: erosión rectangular k x k")
+        for k in (3, 15, 51, 101, 151, 201, 301):
+            kernel = np.ones((k, k), np.uint8)
+            opencv = timed(lambda: cv2.erode(image, kernel))
+            vhgw = timed(lambda: _van_herk(image, (k, k), True))
+            print(f"  k={k:3d}  cv2.erode {opencv:7.1f} ms   van Herk {vhgw:7.1f} ms")
+
+    image = (base * 4095).astype(np.uint16)
+    print("3840x2160 uint16: apertura k x k")
+    for k in (51, 151, 301):
+        kernel = np.ones((k, k), np.uint8)
+        opencv = timed(lambda: cv2.morphologyEx(image, cv2.MORPH_OPEN, kernel))
+        vhgw = timed(lambda: _van_herk(_van_herk(image, (k, k), True), (k, k), False))
+        print(f"  k={k:3d}  cv2.morphologyEx {opencv:7.1f} ms   van Herk {vhgw:7.1f} ms")
+
+    image = cv2.resize(image, (1920, 1080), interpolation=cv2.INTER_AREA)
+    image += rng.integers(0, 64, size=image.shape, dtype=np.uint16)
+    reduced = (image >> 4).astype(np.uint8)
+    print("1920x1080 uint16 (12 bits): mediana k x k")
+    for k in (5, 15, 31, 51):
+        exact = timed(lambda: median_filter(image, k), repeat=1)
+        lossy = timed(lambda: cv2.medianBlur(reduced, k))
+        print(f"  k={k:3d}  median_filter {exact:7.1f} ms   cv2.medianBlur 8 bits {lossy:7.1f} ms")
+
+    gradient = np.tile(np.linspace(0, 65535, 1920), (1080, 1)).astype(np.uint16)
+    noise = rng.integers(0, 65536, size=(1080, 1920), dtype=np.uint16)
+    print("1920x1080 uint16 (16 bits): mediana k x k")
+    for k in (15, 51):
+        smooth = timed(lambda: median_filter(gradient, k), repeat=1)
+        worst = timed(lambda: median_filter(noise, k), repeat=1)
+        print(f"  k={k:3d}  gradiente {smooth:7.1f} ms   ruido uniforme {worst:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
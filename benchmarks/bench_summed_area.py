@@ -0,0 +1,63 @@
+"""
+Benchmark: medias, umbrales y varianzas locales a varias escalas sobre la
+misma imagen, con una pasada de OpenCV por consulta frente a una única
+SummedAreaTable construida una vez.
+
+Uso:
+    python benchmarks/bench_summed_area.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ImgProcTools"))
+
+from core.image_filter import avgerage_blur  # noqa: E402
+from core.image_analysis import adaptive_threshold  # noqa: E402
+from core.summed_area import SummedAreaTable  # noqa: E402
+
+SIZES = (3, 7, 15, 31, 63, 127)
+
+
+def timed(func, repeat: int = 3) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def opencv_statistics(image: np.ndarray) -> None:
+    source = image.astype(np.float32)
+    squared = source * source
+    for k in SIZES:
+        avgerage_blur(image, (k, k))
+        adaptive_threshold(image, method="mean", block_size=k | 1)
+        mean = cv2.blur(source, (k, k))
+        cv2.blur(squared, (k, k)) - mean * mean
+
+
+def table_statistics(image: np.ndarray) -> None:
+    sat = SummedAreaTable(image, padding=max(SIZES), border=cv2.BORDER_REPLICATE)
+    for k in SIZES:
+        avgerage_blur(image, (k, k), sat=sat)
+        adaptive_threshold(image, method="mean", block_size=k | 1, sat=sat)
+        sat.local_variance(k)
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for h, w in [(1080, 1920), (2160, 3840)]:
+        image = cv2.GaussianBlur(rng.integers(0, 256, size=(h, w), dtype=np.uint8), (5, 5), 0)
+        print(f"{w}x{h}, ventanas {SIZES}")
+        for label, func in [("OpenCV por consulta", lambda: opencv_statistics(image)),
+                            ("SummedAreaTable", lambda: table_statistics(image)),
+                            ("  solo construcción", lambda: SummedAreaTable(image, padding=max(SIZES)))]:
+            print(f"  {label:22s} {timed(func):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
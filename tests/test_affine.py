@@ -0,0 +1,31 @@
+import pytest
+import cv2
+import numpy as np
+
+from core.image_transform import AffineTransform, translate, rotate, resize, crop
+
+y, x = np.mgrid[0:120, 0:160]
+IMAGE = ((np.sin(x / 9.0) + np.cos(y / 7.0)) * 60 + 128).astype(np.uint8)
+
+
+class TestAffineTransform:
+    def test_identity(self):
+        np.testing.assert_array_equal(AffineTransform.for_image(IMAGE).apply(IMAGE), IMAGE)
+
+    def test_translate_rotate_crop_single_pass(self):
+        fused = (AffineTransform.for_image(IMAGE)
+                 .translate(5, -3).rotate(20, center=(80, 60)).crop(40, 30, 120, 90))
+        sequential = crop(rotate(translate(IMAGE, 5, -3), 20, center=(80, 60)), 40, 30, 120, 90)
+        result = fused.apply(IMAGE)
+        assert result.shape == (60, 80)
+        assert np.abs(result.astype(int) - sequential).max() <= 2
+
+    def test_resize_matches_cv2(self):
+        fused = AffineTransform.for_image(IMAGE).resize(width=80)
+        assert fused.size == (80, 60)
+        reference = resize(IMAGE, width=80, inter=cv2.INTER_LINEAR)
+        assert np.abs(fused.apply(IMAGE).astype(int) - reference).max() <= 1
+
+    def test_wrong_input_size(self):
+        with pytest.raises(ValueError):
+            AffineTransform((10, 10)).apply(IMAGE)
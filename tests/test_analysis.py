@@ -0,0 +1,26 @@
+import pytest
+import cv2
+import numpy as np
+
+from core.image_analysis import detect_edges
+
+rng = np.random.default_rng(18)
+COLOR = cv2.GaussianBlur(rng.integers(0, 256, size=(90, 120, 3), dtype=np.uint8), (5, 5), 0)
+
+
+class TestDetectEdges:
+    def test_sobel_matches_float64_reference(self):
+        gray = cv2.cvtColor(COLOR, cv2.COLOR_BGR2GRAY)
+        gx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
+        gy = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+        magnitude = np.sqrt(gx ** 2 + gy ** 2)
+        expected = np.uint8(np.clip(magnitude / magnitude.max() * 255, 0, 255))
+        result = detect_edges(COLOR, method="sobel")
+        assert result.dtype == np.uint8 and result.shape == gray.shape
+        assert np.abs(result.astype(int) - expected).max() <= 1
+        np.testing.assert_array_equal(detect_edges(COLOR, method="sobbel"), result)
+
+    def test_flat_image_and_invalid_method(self):
+        assert not detect_edges(np.full((20, 20), 9, np.uint8), method="sobel").any()
+        with pytest.raises(ValueError):
+            detect_edges(COLOR, method="prewitt")
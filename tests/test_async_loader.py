@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+import pytest
+import cv2
+import numpy as np
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from core.async_loader import async_load_image, async_load_images
+from core.image_loader import load_image
+
+IMAGE = np.random.default_rng(3).integers(0, 256, size=(16, 24, 3), dtype=np.uint8)
+PNG = cv2.imencode(".png", IMAGE)[1].tobytes()
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/slow.png":
+            time.sleep(1)
+        if self.path == "/moved.png":
+            self.send_response(302)
+            self.send_header("Location", "/img.png")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(PNG)))
+        self.end_headers()
+        self.wfile.write(PNG)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestAsyncLoader:
+    def test_file_matches_load_image(self, tmp_path):
+        cv2.imwrite(str(tmp_path / "a.png"), IMAGE)
+        image = asyncio.run(async_load_image("a.png", base_dir=tmp_path, as_gray=True))
+        np.testing.assert_array_equal(image, load_image("a.png", base_dir=tmp_path, as_gray=True))
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(async_load_image("missing.png", base_dir=tmp_path))
+
+    def test_url_and_redirect(self, server):
+        image = asyncio.run(async_load_image(f"{server}/moved.png"))
+        np.testing.assert_array_equal(image, IMAGE)
+
+    def test_batch_with_timeout(self, server):
+        async def collect():
+            errors = []
+            urls = [f"{server}/slow.png"] + [f"{server}/img_{i}.png" for i in range(5)]
+            results = [item async for item in async_load_images(
+                urls, timeout=0.3, on_error=lambda s, e: errors.append((s, type(e))))]
+            return urls, results, errors
+
+        urls, results, errors = asyncio.run(collect())
+        assert sorted(s for s, _ in results) == sorted(urls[1:])
+        assert errors == [(urls[0], asyncio.TimeoutError)]
+
+    def test_cancellation(self, server):
+        async def cancel():
+            task = asyncio.ensure_future(async_load_image(f"{server}/slow.png"))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel())
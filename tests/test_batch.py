@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+
+from core.batch import batched, batch_convert_color, batch_add, batch_gaussian_blur, batch_resize, batch_apply_mask
+from core.image_filter import gaussian_blur
+from core.image_transform import convert_color, add, resize, apply_mask
+
+rng = np.random.default_rng(6)
+STACK = rng.integers(0, 256, size=(9, 20, 30, 3), dtype=np.uint8)
+
+
+class TestBatch:
+    def test_batched_matches_per_frame(self):
+        result = batch_gaussian_blur(STACK, (5, 5))
+        assert result.shape == STACK.shape
+        for frame, expected in zip(result, STACK):
+            np.testing.assert_array_equal(frame, gaussian_blur(expected, (5, 5)))
+
+    def test_batched_shape_change_and_out(self):
+        out = np.empty((9, 10, 15, 3), dtype=np.uint8)
+        result = batch_resize(STACK, width=15, out=out)
+        assert result is out
+        np.testing.assert_array_equal(out[4], resize(STACK[4], width=15))
+        with pytest.raises(ValueError):
+            batch_resize(STACK, width=15, out=np.empty((9, 10, 15), dtype=np.uint8))
+
+    def test_small_chunks_and_workers(self):
+        blur = batched(gaussian_blur, workers=3, chunk_size=1)
+        np.testing.assert_array_equal(blur(STACK, (3, 3)), batch_gaussian_blur(STACK, (3, 3)))
+
+    def test_tall_ops(self):
+        gray = batch_convert_color(STACK, "GRAY")
+        assert gray.shape == STACK.shape[:3]
+        np.testing.assert_array_equal(gray[3], convert_color(STACK[3], "GRAY"))
+        summed = batch_add(STACK, STACK[::-1])
+        np.testing.assert_array_equal(summed[2], add(STACK[2], STACK[6]))
+        masks = (rng.integers(0, 2, size=STACK.shape[:3]) * 255).astype(np.uint8)
+        np.testing.assert_array_equal(batch_apply_mask(STACK, masks)[1], apply_mask(STACK[1], masks[1]))
+
+    def test_tall_ops_out(self):
+        out = np.empty_like(STACK)
+        assert batch_add(STACK, STACK, out=out) is out
+        np.testing.assert_array_equal(out[5], add(STACK[5], STACK[5]))
+        strided = np.empty((9, 20, 60, 3), dtype=np.uint8)[:, :, ::2]
+        with pytest.raises(ValueError):
+            batch_add(STACK, STACK, out=strided)
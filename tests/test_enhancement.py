@@ -0,0 +1,153 @@
+import tracemalloc
+import pytest
+import cv2
+import numpy as np
+
+from core.image_enhancement import (
+    adjust_brightness, adjust_contrast, adjust_brightness_contrast,
+    gamma_correction, auto_contrast, auto_contrast_channel, clahe, histogram_equalization,
+    PointOpChain, StreamingCLAHE, _gamma_table
+)
+
+rng = np.random.default_rng(13)
+COLOR = rng.integers(0, 256, size=(90, 110, 3), dtype=np.uint8)
+GRAY = rng.integers(30, 200, size=(90, 110), dtype=np.uint8)
+
+
+def reference_auto_contrast_channel(channel, cutoff):
+    hist = cv2.calcHist([channel], [0], None, [256], [0, 256])
+    cdf = hist.cumsum()
+    low = np.searchsorted(cdf, cutoff * cdf[-1])
+    high = np.searchsorted(cdf, (1 - cutoff) * cdf[-1])
+    channel = np.clip(channel, low, high)
+    return ((channel - low) / (high - low) * 255).astype(np.uint8)
+
+
+class TestLookupTables:
+    @pytest.mark.parametrize("gamma", [0.3, 1 / 2.2, 1.0, 2.2, 4.0])
+    def test_gamma_table_matches_formula(self, gamma):
+        expected = np.array([((i / 255.0) ** (1.0 / gamma)) * 255 for i in np.arange(0, 256)]).astype("uint8")
+        np.testing.assert_array_equal(gamma_correction(np.arange(256, dtype=np.uint8), gamma), expected)
+
+    def test_gamma_table_is_cached(self):
+        _gamma_table.cache_clear()
+        gamma_correction(GRAY, 1.7)
+        gamma_correction(COLOR, 1.7)
+        assert _gamma_table.cache_info().hits == 1
+        assert not _gamma_table(1.7).flags.writeable
+
+    @pytest.mark.parametrize("cutoff", [0.0, 0.01, 0.1])
+    def test_auto_contrast_matches_formula(self, cutoff):
+        expected = np.dstack([reference_auto_contrast_channel(COLOR[..., c], cutoff) for c in range(3)])
+        np.testing.assert_array_equal(auto_contrast(COLOR, cutoff), expected)
+        np.testing.assert_array_equal(auto_contrast_channel(GRAY, cutoff),
+                                      reference_auto_contrast_channel(GRAY, cutoff))
+
+
+class TestHistogramEqualization:
+    def test_color_is_converted_to_gray(self):
+        expected = cv2.equalizeHist(cv2.cvtColor(COLOR, cv2.COLOR_BGR2GRAY))
+        np.testing.assert_array_equal(histogram_equalization(COLOR), expected)
+        # Una imagen en gris de 3 filas no es una imagen a color
+        three_rows = GRAY[:3].copy()
+        np.testing.assert_array_equal(histogram_equalization(three_rows), cv2.equalizeHist(three_rows))
+        with pytest.raises(ValueError):
+            histogram_equalization(COLOR.copy(), inplace=True)
+
+
+class TestPointOpChain:
+    @pytest.mark.parametrize("image", [COLOR, GRAY])
+    def test_matches_sequential(self, image):
+        chain = (PointOpChain().adjust_brightness(-20).adjust_contrast(1.4)
+                 .gamma_correction(0.6).auto_contrast(0.02).adjust_brightness_contrast(0.8, 12))
+        expected = adjust_brightness(image, -20)
+        expected = adjust_contrast(expected, 1.4)
+        expected = gamma_correction(expected, 0.6)
+        expected = auto_contrast(expected, 0.02)
+        expected = adjust_brightness_contrast(expected, 0.8, 12)
+        np.testing.assert_array_equal(chain.apply(image), expected)
+
+    def test_color_table_shape_and_cache(self):
+        chain = PointOpChain().gamma_correction(2.0).adjust_brightness(5)
+        table = chain.table(COLOR)
+        assert table.shape == (256, 1, 3)
+        assert chain.table(COLOR) is table
+        assert chain.table(GRAY).shape == (256,)
+        chain.adjust_contrast(1.1)
+        assert chain.table(COLOR) is not table
+
+    def test_custom_lut_and_inplace(self):
+        invert = np.arange(255, -1, -1, dtype=np.uint8)
+        image = GRAY.copy()
+        assert PointOpChain().lut(invert).apply(image, inplace=True) is image
+        np.testing.assert_array_equal(image, 255 - GRAY)
+
+    def test_rejects_non_uint8(self):
+        with pytest.raises(ValueError):
+            PointOpChain().adjust_brightness(5).apply(GRAY.astype(np.float32))
+        with pytest.raises(ValueError):
+            PointOpChain().gamma_correction(0)
+
+
+def low_contrast_scene(shape=(120, 160)):
+    scene = cv2.GaussianBlur(rng.integers(0, 256, size=shape, dtype=np.uint8), (21, 21), 6)
+    return cv2.convertScaleAbs(scene, alpha=4, beta=-380)
+
+
+class TestStreamingCLAHE:
+    def test_matches_clahe_without_smoothing(self):
+        equalizer = StreamingCLAHE(2.0, (8, 8))
+        gray = low_contrast_scene()
+        color = cv2.merge([gray, low_contrast_scene(), low_contrast_scene()])
+        for _ in range(2):
+            np.testing.assert_array_equal(equalizer.apply(gray), clahe(gray, 2.0, (8, 8)))
+            np.testing.assert_array_equal(equalizer.apply(color), clahe(color, 2.0, (8, 8)))
+
+    @pytest.mark.parametrize("shape, grid", [((120, 160), (8, 8)), ((101, 143), (5, 7))])
+    def test_smoothing_first_frame_close_to_clahe(self, shape, grid):
+        scene = low_contrast_scene(shape)
+        result = StreamingCLAHE(2.0, grid, smoothing=0.8).apply(scene)
+        assert np.abs(result.astype(int) - clahe(scene, 2.0, grid)).max() <= 1
+
+    def test_smoothing_reduces_flicker(self):
+        scene = low_contrast_scene()
+        frames = [scene.copy() for _ in range(12)]
+        for frame in frames[1::2]:
+            frame[:60, :80] = cv2.add(frame[:60, :80], 40)  # cambio local que alterna
+
+        def flicker(smoothing):
+            equalizer = StreamingCLAHE(3.0, (4, 4), smoothing=smoothing)
+            outputs = [equalizer.apply(frame).astype(int) for frame in frames]
+            return np.mean([np.abs(outputs[i] - outputs[i - 1])[60:, 80:].mean() for i in range(6, 12)])
+
+        assert flicker(0.9) < flicker(0.0) / 5
+
+    def test_reset_and_validation(self):
+        scene = low_contrast_scene()
+        equalizer = StreamingCLAHE(smoothing=0.9)
+        first = equalizer.apply(scene)
+        equalizer.apply(255 - scene)
+        equalizer.reset()
+        np.testing.assert_array_equal(equalizer.apply(scene), first)
+        with pytest.raises(ValueError):
+            StreamingCLAHE(smoothing=1.0)
+        with pytest.raises(ValueError):
+            equalizer.apply(scene.astype(np.float32))
+
+    # Con suavizado solo se asignan arrays por tile (tiles x 256), no por píxel
+    @pytest.mark.parametrize("smoothing, shape", [(0.0, (120, 160)), (0.9, (720, 1280))])
+    def test_steady_state_allocations(self, smoothing, shape):
+        frame = cv2.merge([low_contrast_scene(shape)] * 3)
+        out = np.empty_like(frame)
+        equalizer = StreamingCLAHE(smoothing=smoothing)
+        equalizer.apply(frame, out=out)
+        tracemalloc.start()
+        try:
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for _ in range(20):
+                equalizer.apply(frame, out=out)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak - start < frame.nbytes // 4
@@ -0,0 +1,163 @@
+import pytest
+import cv2
+import numpy as np
+from pathlib import Path
+
+import core.image_filter as image_filter
+from core.image_filter import (apply_kernel, analyze_kernel, dft_filter, _analyze_kernel,
+                               sobel_gradient, sobel_edges, laplacian_edges, bilateral_filter)
+
+rng = np.random.default_rng(16)
+COLOR = rng.integers(0, 256, size=(97, 131, 3), dtype=np.uint8)
+GRAY = rng.integers(0, 256, size=(97, 131), dtype=np.uint8)
+IMAGES = Path(__file__).resolve().parents[1] / "examples" / "images"
+
+
+class TestApplyKernel:
+    def test_dispatch(self):
+        g = cv2.getGaussianKernel(7, 0)
+        assert analyze_kernel(np.ones((5, 5))).method == "separable"
+        assert analyze_kernel(g @ g.T).method == "separable"
+        assert analyze_kernel(rng.random((5, 5))).method == "direct"
+        assert analyze_kernel(rng.random((25, 25))).method == "dft"
+        # Kernels 1D (también los largos): separables, no DFT
+        for shape in [(1, 9), (1, 41), (41, 1), (1, 1)]:
+            assert analyze_kernel(rng.random(shape)).method == "separable"
+
+    @pytest.mark.parametrize("kernel", [
+        np.ones((5, 5)),
+        cv2.getGaussianKernel(9, 0) @ cv2.getGaussianKernel(9, 0).T,
+        rng.random((3, 3)) - 0.5,
+        rng.random((25, 25)),
+        rng.random((23, 31)),
+        rng.random((1, 41)) - 0.5,
+        rng.random((33, 1)),
+    ])
+    @pytest.mark.parametrize("image", [COLOR, GRAY, GRAY.astype(np.float32)])
+    def test_matches_filter2d(self, kernel, image):
+        expected = cv2.filter2D(image, -1, kernel / np.sum(np.abs(kernel)))
+        result = apply_kernel(image, kernel)
+        assert result.dtype == image.dtype
+        np.testing.assert_allclose(result.astype(np.float64), expected, atol=1 if image.dtype == np.uint8 else 1e-4)
+
+    def test_analysis_is_cached(self):
+        kernel = rng.random((4, 6))
+        _analyze_kernel.cache_clear()
+        apply_kernel(GRAY, kernel)
+        apply_kernel(COLOR, kernel)
+        assert _analyze_kernel.cache_info().hits == 1
+
+    @pytest.mark.parametrize("kernel", [cv2.getGaussianKernel(9, 0) @ cv2.getGaussianKernel(9, 0).T,
+                                        rng.random((1, 31))])
+    def test_separable_inplace(self, kernel):
+        assert analyze_kernel(kernel).method == "separable"
+        expected = apply_kernel(COLOR, kernel, normalize=False)
+        image = COLOR.copy()
+        assert apply_kernel(image, kernel, normalize=False, inplace=True) is image
+        np.testing.assert_array_equal(image, expected)
+
+    def test_dft_filter_inplace(self):
+        kernel = rng.random((21, 21))
+        assert analyze_kernel(kernel).method == "dft"
+        expected = dft_filter(COLOR, kernel)
+        image = COLOR.copy()
+        assert apply_kernel(image, kernel, normalize=False, inplace=True) is image
+        np.testing.assert_array_equal(image, expected)
+
+
+def reference_gradient(image, ksize=3):
+    gx = cv2.Sobel(image, cv2.CV_64F, 1, 0, ksize=ksize)
+    gy = cv2.Sobel(image, cv2.CV_64F, 0, 1, ksize=ksize)
+    return gx, gy
+
+
+class TestSobelGradient:
+    @pytest.mark.parametrize("image", [GRAY, COLOR, GRAY.astype(np.float32)])
+    @pytest.mark.parametrize("ksize", [3, 5])
+    def test_matches_float64_across_bands(self, monkeypatch, image, ksize):
+        monkeypatch.setattr(image_filter, "GRADIENT_BAND_ROWS", 7)
+        gx, gy = reference_gradient(image, ksize)
+        magnitude = sobel_gradient(image, ksize)
+        assert magnitude.dtype == np.float32
+        np.testing.assert_allclose(magnitude, np.sqrt(gx ** 2 + gy ** 2), rtol=1e-5, atol=1e-3)
+        np.testing.assert_allclose(sobel_gradient(image, ksize, l1=True), np.abs(gx) + np.abs(gy), rtol=1e-5)
+
+    def test_orientation_and_out(self):
+        gx, gy = reference_gradient(GRAY)
+        out = np.empty(GRAY.shape, dtype=np.float32)
+        magnitude, angle = sobel_gradient(GRAY, orientation=True, out=out)
+        assert magnitude is out
+        expected = cv2.phase(gx.astype(np.float32), gy.astype(np.float32), angleInDegrees=True)
+        np.testing.assert_allclose(angle, expected, atol=1e-3)
+        with pytest.raises(ValueError):
+            sobel_gradient(GRAY, out=np.empty(GRAY.shape, dtype=np.float64))
+
+    def test_normalized_edges_close_to_float64(self):
+        gx, gy = reference_gradient(GRAY)
+        expected = cv2.normalize(np.sqrt(gx ** 2 + gy ** 2), None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        result = sobel_edges(GRAY)
+        assert result.dtype == np.uint8
+        assert np.abs(result.astype(int) - expected).max() <= 1
+        lap = cv2.normalize(cv2.Laplacian(GRAY, cv2.CV_64F, ksize=3), None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        assert np.abs(laplacian_edges(GRAY).astype(int) - lap).max() <= 1
+
+    def test_unnormalized_edges_keep_float64(self):
+        gx, gy = reference_gradient(COLOR)
+        result = sobel_edges(COLOR, normalize=False)
+        assert result.dtype == np.float64
+        np.testing.assert_allclose(result, np.sqrt(gx ** 2 + gy ** 2))
+        out = np.empty(GRAY.shape, dtype=np.float64)
+        assert laplacian_edges(GRAY, normalize=False, out=out) is out
+        np.testing.assert_array_equal(out, cv2.Laplacian(GRAY, cv2.CV_64F, ksize=3))
+
+
+class TestBilateralFast:
+    @pytest.mark.parametrize("name", ["lenna.tiff", "cameraman.tiff", "coins.tiff"])
+    @pytest.mark.parametrize("d, sigma_color, sigma_space, min_psnr", [(25, 30, 10, 38), (41, 75, 75, 30)])
+    def test_close_to_exact(self, monkeypatch, name, d, sigma_color, sigma_space, min_psnr):
+        image = cv2.imread(str(IMAGES / name), cv2.IMREAD_UNCHANGED)
+        exact = bilateral_filter(image, d, sigma_color, sigma_space)
+
+        def no_fallback(*args, **kwargs):
+            raise AssertionError("fell back to cv2.bilateralFilter")
+        monkeypatch.setattr(image_filter.cv2, "bilateralFilter", no_fallback)
+        fast = bilateral_filter(image, d, sigma_color, sigma_space, method="fast")
+        assert fast.shape == image.shape and fast.dtype == image.dtype
+        assert cv2.PSNR(exact, fast) > min_psnr
+
+    def test_float_and_out(self):
+        image = GRAY.astype(np.float32)
+        out = np.empty_like(image)
+        assert bilateral_filter(image, 15, 30, 7, out=out, method="fast") is out
+        exact = bilateral_filter(image, 15, 30, 7)
+        assert cv2.PSNR(exact / 255, out / 255, 1.0) > 30
+
+    def test_flat_image_unchanged(self):
+        flat = np.full((40, 50, 3), 123, np.uint8)
+        np.testing.assert_array_equal(bilateral_filter(flat, 25, method="fast"), flat)
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            bilateral_filter(COLOR, method="grid")
+
+    @pytest.mark.parametrize("shape, d, sigma_color", [((2160, 3840, 3), 9, 20), ((1000, 1000), 3, 5),
+                                                       ((512, 512, 3), 9, 75)])
+    def test_grid_larger_than_image_falls_back(self, shape, d, sigma_color):
+        lenna = cv2.imread(str(IMAGES / "lenna.tiff"))
+        image = cv2.resize(lenna if len(shape) == 3 else lenna[..., 1], shape[1::-1])
+        fast = bilateral_filter(image, d, sigma_color, 75, method="fast")
+        np.testing.assert_array_equal(fast, bilateral_filter(image, d, sigma_color, 75))
+
+    def test_large_radius_uses_grid(self, monkeypatch):
+        image = cv2.imread(str(IMAGES / "lenna.tiff"))
+        fast = bilateral_filter(image, 41, 75, 75, method="fast")
+        assert cv2.PSNR(fast, bilateral_filter(image, 41, 75, 75)) > 38
+
+        def exact(*args, **kwargs):
+            raise AssertionError("fell back to cv2.bilateralFilter")
+        monkeypatch.setattr(image_filter.cv2, "bilateralFilter", exact)
+        np.testing.assert_array_equal(bilateral_filter(image, 41, 75, 75, method="fast"), fast)
+        # Mosaico de varias columnas de niveles (como en rejillas más altas que SHRT_MAX)
+        monkeypatch.setattr(image_filter, "_REMAP_MAX_SIZE", 300)
+        mosaic = bilateral_filter(image, 41, 75, 75, method="fast")
+        assert np.abs(mosaic.astype(np.int16) - fast).max() <= 1
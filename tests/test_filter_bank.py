@@ -0,0 +1,48 @@
+import pytest
+import cv2
+import numpy as np
+
+from core.filter_bank import FilterBank
+
+rng = np.random.default_rng(17)
+GRAY = rng.integers(0, 256, size=(83, 117), dtype=np.uint8)
+COLOR = rng.integers(0, 256, size=(64, 75, 3), dtype=np.uint8)
+GAUSS = cv2.getGaussianKernel(27, 4)
+KERNELS = [
+    np.array([[-2, -1, 0], [-1, 1, 1], [0, 1, 2]]),   # relieve
+    np.outer(*cv2.getDerivKernels(0, 1, 3)),          # sobel y
+    np.outer(*cv2.getDerivKernels(2, 0, 5)),          # sobel xx
+    rng.random((4, 6)),                               # tamaño par
+    rng.random((1, 9)),
+    GAUSS @ GAUSS.T,                                  # grande separable
+    rng.random((25, 25)) - 0.5,                       # grande -> DFT
+    rng.random((21, 30)),
+]
+
+
+class TestFilterBank:
+    @pytest.mark.parametrize("image", [GRAY, COLOR])
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_matches_filter2d(self, image, workers):
+        responses = FilterBank(KERNELS, workers=workers).apply(image)
+        assert responses.shape == (len(KERNELS),) + image.shape
+        assert responses.dtype == np.float32
+        for kernel, response in zip(KERNELS, responses):
+            expected = cv2.filter2D(image.astype(np.float32), -1, kernel.astype(np.float64))
+            np.testing.assert_allclose(response, expected, atol=1e-4 * np.abs(expected).max())
+
+    def test_groups(self):
+        bank = FilterBank(KERNELS)
+        assert bank.dft_group == [6, 7]
+        assert sorted(i for group in bank.size_groups.values() for i in group) == [0, 1, 2, 3, 4, 5]
+        assert bank.padding == (12, 12, 15, 14)
+        assert list(bank.size_groups)[0] == (27, 27)
+
+    def test_out(self):
+        bank = FilterBank(KERNELS[:3])
+        out = np.empty((3,) + GRAY.shape, dtype=np.float32)
+        assert bank.apply(GRAY, out=out) is out
+        with pytest.raises(ValueError):
+            bank.apply(GRAY, out=np.empty((2,) + GRAY.shape, dtype=np.float32))
+        with pytest.raises(ValueError):
+            FilterBank([])
@@ -0,0 +1,72 @@
+import pytest
+import cv2
+import numpy as np
+
+from core.frame_stream import FrameStream
+
+
+@pytest.fixture
+def sequence(tmp_path):
+    frames = [np.full((24, 32, 3), i * 10, dtype=np.uint8) for i in range(10)]
+    for i, frame in enumerate(frames):
+        cv2.imwrite(str(tmp_path / f"f_{i:03d}.png"), frame)
+    return tmp_path, frames
+
+
+class TestFrameStream:
+    def test_glob_sequence(self, sequence):
+        path, frames = sequence
+        with FrameStream(str(path / "*.png"), buffers=3) as stream:
+            seen = [(i, frame.copy()) for i, frame in stream]
+        assert [i for i, _ in seen] == list(range(10))
+        for i, frame in seen:
+            np.testing.assert_array_equal(frame, frames[i])
+        assert stream.decode_fps > 0
+
+    def test_buffers_are_reused(self, sequence):
+        path, _ = sequence
+        with FrameStream(str(path / "*.png"), buffers=2) as stream:
+            ids = {id(frame) for _, frame in stream}
+        assert len(ids) <= 2
+
+    def test_decode_error_ends_stream(self, sequence):
+        path, _ = sequence
+        (path / "f_002.png").write_bytes(b"not a png")
+        with FrameStream(str(path / "*.png")) as stream:
+            assert [next(stream)[0], next(stream)[0]] == [0, 1]
+            with pytest.raises(ValueError):
+                next(stream)
+            with pytest.raises(StopIteration):
+                next(stream)
+
+    @pytest.mark.parametrize("as_gray", [False, True])
+    def test_frame_size_change(self, tmp_path, as_gray):
+        frames = [np.full(shape, i * 40, dtype=np.uint8)
+                  for i, shape in enumerate([(24, 32, 3), (24, 32, 3), (30, 20, 3), (30, 20, 3), (24, 32, 3)])]
+        for i, frame in enumerate(frames):
+            cv2.imwrite(str(tmp_path / f"f_{i:03d}.png"), frame)
+        with FrameStream(str(tmp_path / "*.png"), buffers=2, as_gray=as_gray) as stream:
+            seen = [frame.copy() for _, frame in stream]
+        for frame, expected in zip(seen, frames):
+            np.testing.assert_array_equal(frame, expected[..., 0] if as_gray else expected)
+
+    def test_stride_seek_and_gray(self, sequence):
+        path, frames = sequence
+        with FrameStream(str(path / "f_%03d.png"), stride=3, as_gray=True) as stream:
+            assert [i for i, _ in stream] == [0, 3, 6, 9]
+            stream.seek(5)
+            index, frame = next(stream)
+            assert index == 5 and frame.shape == (24, 32)
+            assert frame[0, 0] == cv2.cvtColor(frames[5], cv2.COLOR_BGR2GRAY)[0, 0]
+
+    def test_video_file(self, tmp_path):
+        path = str(tmp_path / "clip.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (32, 24))
+        for i in range(8):
+            writer.write(np.full((24, 32, 3), i * 30, dtype=np.uint8))
+        writer.release()
+        with FrameStream(path, stride=2) as stream:
+            assert len(stream) == 8
+            means = [(i, frame.mean()) for i, frame in stream]
+        assert [i for i, _ in means] == [0, 2, 4, 6]
+        assert all(abs(m - i * 30) < 3 for i, m in means)
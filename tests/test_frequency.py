@@ -0,0 +1,179 @@
+import pytest
+import cv2
+import numpy as np
+
+from core.frecuency_filters import (apply_fft_filter, apply_frequency_filter, frequency_mask, prepare_fft_mask,
+                                    create_ideal_filter, create_butterworth_filter,
+                                    create_gaussian_filter, compute_fft, inverse_fft, dft_padding)
+
+rng = np.random.default_rng(22)
+GRAY = rng.integers(0, 256, size=(48, 64), dtype=np.uint8)
+SHAPE = (48, 64)
+
+
+def centered_distance(shape):
+    rows, cols = shape
+    yy, xx = np.meshgrid(np.arange(rows) - rows // 2, np.arange(cols) - cols // 2, indexing="ij")
+    return np.sqrt(xx ** 2 + yy ** 2)
+
+
+class TestFrequencyMasks:
+    def test_centered_masks_match_formulas(self):
+        d = centered_distance(SHAPE)
+        np.testing.assert_array_equal(create_ideal_filter(SHAPE, 10), (d <= 10).astype(np.float32))
+        np.testing.assert_allclose(create_butterworth_filter(SHAPE, 12, order=3),
+                                   1 / (1 + (d / 12) ** 6), rtol=1e-5)
+        np.testing.assert_allclose(create_gaussian_filter(SHAPE, 8, high_pass=True),
+                                   1 - np.exp(-d ** 2 / (2 * 8 ** 2)), atol=1e-6)
+
+    def test_unshifted_layout(self):
+        for kind in ("ideal", "butterworth", "gaussian"):
+            mask = frequency_mask(kind, SHAPE, 9)
+            assert mask.dtype == np.float32 and mask[0, 0] == 1
+            np.testing.assert_array_equal(np.fft.fftshift(mask),
+                                          {"ideal": create_ideal_filter,
+                                           "butterworth": create_butterworth_filter,
+                                           "gaussian": create_gaussian_filter}[kind](SHAPE, 9))
+
+    def test_cached_and_read_only(self):
+        mask = frequency_mask("gaussian", SHAPE, 5.0)
+        assert frequency_mask("gaussian", SHAPE, 5) is mask
+        assert frequency_mask("gaussian", SHAPE, 5, high_pass=True) is not mask
+        assert not mask.flags.writeable
+        assert create_gaussian_filter(SHAPE, 5).flags.writeable
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            frequency_mask("box", SHAPE, 5)
+
+
+class TestApplyFFTFilter:
+    def test_compute_fft_keeps_precision(self):
+        image = rng.random(SHAPE)
+        spectrum = compute_fft(image)
+        assert spectrum.dtype == np.complex128
+        np.testing.assert_array_equal(spectrum, np.fft.fftshift(np.fft.fft2(image)))
+        np.testing.assert_allclose(inverse_fft(spectrum), image, atol=1e-6)
+
+    def test_matches_shifted_reference(self):
+        mask = create_butterworth_filter(SHAPE, 10)
+        expected = inverse_fft(compute_fft(GRAY) * mask)
+        np.testing.assert_allclose(apply_fft_filter(GRAY, mask), expected, atol=1e-3)
+
+    def test_unshifted_mask(self):
+        mask = create_gaussian_filter(SHAPE, 6, high_pass=True)
+        np.testing.assert_allclose(apply_frequency_filter(GRAY, "gaussian", 6, high_pass=True),
+                                   apply_fft_filter(GRAY, mask), atol=1e-3)
+        np.testing.assert_allclose(apply_fft_filter(GRAY, np.fft.ifftshift(mask), centered=False),
+                                   apply_fft_filter(GRAY, mask), atol=1e-3)
+
+    @pytest.mark.parametrize("shape", [(48, 64), (37, 53)])
+    @pytest.mark.parametrize("real", [True, False])
+    def test_prepared_mask(self, shape, real):
+        image = rng.integers(0, 256, size=shape + (3,), dtype=np.uint8)
+        mask = create_butterworth_filter(shape, 7)
+        prepared = prepare_fft_mask(mask)
+        assert not prepared.packed.flags.writeable
+        expected = apply_fft_filter(image, mask, real=real)
+        mask[...] = 0  # la máscara preparada no depende del array original
+        np.testing.assert_array_equal(apply_fft_filter(image, prepared, real=real), expected)
+        with pytest.raises(ValueError):
+            apply_fft_filter(image[1:], prepared)
+
+
+class TestRealTransform:
+    @pytest.mark.parametrize("shape", [(48, 64), (47, 63), (48, 63), (47, 64)])
+    def test_matches_complex_path(self, shape):
+        image = rng.integers(0, 256, size=shape, dtype=np.uint8)
+        for mask in (create_ideal_filter(shape, 9), create_butterworth_filter(shape, 7, 3, True),
+                     rng.random(shape).astype(np.float32)):  # la última no es simétrica
+            result = apply_fft_filter(image, mask)
+            assert result.dtype == np.float32 and result.shape == shape
+            np.testing.assert_allclose(result, apply_fft_filter(image, mask, real=False), atol=1e-2)
+
+    @pytest.mark.parametrize("shape", [(48, 64), (47, 63)])
+    def test_half_plane_mask(self, shape):
+        image = rng.random(shape).astype(np.float32)
+        half = frequency_mask("butterworth", shape, 6, order=2, layout="half")
+        assert half.shape == (shape[0], shape[1] // 2 + 1)
+        np.testing.assert_array_equal(half, frequency_mask("butterworth", shape, 6)[:, :shape[1] // 2 + 1])
+        filtered = np.fft.irfft2(np.fft.rfft2(image) * half, s=shape)
+        np.testing.assert_allclose(filtered, apply_frequency_filter(image, "butterworth", 6, pad=False), atol=1e-4)
+
+    def test_ccs_mask_cached(self):
+        packed = frequency_mask("ideal", SHAPE, 7, layout="ccs")
+        assert packed.shape == SHAPE and packed.dtype == np.float32
+        assert frequency_mask("ideal", SHAPE, 7, layout="ccs") is packed
+        assert not packed.flags.writeable
+        with pytest.raises(ValueError):
+            frequency_mask("ideal", SHAPE, 7, layout="shifted")
+
+
+class TestMultiChannel:
+    COLOR = rng.integers(0, 256, size=(47, 64, 3), dtype=np.uint8)
+
+    @pytest.mark.parametrize("real", [True, False])
+    def test_color_matches_each_channel(self, real):
+        mask = create_gaussian_filter(self.COLOR.shape[:2], 7)
+        result = apply_fft_filter(self.COLOR, mask, real=real)
+        assert result.shape == self.COLOR.shape and result.dtype == np.float32
+        for c in range(3):
+            np.testing.assert_allclose(result[..., c], apply_fft_filter(self.COLOR[..., c], mask, real=real),
+                                       atol=1e-3)
+
+    @pytest.mark.parametrize("real", [True, False])
+    def test_batch_matches_each_image(self, real):
+        batch = np.stack([self.COLOR, self.COLOR[::-1], 255 - self.COLOR])
+        mask = create_butterworth_filter(batch.shape[1:3], 9, high_pass=True)
+        result = apply_fft_filter(batch, mask, real=real)
+        assert result.shape == batch.shape
+        for image, filtered in zip(batch, result):
+            for c in range(3):
+                np.testing.assert_allclose(filtered[..., c], apply_fft_filter(image[..., c], mask, real=real),
+                                           atol=1e-3)
+
+    def test_frequency_filter_writes_into_out(self):
+        out = np.full(self.COLOR.shape, 7, dtype=np.float32)
+        assert apply_frequency_filter(self.COLOR, "ideal", 8, out=out) is out
+        for c in range(3):
+            np.testing.assert_allclose(out[..., c], apply_frequency_filter(self.COLOR[..., c], "ideal", 8),
+                                       atol=1e-3)
+        with pytest.raises(ValueError):
+            apply_frequency_filter(self.COLOR, "ideal", 8, out=np.empty(self.COLOR.shape, np.float64))
+
+    def test_mask_must_match_image_size(self):
+        with pytest.raises(ValueError):
+            apply_fft_filter(self.COLOR, create_ideal_filter((40, 64), 8))
+
+
+class TestOptimalPadding:
+    def test_padding_to_optimal_size(self):
+        assert dft_padding((48, 64)) == ((0, 0, 0, 0), (48, 64))
+        pads, padded = dft_padding((1999, 1501))
+        assert padded == (cv2.getOptimalDFTSize(1999), cv2.getOptimalDFTSize(1501))
+        assert pads[0] + pads[1] == padded[0] - 1999 and pads[2] + pads[3] == padded[1] - 1501
+
+    @pytest.mark.parametrize("border", [cv2.BORDER_REFLECT_101, cv2.BORDER_CONSTANT])
+    def test_matches_explicit_padding(self, border):
+        image = rng.integers(0, 256, size=(37, 53, 3), dtype=np.uint8)
+        (top, bottom, left, right), padded_shape = dft_padding(image.shape[:2])
+        assert padded_shape != image.shape[:2]
+        padded = cv2.copyMakeBorder(image, top, bottom, left, right, border)
+        mask = frequency_mask("gaussian", padded_shape, 6, image_shape=image.shape[:2])
+        expected = apply_fft_filter(padded, mask, centered=False, pad=False)[top:top + 37, left:left + 53]
+        np.testing.assert_allclose(apply_frequency_filter(image, "gaussian", 6, border=border), expected, atol=1e-3)
+        np.testing.assert_allclose(apply_fft_filter(image, mask, centered=False, border=border), expected, atol=1e-3)
+
+    def test_image_size_mask_is_resampled(self):
+        shape = (37, 53)
+        image = rng.random(shape).astype(np.float32)
+        expected = apply_frequency_filter(image, "gaussian", 5)
+        result = apply_fft_filter(image, create_gaussian_filter(shape, 5))
+        assert result.shape == shape
+        np.testing.assert_allclose(result, expected, atol=1e-2)
+        np.testing.assert_allclose(apply_fft_filter(image, create_gaussian_filter(shape, 5), real=False),
+                                   result, atol=1e-3)
+
+    def test_scaled_mask_keeps_cutoff(self):
+        mask = frequency_mask("ideal", (40, 60), 5, image_shape=(20, 30))
+        np.testing.assert_array_equal(mask[::2, ::2], frequency_mask("ideal", (20, 30), 5))
@@ -0,0 +1,50 @@
+import os
+import pytest
+import cv2
+import numpy as np
+
+from core.image_cache import ImageCache
+from core.image_loader import load_image
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    image = np.random.default_rng(1).integers(0, 256, size=(20, 30, 3), dtype=np.uint8)
+    path = tmp_path / "ref.png"
+    cv2.imwrite(str(path), image)
+    return path
+
+
+class TestImageCache:
+    def test_hit_returns_read_only_entry(self, image_path):
+        cache = ImageCache()
+        first = load_image(str(image_path), cache=cache)
+        second = load_image(str(image_path), cache=cache)
+        assert second is first
+        assert not second.flags.writeable
+        np.testing.assert_array_equal(second, load_image(str(image_path)))
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_gray_derived_from_color_entry(self, image_path, monkeypatch):
+        cache = ImageCache()
+        load_image(str(image_path), cache=cache)
+        monkeypatch.setattr(cv2, "imread", lambda *args: pytest.fail("decoded again"))
+        gray = load_image(str(image_path), as_gray=True, cache=cache)
+        monkeypatch.undo()
+        np.testing.assert_array_equal(gray, load_image(str(image_path), as_gray=True))
+
+    def test_modified_file_is_reloaded(self, image_path):
+        cache = ImageCache()
+        load_image(str(image_path), cache=cache)
+        cv2.imwrite(str(image_path), np.zeros((5, 5, 3), dtype=np.uint8))
+        os.utime(image_path, ns=(0, 10 ** 9))
+        assert load_image(str(image_path), cache=cache).shape == (5, 5, 3)
+
+    def test_lru_eviction_respects_budget(self):
+        image = np.zeros((10, 10), dtype=np.uint8)
+        cache = ImageCache(max_bytes=250)
+        for key in "abc":
+            cache.put(key, image.copy())
+        assert "a" not in cache and "b" in cache and "c" in cache
+        assert cache.stats()["evictions"] == 1
+        assert cache.current_bytes == 200
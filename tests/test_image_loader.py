@@ -0,0 +1,96 @@
+import pytest
+import cv2
+import numpy as np
+
+from core.image_loader import (load_image, load_images, load_image_from_buffer,
+                               read_image_size, choose_reduction)
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    for i in range(6):
+        image = rng.integers(0, 256, size=(32 + i, 40, 3), dtype=np.uint8)
+        cv2.imwrite(str(tmp_path / f"img_{i:02d}.png"), image)
+    return tmp_path
+
+
+class TestLoadImages:
+    def test_directory_matches_load_image(self, image_dir):
+        results = list(load_images(image_dir, workers=3))
+        assert [p for p, _ in results] == sorted(str(p) for p in image_dir.glob("*.png"))
+        for path, image in results:
+            np.testing.assert_array_equal(image, load_image(path))
+
+    def test_glob_as_gray_unordered(self, image_dir):
+        results = dict(load_images("img_0[0-2].png", base_dir=image_dir,
+                                   as_gray=True, ordered=False, prefetch=1))
+        assert len(results) == 3
+        for path, image in results.items():
+            np.testing.assert_array_equal(image, load_image(path, as_gray=True))
+
+    def test_errors_do_not_stop_batch(self, image_dir):
+        (image_dir / "broken.png").write_bytes(b"not an image")
+        errors = []
+        sources = [str(image_dir / "img_00.png"), str(image_dir / "broken.png"),
+                   str(image_dir / "missing.png"), str(image_dir / "img_01.png")]
+        results = list(load_images(sources, on_error=lambda p, e: errors.append((p, type(e)))))
+        assert [p for p, _ in results] == [sources[0], sources[3]]
+        assert errors == [(sources[1], ValueError), (sources[2], FileNotFoundError)]
+
+
+class TestReducedDecode:
+    @pytest.fixture
+    def jpeg_path(self, tmp_path):
+        gradient = np.linspace(0, 255, 800, dtype=np.float32)
+        image = np.dstack([np.tile(gradient, (600, 1))] * 3).astype(np.uint8)
+        path = tmp_path / "large.jpg"
+        cv2.imwrite(str(path), image)
+        return path
+
+    @pytest.mark.parametrize("ext", [".jpg", ".png", ".bmp", ".tiff"])
+    def test_read_image_size(self, tmp_path, ext):
+        path = tmp_path / f"probe{ext}"
+        cv2.imwrite(str(path), np.zeros((37, 53, 3), dtype=np.uint8))
+        assert read_image_size(path) == (53, 37)
+        assert read_image_size(path.read_bytes()) == (53, 37)
+
+    def test_choose_reduction(self):
+        assert choose_reduction((800, 600), (100, 100)) == 8
+        assert choose_reduction((800, 600), (300, 300)) == 2
+        assert choose_reduction((800, 600), (1000, 1000)) == 1
+
+    def test_max_size_fits_box(self, jpeg_path):
+        image = load_image(str(jpeg_path), max_size=(100, 100))
+        reference = cv2.resize(load_image(str(jpeg_path)), (100, 75), interpolation=cv2.INTER_AREA)
+        assert image.shape == (75, 100, 3)
+        assert np.abs(image.astype(int) - reference).mean() < 2
+
+    def test_reduce_factor(self, jpeg_path):
+        assert load_image(str(jpeg_path), reduce=4, as_gray=True).shape == (150, 200)
+        with pytest.raises(ValueError):
+            load_image(str(jpeg_path), reduce=3)
+
+
+class TestLoadFromBuffer:
+    def test_encoded_buffer_matches_load_image(self, tmp_path):
+        image = np.random.default_rng(4).integers(0, 256, size=(12, 18, 3), dtype=np.uint8)
+        path = tmp_path / "buf.png"
+        cv2.imwrite(str(path), image)
+        data = path.read_bytes()
+        for buffer in (data, bytearray(data), memoryview(data)):
+            np.testing.assert_array_equal(load_image_from_buffer(buffer, as_gray=True),
+                                          load_image(str(path), as_gray=True))
+
+    def test_raw_mode_is_zero_copy_view(self):
+        frame = np.arange(4 * 5 * 3, dtype=np.uint16).reshape(4, 5, 3)
+        buffer = bytearray(b"\x00" * 8 + frame.tobytes())
+        view = load_image_from_buffer(buffer, shape=(4, 5, 3), dtype=np.uint16, offset=8)
+        np.testing.assert_array_equal(view, frame)
+        assert np.shares_memory(view, np.frombuffer(buffer, dtype=np.uint8))
+        assert not load_image_from_buffer(bytes(buffer), shape=(4, 5, 3),
+                                          dtype=np.uint16, offset=8).flags.writeable
+
+    def test_raw_mode_validates_size(self):
+        with pytest.raises(ValueError):
+            load_image_from_buffer(b"\x00" * 10, shape=(4, 4))
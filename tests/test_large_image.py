@@ -0,0 +1,113 @@
+import struct
+import pytest
+import cv2
+import numpy as np
+
+from core.large_image import LargeImage
+from core.image_transform import crop
+from core.image_filter import (gaussian_blur, avgerage_blur, median_blur, bilateral_filter, sobel_gradient,
+                               sobel_edges, laplacian_edges, canny_edges, sharpen, apply_kernel)
+
+IMAGE = np.random.default_rng(5).integers(0, 256, size=(70, 90, 3), dtype=np.uint8)
+
+
+def write_tiled_tiff(path, image, tile=32):
+    """Escribe un TIFF RGB sin compresión organizado en tiles (little-endian)."""
+    h, w, c = image.shape
+    rgb = image[..., ::-1]
+    tiles = []
+    for y in range(0, h, tile):
+        for x in range(0, w, tile):
+            block = np.zeros((tile, tile, c), dtype=np.uint8)
+            part = rgb[y:y + tile, x:x + tile]
+            block[:part.shape[0], :part.shape[1]] = part
+            tiles.append(block.tobytes())
+    offsets, data, position = [], b"", 8
+    for t in tiles:
+        offsets.append(position)
+        data += t
+        position += len(t)
+    arrays = struct.pack(f"<{len(tiles)}I", *offsets) + struct.pack(f"<{len(tiles)}I", *[len(t) for t in tiles])
+    arrays += struct.pack("<3H", 8, 8, 8)
+    entries = [(256, 3, 1, w), (257, 3, 1, h), (258, 3, 3, position + 8 * len(tiles)),
+               (259, 3, 1, 1), (262, 3, 1, 2), (277, 3, 1, 3), (284, 3, 1, 1),
+               (322, 3, 1, tile), (323, 3, 1, tile),
+               (324, 4, len(tiles), position), (325, 4, len(tiles), position + 4 * len(tiles))]
+    ifd_offset = position + len(arrays)
+    ifd = struct.pack("<H", len(entries))
+    for tag, typ, count, value in entries:
+        ifd += struct.pack("<HHI", tag, typ, count) + struct.pack("<I" if typ == 4 or count > 1 else "<H2x", value)
+    ifd += struct.pack("<I", 0)
+    path.write_bytes(b"II*\x00" + struct.pack("<I", ifd_offset) + data + arrays + ifd)
+
+
+@pytest.fixture(params=["strips", "tiles", "raw"])
+def large(request, tmp_path):
+    path = tmp_path / "large.tiff"
+    if request.param == "strips":
+        cv2.imwrite(str(path), IMAGE, [cv2.IMWRITE_TIFF_COMPRESSION, cv2.IMWRITE_TIFF_COMPRESSION_NONE,
+                                       cv2.IMWRITE_TIFF_ROWSPERSTRIP, 16])
+        return LargeImage(path)
+    if request.param == "tiles":
+        write_tiled_tiff(path, IMAGE)
+        return LargeImage(path)
+    path.write_bytes(b"\x00" * 16 + IMAGE.tobytes())
+    return LargeImage.from_raw(path, IMAGE.shape, offset=16)
+
+
+class TestLargeImage:
+    def test_read_region(self, large):
+        assert large.shape == IMAGE.shape
+        np.testing.assert_array_equal(large.read_region(0, 0, 90, 70), IMAGE)
+        np.testing.assert_array_equal(large.read_region(25, 13, 40, 50), IMAGE[13:63, 25:65])
+        np.testing.assert_array_equal(crop(large, 60, 40, 200, 200), IMAGE[40:, 60:])
+
+    def test_iter_tiles_covers_image(self, large):
+        out = np.zeros_like(IMAGE)
+        for x, y, tile in large.iter_tiles((32, 24)):
+            out[y:y + tile.shape[0], x:x + tile.shape[1]] = tile
+        np.testing.assert_array_equal(out, IMAGE)
+
+    def test_map_tiles_matches_full_image(self, large):
+        result = large.map_tiles(gaussian_blur, (5, 5), tile_size=(32, 32), halo=2)
+        np.testing.assert_array_equal(result, gaussian_blur(IMAGE, (5, 5)))
+
+    @pytest.mark.parametrize("func, args", [
+        (gaussian_blur, ((7, 7),)),
+        (gaussian_blur, ((0, 0), 2.5)),
+        (avgerage_blur, ((5, 9),)),
+        (median_blur, (7,)),
+        (bilateral_filter, (9, 75, 75)),
+        (sobel_gradient, (5,)),
+        (sobel_edges, ()),
+        (laplacian_edges, (3, False)),
+        (laplacian_edges, (5,)),
+        (sharpen, ()),
+        (apply_kernel, (np.random.default_rng(7).random((25, 25)),)),
+    ])
+    def test_filters_accept_large_image(self, large, func, args):
+        # Resultados float: el redondeo SIMD puede variar según el ancho del bloque
+        np.testing.assert_allclose(func(large, *args), func(IMAGE, *args), rtol=1e-6)
+
+    def test_filters_large_image_out_and_errors(self, large):
+        out = np.empty_like(IMAGE)
+        assert gaussian_blur(large, (5, 5), out=out) is out
+        np.testing.assert_array_equal(out, gaussian_blur(IMAGE, (5, 5)))
+        magnitude, angle = sobel_gradient(large, orientation=True)
+        expected = sobel_gradient(IMAGE, orientation=True)
+        np.testing.assert_allclose(magnitude, expected[0], rtol=1e-6)
+        np.testing.assert_allclose(angle, expected[1], atol=1e-3)
+        # Normalizado en dos pasadas por bloques, escrito directamente en un memmap
+        memmap = np.lib.format.open_memmap(str(large.path) + ".npy", mode="w+", dtype=np.uint8, shape=IMAGE.shape)
+        assert sobel_edges(large, out=memmap, l1=True) is memmap
+        np.testing.assert_array_equal(memmap, sobel_edges(IMAGE, l1=True))
+        with pytest.raises(ValueError):
+            gaussian_blur(large, (5, 5), inplace=True)
+        with pytest.raises(ValueError):
+            canny_edges(large)
+
+    def test_compressed_tiff_rejected(self, tmp_path):
+        path = tmp_path / "lzw.tiff"
+        cv2.imwrite(str(path), IMAGE, [cv2.IMWRITE_TIFF_COMPRESSION, cv2.IMWRITE_TIFF_COMPRESSION_LZW])
+        with pytest.raises(ValueError):
+            LargeImage(path)
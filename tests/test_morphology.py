@@ -0,0 +1,89 @@
+import pytest
+import cv2
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import core.morphology as morphology
+from core.morphology import (erode, dilate, morphological_operation, median_filter, _van_herk)
+from core.image_filter import median_blur
+
+rng = np.random.default_rng(21)
+IMAGE = rng.integers(0, 256, size=(73, 91, 3), dtype=np.uint8)
+DEEP = rng.integers(0, 4096, size=(67, 83), dtype=np.uint16)
+
+
+def reference_median(image, k):
+    pad = [(k // 2, k // 2)] * 2 + [(0, 0)] * (image.ndim - 2)
+    windows = sliding_window_view(np.pad(image, pad, mode="edge"), (k, k), axis=(0, 1))
+    return np.median(windows, axis=(-2, -1)).astype(image.dtype)
+
+
+class TestVanHerk:
+    @pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.float32])
+    @pytest.mark.parametrize("ksize", [(3, 3), (1, 9), (8, 1), (20, 11), (40, 40)])
+    def test_matches_opencv(self, dtype, ksize):
+        image = IMAGE.astype(dtype)
+        kernel = np.ones(ksize[::-1], np.uint8)
+        np.testing.assert_array_equal(_van_herk(image, ksize, True), cv2.erode(image, kernel))
+        np.testing.assert_array_equal(_van_herk(image, ksize, False), cv2.dilate(image, kernel))
+
+    def test_dispatch_to_van_herk(self, monkeypatch):
+        monkeypatch.setattr(morphology, "VHGW_KERNEL_SIZE", 5)
+        out = np.empty_like(DEEP)
+        assert erode(DEEP, (9, 7), out=out) is out
+        np.testing.assert_array_equal(out, cv2.erode(DEEP, np.ones((7, 9), np.uint8)))
+        np.testing.assert_array_equal(dilate(DEEP, 9), cv2.dilate(DEEP, np.ones((9, 9), np.uint8)))
+
+
+class TestMorphologicalOperation:
+    @pytest.mark.parametrize("operation, flag", [
+        ("erode", cv2.MORPH_ERODE), ("dilate", cv2.MORPH_DILATE),
+        ("open", cv2.MORPH_OPEN), ("close", cv2.MORPH_CLOSE),
+        ("tophat", cv2.MORPH_TOPHAT), ("blackhat", cv2.MORPH_BLACKHAT),
+        ("gradient", cv2.MORPH_GRADIENT),
+    ])
+    @pytest.mark.parametrize("vhgw_size", [3, 151])
+    def test_matches_morphology_ex(self, monkeypatch, operation, flag, vhgw_size):
+        monkeypatch.setattr(morphology, "VHGW_KERNEL_SIZE", vhgw_size)
+        expected = cv2.morphologyEx(IMAGE, flag, np.ones((5, 7), np.uint8))
+        np.testing.assert_array_equal(morphological_operation(IMAGE, operation, (7, 5)), expected)
+
+    def test_unknown_operation(self):
+        with pytest.raises(ValueError):
+            morphological_operation(IMAGE, "hit_or_miss")
+
+
+class TestMedianFilter:
+    @pytest.mark.parametrize("k", [7, 15, 31])
+    def test_uint16_exact(self, k):
+        np.testing.assert_array_equal(median_filter(DEEP, k), reference_median(DEEP, k))
+
+    def test_full_range_color(self):
+        image = rng.integers(0, 65536, size=(40, 50, 3), dtype=np.uint16)
+        np.testing.assert_array_equal(median_filter(image, 9), reference_median(image, 9))
+
+    @pytest.mark.parametrize("direct_cost", [0.0, 0.15, 1e9])
+    def test_blocks_and_direct_median(self, monkeypatch, direct_cost):
+        # Gradiente con ruido: cada byte alto ocupa unas pocas bandas de bloques
+        monkeypatch.setattr(morphology, "MEDIAN_TILE_SIZE", (8, 8))
+        monkeypatch.setattr(morphology, "_DIRECT_MEDIAN_COST", direct_cost)
+        ramp = np.add.outer(np.arange(90) * 200, np.arange(110) * 150)
+        image = (ramp + rng.integers(0, 2000, size=ramp.shape)).astype(np.uint16)
+        np.testing.assert_array_equal(median_filter(image, 9), reference_median(image, 9))
+
+    def test_median_blur_falls_back(self):
+        expected = reference_median(DEEP, 11)
+        np.testing.assert_array_equal(median_blur(DEEP, 11), expected)
+        image = DEEP.copy()
+        assert median_blur(image, 11, inplace=True) is image
+        np.testing.assert_array_equal(image, expected)
+
+    def test_small_kernels_and_uint8_use_opencv(self):
+        np.testing.assert_array_equal(median_filter(DEEP, 5), cv2.medianBlur(DEEP, 5))
+        np.testing.assert_array_equal(median_filter(IMAGE, 21), cv2.medianBlur(IMAGE, 21))
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            median_filter(DEEP, 8)
+        with pytest.raises(ValueError):
+            median_filter(DEEP.astype(np.float32), 9)
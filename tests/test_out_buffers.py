@@ -0,0 +1,94 @@
+import tracemalloc
+import pytest
+import cv2
+import numpy as np
+
+from core.image_transform import add, subtract, multiply, apply_mask, convert_color, resize, translate
+from core.image_filter import (avgerage_blur, median_blur, gaussian_blur, bilateral_filter,
+                               sobel_edges, canny_edges, laplacian_edges, apply_kernel, sharpen)
+from core.image_enhancement import adjust_brightness_contrast, gamma_correction, clahe, auto_contrast
+from core.batch import batch_gaussian_blur, batch_add
+
+rng = np.random.default_rng(12)
+IMAGE = rng.integers(0, 256, size=(120, 160, 3), dtype=np.uint8)
+OTHER = rng.integers(0, 256, size=(120, 160, 3), dtype=np.uint8)
+GRAY = cv2.cvtColor(IMAGE, cv2.COLOR_BGR2GRAY)
+MASK = (rng.integers(0, 2, size=(120, 160)) * 255).astype(np.uint8)
+KERNEL = np.float32([[0, 1, 0], [1, 4, 1], [0, 1, 0]])
+
+
+class TestOutBuffers:
+    @pytest.mark.parametrize("func, args", [
+        (add, (OTHER,)), (subtract, (OTHER,)), (multiply, (OTHER,)),
+        (avgerage_blur, ()), (median_blur, ()), (gaussian_blur, ()),
+        (apply_kernel, (KERNEL,)), (sharpen, ()),
+        (adjust_brightness_contrast, (1.3, 10)), (gamma_correction, (2.2,)),
+    ])
+    def test_out_and_inplace_match(self, func, args):
+        expected = func(IMAGE, *args)
+        out = np.empty_like(IMAGE)
+        assert func(IMAGE, *args, out=out) is out
+        np.testing.assert_array_equal(out, expected)
+        image = IMAGE.copy()
+        assert func(image, *args, inplace=True) is image
+        np.testing.assert_array_equal(image, expected)
+
+    @pytest.mark.parametrize("func, args, image, shape, dtype", [
+        (apply_mask, (MASK,), IMAGE, IMAGE.shape, np.uint8),
+        (convert_color, ("GRAY",), IMAGE, GRAY.shape, np.uint8),
+        (resize, (80,), IMAGE, (60, 80, 3), np.uint8),
+        (translate, (5, -3), IMAGE, IMAGE.shape, np.uint8),
+        (bilateral_filter, (), IMAGE, IMAGE.shape, np.uint8),
+        (sobel_edges, (), GRAY, GRAY.shape, np.uint8),
+        (laplacian_edges, (3, False), GRAY, GRAY.shape, np.float64),
+        (canny_edges, (), GRAY, GRAY.shape, np.uint8),
+        (clahe, (), GRAY, GRAY.shape, np.uint8),
+        (auto_contrast, (0.01,), IMAGE, IMAGE.shape, np.uint8),
+    ])
+    def test_out_matches(self, func, args, image, shape, dtype):
+        out = np.full(shape, 7, dtype=dtype)
+        assert func(image, *args, out=out) is out
+        np.testing.assert_array_equal(out, func(image, *args))
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            add(IMAGE, OTHER, out=np.empty((120, 160), np.uint8))
+        with pytest.raises(ValueError):
+            gaussian_blur(IMAGE, out=np.empty(IMAGE.shape, np.float32))
+        with pytest.raises(ValueError):
+            gaussian_blur(IMAGE, out=np.empty_like(IMAGE), inplace=True)
+        with pytest.raises(ValueError):
+            adjust_brightness_contrast(IMAGE.astype(np.float32), 1.0, 5, inplace=True)
+
+    def test_batched_writes_into_stack(self):
+        stack = np.stack([IMAGE, OTHER, IMAGE])
+        out = np.empty_like(stack)
+        assert batch_gaussian_blur(stack, (3, 3), out=out) is out
+        np.testing.assert_array_equal(out[1], gaussian_blur(OTHER, (3, 3)))
+        summed = np.empty_like(stack)
+        batch_add(stack, stack, out=summed)
+        np.testing.assert_array_equal(summed[2], add(IMAGE, IMAGE))
+
+    def test_steady_state_loop_allocates_nothing(self):
+        frame = IMAGE.copy()
+        blurred = np.empty_like(frame)
+        masked = np.empty_like(frame)
+
+        def step():
+            gaussian_blur(frame, (5, 5), out=blurred)
+            add(blurred, OTHER, inplace=True)
+            gamma_correction(blurred, 1.5, inplace=True)
+            apply_mask(blurred, MASK, out=masked)
+
+        step()  # calentamiento (cachés internas de OpenCV)
+        tracemalloc.start()
+        try:
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for _ in range(50):
+                step()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # Una sola asignación de frame ya superaría este margen
+        assert peak - start < frame.nbytes // 4
@@ -0,0 +1,67 @@
+import pytest
+import cv2
+import numpy as np
+
+from core.summed_area import SummedAreaTable
+from core.image_filter import avgerage_blur
+from core.image_analysis import adaptive_threshold
+
+rng = np.random.default_rng(19)
+IMAGE = rng.integers(0, 256, size=(61, 83, 3), dtype=np.uint8)
+GRAY = cv2.cvtColor(IMAGE, cv2.COLOR_BGR2GRAY)
+
+
+class TestSummedAreaTable:
+    @pytest.mark.parametrize("ksize", [(1, 1), (3, 3), (5, 9), (4, 6), (31, 31)])
+    def test_box_sum_and_mean_match_box_filter(self, ksize):
+        sat = SummedAreaTable(IMAGE, padding=4)
+        source = IMAGE.astype(np.float64)
+        expected_sum = cv2.boxFilter(source, -1, ksize, normalize=False)
+        np.testing.assert_allclose(sat.box_sum(ksize), expected_sum, atol=1e-6)
+        np.testing.assert_allclose(sat.box_mean(ksize, dtype=np.float64),
+                                   cv2.blur(source, ksize), atol=1e-9)
+
+    @pytest.mark.parametrize("ksize", [3, 7, 25])
+    def test_uint8_mean_matches_blur(self, ksize):
+        sat = SummedAreaTable(GRAY)
+        np.testing.assert_array_equal(sat.box_mean(ksize, dtype=np.uint8),
+                                      cv2.blur(GRAY, (ksize, ksize)))
+
+    def test_local_variance(self):
+        sat = SummedAreaTable(GRAY)
+        source = GRAY.astype(np.float64)
+        for k in (3, 11, 41):
+            mean = cv2.blur(source, (k, k))
+            expected = cv2.blur(source * source, (k, k)) - mean * mean
+            np.testing.assert_allclose(sat.local_variance(k), expected, rtol=1e-4, atol=1e-2)
+        np.testing.assert_allclose(sat.local_std(11) ** 2, sat.local_variance(11), rtol=1e-4, atol=1e-2)
+        assert (sat.local_variance(5) >= 0).all()
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            SummedAreaTable(GRAY).box_sum((0, 3))
+
+
+class TestPrebuiltTable:
+    def test_avgerage_blur_with_table(self):
+        sat = SummedAreaTable(IMAGE)
+        for k in (3, 5, 15):
+            out = np.empty_like(IMAGE)
+            assert avgerage_blur(IMAGE, (k, k), out=out, sat=sat) is out
+            np.testing.assert_array_equal(out, avgerage_blur(IMAGE, (k, k)))
+        with pytest.raises(ValueError):
+            avgerage_blur(GRAY, (3, 3), sat=sat)
+
+    @pytest.mark.parametrize("threshold_type", ["binary", "binary_inv"])
+    @pytest.mark.parametrize("C", [2, -3, 1.5])
+    def test_adaptive_threshold_with_table(self, threshold_type, C):
+        sat = SummedAreaTable(GRAY, border=cv2.BORDER_REPLICATE)
+        for block_size in (3, 11, 31):
+            expected = adaptive_threshold(GRAY, 255, "mean", threshold_type, block_size, C)
+            result = adaptive_threshold(GRAY, 255, "mean", threshold_type, block_size, C, sat=sat)
+            assert result.dtype == np.uint8
+            np.testing.assert_array_equal(result, expected)
+
+    def test_adaptive_threshold_table_requires_mean(self):
+        with pytest.raises(ValueError):
+            adaptive_threshold(GRAY, method="gaussian", sat=SummedAreaTable(GRAY))
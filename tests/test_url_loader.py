@@ -0,0 +1,88 @@
+import threading
+import pytest
+import cv2
+import numpy as np
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from core.url_loader import ConnectionPool, load_from_urls
+
+IMAGE = np.random.default_rng(2).integers(0, 256, size=(24, 32, 3), dtype=np.uint8)
+PNG = cv2.imencode(".png", IMAGE)[1].tobytes()
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    flaky_calls = 0
+
+    def do_GET(self):
+        type(self).connections.add(self.client_address)
+        if self.path.startswith("/redirect/"):
+            hops = int(self.path.split("/")[2])
+            return self.reply(302, b"", location=f"/redirect/{hops - 1}" if hops > 1 else "/final.png")
+        if self.path == "/flaky.png":
+            type(self).flaky_calls += 1
+            if type(self).flaky_calls == 1:
+                return self.reply(503, b"busy")
+        if self.path.endswith(".png"):
+            return self.reply(200, PNG)
+        self.reply(404, b"not found")
+
+    def reply(self, status, body, location=None):
+        self.send_response(status)
+        if location is not None:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    ImageHandler.connections = set()
+    ImageHandler.flaky_calls = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestUrlLoader:
+    def test_keep_alive_reuses_connections(self, server):
+        urls = [f"{server}/img_{i}.png" for i in range(20)]
+        results = list(load_from_urls(urls, workers=2))
+        assert [url for url, _ in results] == urls
+        for _, image in results:
+            np.testing.assert_array_equal(image, IMAGE)
+        assert len(ImageHandler.connections) <= 2
+
+    def test_retry_and_errors(self, server):
+        errors = []
+        urls = [f"{server}/flaky.png", f"{server}/missing", f"{server}/ok.png"]
+        results = dict(load_from_urls(urls, as_gray=True, backoff=0.01,
+                                      on_error=lambda url, e: errors.append(url)))
+        assert set(results) == {urls[0], urls[2]}
+        assert results[urls[0]].shape == IMAGE.shape[:2]
+        assert errors == [urls[1]]
+        assert ImageHandler.flaky_calls == 2
+
+    def test_follows_redirects(self, server):
+        with ConnectionPool(max_per_host=1, max_redirects=3) as pool:
+            status, body = pool.get(f"{server}/redirect/3")
+            assert status == 200 and bytes(body) == PNG
+            with pytest.raises(ValueError, match="redirects"):
+                pool.get(f"{server}/redirect/4")
+        assert len(ImageHandler.connections) == 1  # mismo host: la conexión se reutiliza
+        results = dict(load_from_urls([f"{server}/redirect/2"], workers=1))
+        np.testing.assert_array_equal(results[f"{server}/redirect/2"], IMAGE)
+
+    def test_shared_pool(self, server):
+        with ConnectionPool(max_per_host=1) as pool:
+            for _ in range(2):
+                list(load_from_urls([f"{server}/a.png"], workers=1, pool=pool))
+        assert len(ImageHandler.connections) == 1
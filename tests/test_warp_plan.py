@@ -0,0 +1,45 @@
+import pytest
+import cv2
+import numpy as np
+
+from core.warp_plan import WarpPlanCache, warp_affine
+from core.image_transform import rotate, translate
+
+y, x = np.mgrid[0:90, 0:120]
+IMAGE = np.dstack([((np.sin(x / 8.0) + np.cos(y / 5.0)) * 60 + 128).astype(np.uint8)] * 3)
+
+
+def interior(M, dsize, margin=2):
+    """Píxeles de salida cuyo origen está al menos `margin` píxeles dentro de la imagen."""
+    valid = np.pad(np.ones((90 - 2 * margin, 120 - 2 * margin), np.uint8), margin)
+    return cv2.warpAffine(valid, M, dsize, flags=cv2.INTER_NEAREST) > 0
+
+
+class TestWarpPlan:
+    @pytest.mark.parametrize("interpolation", [cv2.INTER_NEAREST, cv2.INTER_LINEAR, cv2.INTER_CUBIC])
+    def test_matches_warp_affine(self, interpolation):
+        M = cv2.getRotationMatrix2D((50, 40), 33, 0.9)
+        expected = cv2.warpAffine(IMAGE, M, (100, 80), flags=interpolation)
+        result = warp_affine(IMAGE, M, (100, 80), interpolation, cache=WarpPlanCache())
+        assert np.abs(result.astype(int) - expected)[interior(M, (100, 80))].max() <= 1
+
+    def test_rotate_reuses_plan_and_out_buffer(self):
+        cache = WarpPlanCache(maxsize=2)
+        out = np.empty_like(IMAGE)
+        for _ in range(3):
+            result = rotate(IMAGE, 15, center=(60, 45), out=out, plan_cache=cache)
+            assert result is out
+        assert (cache.hits, cache.misses) == (2, 1)
+        M = cv2.getRotationMatrix2D((60, 45), 15, 1.0)
+        diff = np.abs(out.astype(int) - rotate(IMAGE, 15, center=(60, 45)))
+        assert diff[interior(M, (120, 90))].max() <= 1
+
+    def test_lru_eviction(self):
+        cache = WarpPlanCache(maxsize=2)
+        for dx in range(3):
+            translate(IMAGE, dx, 0, plan_cache=cache)
+        assert len(cache) == 2
+
+    def test_out_validation(self):
+        with pytest.raises(ValueError):
+            warp_affine(IMAGE, np.eye(2, 3), out=np.empty((90, 120), dtype=np.uint8))